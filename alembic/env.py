@@ -25,7 +25,9 @@ sys.path.insert(0, os.path.realpath(os.path.join(os.path.dirname(__file__), '..'
 from app.models import (
     audit, batch, procedure, violation, event, 
     timeline_snapshot, audit_sync_checkpoint, compliance, 
-    sop, opa_audit, filter_audit, deviation, approval, board
+    sop, opa_audit, filter_audit, deviation, approval, board,
+    idempotency, batch_summary, violation_evidence_chain, export_job,
+    batch_enforcement_state, ai_explanation, sop_parse_result
 )
 from app.models.base import Base as SharedBase
 
@@ -0,0 +1,26 @@
+"""Add audit_logs (batch_id, timestamp) index
+
+Revision ID: 0a6d2f9b7c33
+Revises: f4b9c27d8e15
+Create Date: 2026-10-19 17:48:12.336501
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0a6d2f9b7c33'
+down_revision: Union[str, None] = 'f4b9c27d8e15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_audit_logs_batch_id_timestamp', 'audit_logs', ['batch_id', 'timestamp'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_audit_logs_batch_id_timestamp', table_name='audit_logs')
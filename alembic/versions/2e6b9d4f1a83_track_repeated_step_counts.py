@@ -0,0 +1,28 @@
+"""Track repeated step counts on batch_enforcement_states
+
+Revision ID: 2e6b9d4f1a83
+Revises: 8c1f5e2a7b36
+Create Date: 2026-10-19 23:58:09.531742
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '2e6b9d4f1a83'
+down_revision: Union[str, None] = '8c1f5e2a7b36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('batch_enforcement_states', sa.Column(
+        'repeated_steps', postgresql.JSONB(astext_type=sa.Text()), nullable=False, server_default='{}'
+    ))
+
+
+def downgrade() -> None:
+    op.drop_column('batch_enforcement_states', 'repeated_steps')
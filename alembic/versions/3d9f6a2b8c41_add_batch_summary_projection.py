@@ -0,0 +1,80 @@
+"""Add batch project_id and batch_summaries projection
+
+Revision ID: 3d9f6a2b8c41
+Revises: b71d2c4e9a10
+Create Date: 2026-10-19 11:02:17.554310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3d9f6a2b8c41'
+down_revision: Union[str, None] = 'b71d2c4e9a10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DEFAULT_PROJECT_ID = '550e8400-e29b-41d4-a716-446655440000'
+
+STATE_COLUMNS = {
+    'CREATED': 'batches_created',
+    'IN_PROGRESS': 'batches_in_progress',
+    'AWAITING_APPROVAL': 'batches_awaiting_approval',
+    'APPROVED': 'batches_approved',
+    'COMPLETED': 'batches_completed',
+    'VIOLATED': 'batches_violated',
+    'REJECTED': 'batches_rejected',
+}
+
+
+def upgrade() -> None:
+    op.add_column('batches', sa.Column(
+        'project_id', sa.UUID(), nullable=False,
+        server_default=sa.text(f"'{DEFAULT_PROJECT_ID}'::uuid")
+    ))
+
+    op.create_table('batch_summaries',
+    sa.Column('project_id', sa.UUID(), nullable=False),
+    *[sa.Column(col, sa.BigInteger(), server_default='0', nullable=False) for col in STATE_COLUMNS.values()],
+    sa.Column('violations_open', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('violations_resolved', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('procedures', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('audit_items', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('project_id')
+    )
+
+    # Backfill (equivalent to app.core.projections.rebuild_batch_summaries)
+    state_selects = ",\n".join(
+        f"(SELECT count(*) FROM batches b WHERE b.project_id = p.project_id AND b.current_state = '{state}')"
+        for state in STATE_COLUMNS
+    )
+    op.execute(f"""
+        INSERT INTO batch_summaries (
+            project_id, {", ".join(STATE_COLUMNS.values())},
+            violations_open, violations_resolved, procedures, audit_items
+        )
+        SELECT
+            p.project_id,
+            {state_selects},
+            (SELECT count(*) FROM violations v JOIN batches b ON b.batch_id = v.batch_id
+                WHERE b.project_id = p.project_id AND v.status = 'OPEN'),
+            (SELECT count(*) FROM violations v JOIN batches b ON b.batch_id = v.batch_id
+                WHERE b.project_id = p.project_id AND v.status = 'RESOLVED'),
+            CASE WHEN p.project_id = '{DEFAULT_PROJECT_ID}'::uuid
+                THEN (SELECT count(*) FROM procedures) ELSE 0 END,
+            (SELECT count(*) FROM audit_logs a WHERE a.project_id = p.project_id)
+        FROM (
+            SELECT project_id FROM batches
+            UNION SELECT project_id FROM audit_logs
+            UNION SELECT '{DEFAULT_PROJECT_ID}'::uuid
+        ) p
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('batch_summaries')
+    op.drop_column('batches', 'project_id')
@@ -0,0 +1,39 @@
+"""Add batch_enforcement_states table
+
+Revision ID: 4d8a1c6e2f57
+Revises: 9c3e5b7a1d24
+Create Date: 2026-10-19 20:14:37.402518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4d8a1c6e2f57'
+down_revision: Union[str, None] = '9c3e5b7a1d24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('batch_enforcement_states',
+    sa.Column('batch_id', sa.UUID(), nullable=False),
+    sa.Column('sop_fingerprint', sa.String(length=64), nullable=False),
+    sa.Column('next_expected', sa.Integer(), nullable=False),
+    sa.Column('last_position', sa.Integer(), nullable=False),
+    sa.Column('last_step', sa.String(), nullable=True),
+    sa.Column('seen_steps', sa.LargeBinary(), nullable=False),
+    sa.Column('events_seen', sa.BigInteger(), nullable=False),
+    sa.Column('violations', sa.BigInteger(), nullable=False),
+    sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['batch_id'], ['batches.batch_id'], ),
+    sa.PrimaryKeyConstraint('batch_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('batch_enforcement_states')
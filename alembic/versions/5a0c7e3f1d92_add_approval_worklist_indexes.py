@@ -0,0 +1,35 @@
+"""Add approval worklist indexes
+
+Revision ID: 5a0c7e3f1d92
+Revises: 3d9f6a2b8c41
+Create Date: 2026-10-19 12:40:05.118734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a0c7e3f1d92'
+down_revision: Union[str, None] = '3d9f6a2b8c41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_batches_awaiting_approval', 'batches',
+        ['project_id', 'created_at', 'batch_id'], unique=False,
+        postgresql_where=sa.text("current_state = 'AWAITING_APPROVAL'")
+    )
+    op.create_index(
+        'ix_approvals_batch_id_created_at', 'approvals',
+        ['batch_id', sa.text('created_at DESC')], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_approvals_batch_id_created_at', table_name='approvals')
+    op.drop_index('ix_batches_awaiting_approval', table_name='batches')
@@ -0,0 +1,34 @@
+"""Add sop_parse_results table
+
+Revision ID: 5a3c9e1f7d42
+Revises: b7e2f4a9c015
+Create Date: 2026-10-19 21:48:26.519304
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '5a3c9e1f7d42'
+down_revision: Union[str, None] = 'b7e2f4a9c015'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('sop_parse_results',
+    sa.Column('document_sha256', sa.String(length=64), nullable=False),
+    sa.Column('prompt_version', sa.String(), nullable=False),
+    sa.Column('model', sa.String(), nullable=False),
+    sa.Column('steps', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('chunks', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('document_sha256', 'prompt_version', 'model')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('sop_parse_results')
@@ -0,0 +1,28 @@
+"""Resolve evidence chain snapshot anchor / verification level at read time
+
+Revision ID: 8c1f5e2a7b36
+Revises: d3b8e6f1a905
+Create Date: 2026-10-19 23:41:37.218904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '8c1f5e2a7b36'
+down_revision: Union[str, None] = 'd3b8e6f1a905'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_column('violation_evidence_chains', 'snapshot_anchor')
+    op.drop_column('violation_evidence_chains', 'verification_level')
+
+
+def downgrade() -> None:
+    op.add_column('violation_evidence_chains', sa.Column('verification_level', sa.String(), nullable=False, server_default='UNVERIFIED'))
+    op.add_column('violation_evidence_chains', sa.Column('snapshot_anchor', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
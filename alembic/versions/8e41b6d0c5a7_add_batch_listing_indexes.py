@@ -0,0 +1,33 @@
+"""Add batch listing keyset indexes
+
+Revision ID: 8e41b6d0c5a7
+Revises: 5a0c7e3f1d92
+Create Date: 2026-10-19 13:25:51.640219
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e41b6d0c5a7'
+down_revision: Union[str, None] = '5a0c7e3f1d92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_batches_created_at_batch_id', 'batches', ['created_at', 'batch_id'], unique=False)
+    op.create_index('ix_batches_state_created_at', 'batches', ['current_state', 'created_at', 'batch_id'], unique=False)
+    op.create_index(
+        'ix_batches_procedure_created_at', 'batches',
+        ['procedure_id', 'procedure_version', 'created_at', 'batch_id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_batches_procedure_created_at', table_name='batches')
+    op.drop_index('ix_batches_state_created_at', table_name='batches')
+    op.drop_index('ix_batches_created_at_batch_id', table_name='batches')
@@ -0,0 +1,33 @@
+"""Add ai_explanations table
+
+Revision ID: b7e2f4a9c015
+Revises: 4d8a1c6e2f57
+Create Date: 2026-10-19 21:02:11.845130
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2f4a9c015'
+down_revision: Union[str, None] = '4d8a1c6e2f57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('ai_explanations',
+    sa.Column('code', sa.String(), nullable=False),
+    sa.Column('prompt_version', sa.String(), nullable=False),
+    sa.Column('model', sa.String(), nullable=False),
+    sa.Column('explanation', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('code', 'prompt_version', 'model')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('ai_explanations')
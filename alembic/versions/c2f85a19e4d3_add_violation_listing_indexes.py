@@ -0,0 +1,32 @@
+"""Add violation listing keyset indexes
+
+Revision ID: c2f85a19e4d3
+Revises: 8e41b6d0c5a7
+Create Date: 2026-10-19 14:02:38.907112
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2f85a19e4d3'
+down_revision: Union[str, None] = '8e41b6d0c5a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_violations_detected_at', 'violations', ['detected_at', 'violation_id'], unique=False)
+    op.create_index('ix_violations_status_detected_at', 'violations', ['status', 'detected_at', 'violation_id'], unique=False)
+    op.create_index('ix_violations_rule_detected_at', 'violations', ['rule', 'detected_at', 'violation_id'], unique=False)
+    op.create_index('ix_violations_batch_id_detected_at', 'violations', ['batch_id', 'detected_at', 'violation_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_violations_batch_id_detected_at', table_name='violations')
+    op.drop_index('ix_violations_rule_detected_at', table_name='violations')
+    op.drop_index('ix_violations_status_detected_at', table_name='violations')
+    op.drop_index('ix_violations_detected_at', table_name='violations')
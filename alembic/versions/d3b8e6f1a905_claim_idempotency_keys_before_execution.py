@@ -0,0 +1,33 @@
+"""Claim idempotency keys before execution (PENDING status)
+
+Revision ID: d3b8e6f1a905
+Revises: 5a3c9e1f7d42
+Create Date: 2026-10-19 23:05:12.604117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3b8e6f1a905'
+down_revision: Union[str, None] = '5a3c9e1f7d42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('idempotency_keys', sa.Column('status', sa.String(), nullable=False, server_default='COMPLETED'))
+    op.alter_column('idempotency_keys', 'status_code', existing_type=sa.Integer(), nullable=True)
+    op.alter_column('idempotency_keys', 'response_body', existing_type=postgresql.JSONB(astext_type=sa.Text()), nullable=True)
+    op.alter_column('idempotency_keys', 'response_hash', existing_type=sa.String(), nullable=True)
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM idempotency_keys WHERE status = 'PENDING'")
+    op.alter_column('idempotency_keys', 'response_hash', existing_type=sa.String(), nullable=False)
+    op.alter_column('idempotency_keys', 'response_body', existing_type=postgresql.JSONB(astext_type=sa.Text()), nullable=False)
+    op.alter_column('idempotency_keys', 'status_code', existing_type=sa.Integer(), nullable=False)
+    op.drop_column('idempotency_keys', 'status')
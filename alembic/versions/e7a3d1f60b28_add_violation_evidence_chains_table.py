@@ -0,0 +1,38 @@
+"""Add violation_evidence_chains table
+
+Revision ID: e7a3d1f60b28
+Revises: c2f85a19e4d3
+Create Date: 2026-10-19 15:11:20.473961
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a3d1f60b28'
+down_revision: Union[str, None] = 'c2f85a19e4d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing violations are backfilled lazily on first read of /evidence-chain
+    op.create_table('violation_evidence_chains',
+    sa.Column('violation_id', sa.UUID(), nullable=False),
+    sa.Column('chain_id', sa.String(), nullable=False),
+    sa.Column('chain_hash', sa.String(), nullable=False),
+    sa.Column('nodes', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('verified', sa.Boolean(), nullable=False),
+    sa.Column('verification_level', sa.String(), nullable=False),
+    sa.Column('snapshot_anchor', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('computed_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['violation_id'], ['violations.violation_id'], ),
+    sa.PrimaryKeyConstraint('violation_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('violation_evidence_chains')
@@ -0,0 +1,42 @@
+"""Index OPA decision_hash and resource lookups, backfill linked_violation_id
+
+Revision ID: f4b9c27d8e15
+Revises: e7a3d1f60b28
+Create Date: 2026-10-19 16:20:44.092815
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4b9c27d8e15'
+down_revision: Union[str, None] = 'e7a3d1f60b28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Lookup index only: decision_hash does not cover resource_id, so two denials of the same
+    # policy/input in the same instant collide, and 'legacy' (e5a98d320ccd) is shared by every pre-chain row
+    op.create_index('ix_opa_audit_logs_decision_hash', 'opa_audit_logs', ['decision_hash'], unique=False)
+    op.create_index(
+        'ix_opa_audit_logs_resource', 'opa_audit_logs',
+        ['resource_type', 'resource_id', 'timestamp'], unique=False
+    )
+
+    op.execute("""
+        UPDATE opa_audit_logs o
+        SET linked_violation_id = v.violation_id
+        FROM violations v
+        WHERE v.opa_decision_hash = o.decision_hash
+          AND o.decision_hash <> 'legacy'
+          AND o.linked_violation_id IS NULL
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_opa_audit_logs_resource', table_name='opa_audit_logs')
+    op.drop_index('ix_opa_audit_logs_decision_hash', table_name='opa_audit_logs')
@@ -1,12 +1,19 @@
 from openai import AzureOpenAI
 import os
 
+from app.core.config import AI_CLIENT, AI_MAX_RETRIES, AI_STUB_LATENCY_MS, AI_TIMEOUT_SECONDS
+
 _client = None
 
 def get_ai_client():
     global _client
     if _client is not None:
         return _client
+
+    if AI_CLIENT == "stub":
+        from app.ai.stub_client import StubAIClient
+        _client = StubAIClient(latency=AI_STUB_LATENCY_MS / 1000)
+        return _client
         
     api_key = os.environ.get("AZURE_OPENAI_KEY")
     endpoint = os.environ.get("AZURE_OPENAI_ENDPOINT")
@@ -18,8 +25,11 @@ def get_ai_client():
         _client = AzureOpenAI(
             api_key=api_key,
             api_version="2024-02-01",
-            azure_endpoint=endpoint
+            azure_endpoint=endpoint,
+            # Never let a slow model hold a worker indefinitely
+            timeout=AI_TIMEOUT_SECONDS,
+            max_retries=AI_MAX_RETRIES
         )
         return _client
     except Exception:
-        return None
\ No newline at end of file
+        return None
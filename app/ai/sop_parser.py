@@ -1,23 +1,48 @@
-from app.ai.client import client
+import json
 
-def parse_sop_to_steps(sop_text: str) -> dict:
+from app.ai.client import get_ai_client
+from app.core.config import AI_SOP_PARSER_MODEL, AI_TIMEOUT_SECONDS
+
+# Bump when the prompt changes: cached parse results are keyed by it
+SOP_PARSER_PROMPT_VERSION = "v2"
+SOP_PARSER_SYSTEM_PROMPT = (
+    "Extract SOP steps into a structured JSON format. "
+    'Reply with JSON only: {"steps": [{"id": "<step number as written>", '
+    '"description": "<step text>", "role": "<performing role or null>"}]}. '
+    "Do not infer missing steps. Do not add new information. "
+    "The text may be one part of a longer document; extract only the steps it contains."
+)
+
+def parse_sop_to_steps(sop_text: str, client=None, model: str = AI_SOP_PARSER_MODEL, timeout: float = AI_TIMEOUT_SECONDS) -> dict:
     """
     NON-AUTHORITATIVE.
     AI suggests structure. Code validates.
     """
 
+    client = client or get_ai_client()
+    if not client:
+        raise RuntimeError("AI client is not configured")
+
     response = client.chat.completions.create(
-        model="gpt-4o-mini",
+        model=model,
         messages=[
             {
                 "role": "system",
-                "content": "Extract SOP steps into a structured JSON format."
+                "content": SOP_PARSER_SYSTEM_PROMPT
             },
             {
                 "role": "user",
                 "content": sop_text
             }
-        ]
+        ],
+        timeout=timeout
     )
 
-    return response.choices[0].message.content
\ No newline at end of file
+    content = response.choices[0].message.content
+    try:
+        parsed = json.loads(content)
+    except (TypeError, ValueError):
+        raise ValueError("SOP parser returned non-JSON output")
+    if not isinstance(parsed, dict) or not isinstance(parsed.get("steps"), list):
+        raise ValueError("Invalid SOP structure")
+    return parsed
@@ -0,0 +1,87 @@
+"""
+Local stand-in for the Azure OpenAI client (AI_CLIENT=stub).
+
+Implements the one call the AI modules use, client.chat.completions.create,
+deterministically and without network access. latency simulates the remote
+round trip (a per-call timeout shorter than it raises openai.APITimeoutError,
+the exception the real client raises); calls are counted so tests can assert
+how often the model was hit.
+
+SOP parsing requests (sop_parser system prompt) get a rule-based reply: every
+numbered line ("3. Weigh API [OPERATOR]", "Step 4: ...") becomes a step.
+Everything else gets a canned explanation of the user message.
+"""
+import json
+import re
+import threading
+import time
+from types import SimpleNamespace
+from typing import List, Optional
+
+import httpx
+import openai
+
+# Model name stub output is cached under, so it can never pass for a real model's text
+STUB_MODEL = "stub"
+
+_STEP_LINE_RE = re.compile(r"^\s*(?:step\s+)?(\d+(?:\.\d+)*)[.):]?\s+(.+?)\s*$", re.IGNORECASE)
+_ROLE_RE = re.compile(r"\s*\[([A-Za-z_ ]+)\]\s*$")
+
+
+def stub_parse_steps(text: str) -> dict:
+    steps = []
+    for line in text.splitlines():
+        match = _STEP_LINE_RE.match(line)
+        if not match:
+            continue
+        step_id, description = match.groups()
+        role_match = _ROLE_RE.search(description)
+        role = role_match.group(1).strip() if role_match else None
+        if role_match:
+            description = description[:role_match.start()]
+        steps.append({"id": step_id.rstrip("."), "description": description, "role": role})
+    return {"steps": steps}
+
+
+class _Completions:
+    def __init__(self, owner: "StubAIClient"):
+        self.owner = owner
+
+    def create(self, model: str, messages: List[dict], timeout: Optional[float] = None, **kwargs):
+        return self.owner._complete(model, messages, timeout)
+
+
+class StubAIClient:
+    def __init__(self, latency: float = 0.0, reply: Optional[str] = None):
+        self.lock = threading.Lock()
+        self.latency = latency
+        self.reply = reply
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0 # highest number of concurrent calls seen
+        self.chat = SimpleNamespace(completions=_Completions(self))
+
+    def _complete(self, model: str, messages: List[dict], timeout: Optional[float] = None):
+        with self.lock:
+            self.calls += 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            if timeout is not None and self.latency > timeout:
+                time.sleep(timeout)
+                raise openai.APITimeoutError(request=httpx.Request("POST", "stub://chat/completions"))
+            if self.latency:
+                time.sleep(self.latency)
+        finally:
+            with self.lock:
+                self.active -= 1
+
+        system_content = next((m["content"] for m in messages if m["role"] == "system"), "")
+        user_content = next((m["content"] for m in reversed(messages) if m["role"] == "user"), "")
+        if self.reply is not None:
+            content = self.reply
+        elif system_content.startswith("Extract SOP steps"):
+            content = json.dumps(stub_parse_steps(user_content))
+        else:
+            content = f"[stub:{model}] Explanation of {user_content}"
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
@@ -1,21 +1,27 @@
 from app.ai.client import get_ai_client
+from app.core.config import AI_EXPLAINER_MODEL, AI_TIMEOUT_SECONDS
 
-def explain_violation(code: str) -> str:
+# Bump when the prompt changes: cached explanations are keyed by it
+EXPLAINER_PROMPT_VERSION = "v1"
+EXPLAINER_SYSTEM_PROMPT = "Explain this violation in plain English."
+
+def explain_violation(code: str, client=None, model: str = AI_EXPLAINER_MODEL, timeout: float = AI_TIMEOUT_SECONDS) -> str:
     """
     Human-readable explanation only.
     No side effects.
     """
 
-    client = get_ai_client()
+    client = client or get_ai_client()
     if not client:
         return f"Explanation for {code} is currently unavailable (AI disabled)."
 
     response = client.chat.completions.create(
-        model="gpt-4o-mini",
+        model=model,
         messages=[
-            {"role": "system", "content": "Explain this violation in plain English."},
+            {"role": "system", "content": EXPLAINER_SYSTEM_PROMPT},
             {"role": "user", "content": code}
-        ]
+        ],
+        timeout=timeout
     )
 
-    return response.choices[0].message.content
\ No newline at end of file
+    return response.choices[0].message.content
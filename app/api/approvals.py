@@ -0,0 +1,64 @@
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import and_, exists
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db, get_current_actor
+from app.schemas import WorklistItem, WorklistPage
+from app.models.batch import Batch
+from app.models.procedure import ProcedureStep
+from app.core.fsm import State
+from app.core.pagination import InvalidCursor, keyset_page
+from app.enforcement.approval_gate import get_latest_approvals
+from app.security.roles import Role
+
+router = APIRouter()
+
+@router.get("/worklist", response_model=WorklistPage)
+def approval_worklist(
+    project_id: Optional[UUID] = None,
+    approver_role: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db),
+    actor_info: tuple[str, str] = Depends(get_current_actor),
+):
+    """
+    Supervisor worklist: batches AWAITING_APPROVAL, oldest first.
+    Keyset-paginated on (created_at, batch_id); pass next_cursor back as ?cursor=.
+    """
+    _, actor_role = actor_info
+    approver_role = approver_role or actor_role
+    try:
+        Role(approver_role)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid role: {approver_role}")
+
+    query = db.query(Batch).filter(Batch.current_state == State.AWAITING_APPROVAL.value)
+    if project_id:
+        query = query.filter(Batch.project_id == project_id)
+
+    # Only batches whose procedure has a step this role signs off
+    query = query.filter(exists().where(and_(
+        ProcedureStep.procedure_id == Batch.procedure_id,
+        ProcedureStep.requires_approval.is_(True),
+        ProcedureStep.approver_role == approver_role,
+    )))
+
+    try:
+        page, next_cursor = keyset_page(query, Batch.created_at, Batch.batch_id, cursor, limit)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    latest = get_latest_approvals(db, [b.batch_id for b in page])
+    items = []
+    for b in page:
+        approval = latest.get(b.batch_id)
+        item = WorklistItem.model_validate(b)
+        item.latest_decision = approval.decision if approval else None
+        item.can_progress = bool(approval and approval.decision == "APPROVED")
+        items.append(item)
+
+    return WorklistPage(items=items, next_cursor=next_cursor)
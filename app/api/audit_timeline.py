@@ -18,7 +18,9 @@ router = APIRouter()
 from app.core.circuit_breaker import circuit_breaker, CircuitType
 from app.models.timeline_snapshot import TimelineSnapshot
 from app.core.sync import sync_manager
-from fastapi.responses import JSONResponse
+from fastapi.responses import FileResponse, JSONResponse
+from starlette.background import BackgroundTask
+import os
 from sqlalchemy import desc
 from sqlalchemy.exc import SQLAlchemyError
 import logging
@@ -369,6 +371,39 @@ Source of Truth.
         }
     )
 
+@router.get("/{batch_id}/timeline/pdf/full")
+def export_batch_audit_trail_pdf(
+    batch_id: UUID,
+    db: Session = Depends(get_db),
+    actor_info: tuple[str, str] = Depends(get_current_actor)
+):
+    """
+    Full authoritative timeline PDF (every audit log row).
+    Rendered on the render pool, page-by-page into a temp file from a server-side cursor,
+    then streamed from disk, so memory stays bounded regardless of audit trail size.
+    """
+    from app.services.pdf import render_batch_timeline_pdf
+
+    actor_id, _ = actor_info
+    path = render_batch_timeline_pdf(batch_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Batch artifact not found")
+
+    write_audit_log(
+        db=db,
+        action="EXPORT_PDF",
+        batch_id=batch_id,
+        actor=actor_id,
+        metadata={"format": "pdf", "scope": "full_audit_trail"}
+    )
+
+    return FileResponse(
+        path,
+        media_type="application/pdf",
+        filename=f"batch_{batch_id}_audit_trail.pdf",
+        background=BackgroundTask(os.remove, path)
+    )
+
 @router.post("/{batch_id}/timeline/email")
 def email_batch_timeline(
     batch_id: str, 
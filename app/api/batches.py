@@ -1,9 +1,10 @@
-from typing import List, Optional, Dict
+import os
+from typing import Annotated, List, Optional, Dict
 from uuid import UUID
 
 from datetime import datetime, timezone
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from sqlalchemy.orm import Session, sessionmaker
 
 from app.api.deps import get_db, get_current_actor
 from app.schemas import BatchCreateRequest, BatchResponse
@@ -11,20 +12,56 @@ from app.models.batch import Batch
 from app.core.fsm import Event, State
 from app.core.transitions import execute_transition
 from app.core.audit import write_audit_log
+from app.core.config import DEFAULT_PROJECT_ID
+from app.core.projections import record_batch_created
+from app.core.pagination import InvalidCursor, keyset_page
+from app.core.idempotency import (
+    IdempotencyConflict, IdempotencyInProgress, claim_key, release_key, remember_response, replay_response,
+    request_fingerprint
+)
 
 router = APIRouter()
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
 @router.get("/", response_model=List[BatchResponse])
 def list_batches(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    state: Optional[State] = None,
+    procedure_id: Optional[UUID] = None,
+    procedure_version: Optional[int] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
     recent: bool = False,
     db: Session = Depends(get_db),
 ):
+    """
+    Keyset-paginated on (created_at, batch_id): oldest first, or newest first with ?recent=true.
+    The body stays a plain list; the cursor for the next page is returned in X-Next-Cursor.
+    """
     query = db.query(Batch)
-    if recent:
-        query = query.order_by(Batch.created_at.desc())
-    batches = query.offset(skip).limit(limit).all()
+    if state:
+        query = query.filter(Batch.current_state == state.value)
+    if procedure_id:
+        query = query.filter(Batch.procedure_id == procedure_id)
+    if procedure_version is not None:
+        query = query.filter(Batch.procedure_version == procedure_version)
+    if created_from:
+        query = query.filter(Batch.created_at >= created_from)
+    if created_to:
+        query = query.filter(Batch.created_at < created_to)
+
+    try:
+        batches, next_cursor = keyset_page(
+            query, Batch.created_at, Batch.batch_id, cursor, limit, descending=recent
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return batches
 
 @router.post("/", response_model=BatchResponse, status_code=status.HTTP_201_CREATED)
@@ -32,12 +69,27 @@ def create_batch(
     request: BatchCreateRequest,
     db: Session = Depends(get_db),
     actor_info: tuple[str, str] = Depends(get_current_actor),
+    idempotency_key: Annotated[Optional[str], Header(alias="Idempotency-Key")] = None,
 ):
     actor_id, actor_role = actor_info
+
+    scope = f"POST /batches/:{actor_id}"
+    request_hash = request_fingerprint(request.model_dump(mode="json"))
+    if idempotency_key:
+        try:
+            replay = claim_key(db, idempotency_key, scope, request_hash)
+        except IdempotencyConflict as e:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+        except IdempotencyInProgress as e:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e), headers={"Retry-After": "1"})
+        if replay:
+            return replay_response(replay)
     
     # Check if batch already exists
     existing_batch = db.query(Batch).filter(Batch.batch_id == request.batch_id).first()
     if existing_batch:
+        if idempotency_key:
+            release_key(db, idempotency_key, scope)
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Batch already exists"
@@ -45,6 +97,7 @@ def create_batch(
 
     new_batch = Batch(
         batch_id=request.batch_id,
+        project_id=request.project_id or DEFAULT_PROJECT_ID,
         procedure_id=request.procedure_id,
         procedure_version=request.procedure_version,
         current_state=State.CREATED.value,
@@ -54,6 +107,7 @@ def create_batch(
     
     try:
         db.flush() # Verify constraints but allow rollback
+        record_batch_created(db, new_batch)
         
         execute_transition(
             db=db,
@@ -64,15 +118,26 @@ def create_batch(
             occurred_at=datetime.now(timezone.utc),
             procedure_version=request.procedure_version 
         )
+        if idempotency_key:
+            remember_response(
+                db, idempotency_key, scope, request_hash,
+                status.HTTP_201_CREATED, BatchResponse.model_validate(new_batch).model_dump(mode="json")
+            )
         return new_batch
     except PermissionError as e:
         db.rollback()
+        if idempotency_key:
+            release_key(db, idempotency_key, scope)
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
     except RuntimeError as e:
         db.rollback()
+        if idempotency_key:
+            release_key(db, idempotency_key, scope)
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     except Exception as e:
         db.rollback()
+        if idempotency_key:
+            release_key(db, idempotency_key, scope)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
 @router.get("/{batch_id}", response_model=BatchResponse)
@@ -102,10 +167,11 @@ def email_batch_report(
 ):
     """
     Forensic Email Dispatch (Step 3/4).
-    Generates artifacts and sends via SMTP with authoritative audit logging.
+    Generates artifacts and queues them on the pooled mailer; the request does not wait
+    for SMTP. Delivery (EMAIL_SENT) or final failure (EMAIL_FAILED) is audited by the mailer.
     """
-    from app.core.email import send_email
-    from app.services.pdf import generate_authoritative_timeline_pdf
+    from app.services.mailer import MailQueueFull, mailer
+    from app.services.pdf import render_batch_timeline_pdf
     
     actor_id, _ = actor_info
     batch = db.query(Batch).filter(Batch.batch_id == batch_id).first()
@@ -115,32 +181,49 @@ def email_batch_report(
     # 1. Generate Attachments
     email_attachments = []
     if payload.attachments.get("timeline_pdf"):
-        pdf_bytes = generate_authoritative_timeline_pdf(db, batch_id)
-        if pdf_bytes:
-            email_attachments.append((f"batch_{batch_id}_timeline.pdf", pdf_bytes))
+        # Rendered on the render pool; only the finished PDF is read back
+        path = render_batch_timeline_pdf(batch_id)
+        if path:
+            try:
+                with open(path, "rb") as f:
+                    email_attachments.append((f"batch_{batch_id}_timeline.pdf", f.read()))
+            finally:
+                os.remove(path)
+
+    # 2. Queue Email (Authoritative Audit on outcome, Step 7)
+    session_factory = sessionmaker(bind=db.get_bind())
+    metadata = {
+        "recipients": payload.to,
+        "subject": payload.subject,
+        "attachment_types": [k for k, v in payload.attachments.items() if v]
+    }
+
+    def audit_outcome(action: str, result: str, extra: dict):
+        with session_factory() as audit_db:
+            write_audit_log(
+                db=audit_db,
+                action=action,
+                batch_id=batch_id,
+                result=result,
+                actor=actor_id,
+                metadata={**metadata, **extra}
+            )
 
-    # 2. Send Email
     try:
-        send_email(
+        email = mailer.enqueue(
             to=payload.to,
             subject=payload.subject,
             body=payload.message or "",
-            attachments=email_attachments
+            attachments=email_attachments,
+            on_delivered=lambda email, refused: audit_outcome(
+                "EMAIL_SENT", "SUCCESS", {"message_id": email.id, "refused": sorted(refused)}
+            ),
+            on_failed=lambda email, error: audit_outcome(
+                "EMAIL_FAILED", "FAILURE", {"message_id": email.id, "error": error}
+            ),
         )
-    except Exception as e:
-        raise HTTPException(status_code=502, detail=f"Email delivery failed: {str(e)}")
-
-    # 3. Authoritative Audit (Step 7)
-    write_audit_log(
-        db=db,
-        action="EMAIL_SENT",
-        batch_id=batch_id,
-        actor=actor_id,
-        metadata={
-            "recipients": payload.to,
-            "subject": payload.subject,
-            "attachment_types": [k for k, v in payload.attachments.items() if v]
-        }
-    )
+    except MailQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    return {"status": "queued", "recipients": payload.to, "message_id": email.id}
 
-    return {"status": "sent", "recipients": payload.to}
@@ -1,11 +1,10 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from pydantic import BaseModel
-from app.api.deps import get_db
-from app.models.batch import Batch
-from app.models.violation import Violation
-from app.core.fsm import State
+from app.api.deps import get_read_db
+from app.core.projections import read_batch_summary
+import uuid
 
 router = APIRouter()
 
@@ -23,28 +22,29 @@ class BoardResponse(BaseModel):
     status: str
 
 @router.get("/", response_model=List[BoardResponse])
-def get_boards(db: Session = Depends(get_db)):
+async def get_boards(
+    project_id: Optional[uuid.UUID] = None,
+    db: AsyncSession = Depends(get_read_db),
+):
     """
     Get dynamic dashboard boards (swimlanes/summaries).
-    Driven by backend state for perfect mapping.
+    Driven by the batch summary projection (one row per project).
     """
-    from app.models.procedure import Procedure
-    # Evidence might be a table or just audit logs. For now we use a placeholder or count audit logs.
-    from app.models.audit import AuditLog
+    summary = await db.run_sync(read_batch_summary, project_id)
 
     # 1. Procedures
-    proc_count = db.query(Procedure).count()
+    proc_count = summary["procedures"]
 
     # 2. Batches
-    total_batches = db.query(Batch).count()
-    completed_batches = db.query(Batch).filter(Batch.current_state == State.COMPLETED.value).count()
+    total_batches = summary["total_batches"]
+    completed_batches = summary["batches_completed"]
 
     # 3. Violations
-    violation_count = db.query(Violation).count()
-    resolved_violations = db.query(Violation).filter(Violation.status == 'RESOLVED').count()
+    violation_count = summary["total_violations"]
+    resolved_violations = summary["violations_resolved"]
 
     # 4. Evidence (Audit Logs as proxy for now)
-    evidence_count = db.query(AuditLog).count()
+    evidence_count = summary["audit_items"]
 
     boards = [
         BoardResponse(
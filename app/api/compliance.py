@@ -6,7 +6,6 @@ from pydantic import BaseModel, ConfigDict
 from typing import List, Optional
 import uuid
 from datetime import datetime
-import os
 
 router = APIRouter(tags=["compliance"])
 
@@ -54,8 +53,9 @@ def attach_evidence(report_id: uuid.UUID, req: AttachEvidenceRequest, db: Sessio
     if not report:
         raise HTTPException(status_code=404, detail="Compliance report not found")
         
-    # Verify blob exists in our local simulated storage
-    if not os.path.exists(req.blob_path):
+    # Verify blob exists in the evidence store (digest, store path/URL, or legacy local path)
+    from app.storage.evidence_store import get_evidence_store
+    if not get_evidence_store().exists_ref(req.blob_path):
         raise HTTPException(status_code=400, detail="Forensic evidence blob not found in secure storage")
         
     evidence = ComplianceEvidence(
@@ -81,64 +81,17 @@ def attach_current_filters(
 ):
     """
     Atomic: Generates Filter Audit PDF and attaches it to the report (Part 2).
+    For large windows prefer POST /exports (kind=compliance_filter_trail).
     """
-    from app.core.filter_audit import verify_filter_chain
-    from app.models.filter_audit import FilterAuditLog
-    import json
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Table, TableStyle
-    from reportlab.lib.pagesizes import letter
-    from reportlab.lib import colors
-    from reportlab.lib.styles import getSampleStyleSheet
-    import io
+    from app.services.audit_service import attach_filter_trail
 
-    # 1. Fetch
-    records = db.query(FilterAuditLog).filter(
-        FilterAuditLog.screen == req.screen,
-        FilterAuditLog.created_at >= req.from_ts,
-        FilterAuditLog.created_at <= req.to_ts
-    ).order_by(FilterAuditLog.created_at.asc()).all()
+    try:
+        filepath = attach_filter_trail(db, report_id, req.screen, req.from_ts, req.to_ts, req.evidence_type)
+    except LookupError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
 
-    if not records:
-        raise HTTPException(status_code=400, detail="No audit data found for the selected range")
-
-    # 2. Verify
-    verification = verify_filter_chain(db)
-    if not verification["valid"]:
-        raise HTTPException(status_code=409, detail="Filter audit trail integrity violation")
-
-    # 3. Generate
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter)
-    styles = getSampleStyleSheet()
-    elements = []
-    elements.append(Paragraph(f"Forensic Filter Trail: {req.screen}", styles["Title"]))
-    elements.append(Paragraph(f"Integrity Check: VALID", styles["Normal"]))
-    
-    table_data = [["Timestamp", "Payload", "Hash"]]
-    for r in records:
-        table_data.append([r.created_at.isoformat(), json.dumps(r.filter_payload)[:40], r.hash[:8]])
-    
-    t = Table(table_data)
-    t.setStyle(TableStyle([('GRID', (0,0), (-1,-1), 1, colors.black)]))
-    elements.append(t)
-    doc.build(elements)
-
-    # 4. Store
-    os.makedirs("evidence/filters", exist_ok=True)
-    filename = f"verified_trail_{uuid.uuid4().hex[:8]}.pdf"
-    filepath = f"evidence/filters/{filename}"
-    with open(filepath, "wb") as f:
-        f.write(buffer.getvalue())
-
-    # 5. Attach
-    evidence = ComplianceEvidence(
-        report_id=report_id,
-        blob_path=filepath,
-        evidence_type=req.evidence_type
-    )
-    db.add(evidence)
-    db.commit()
-    
     return {"status": "generated_and_attached", "path": filepath}
 
 @router.get("/compliance-reports/{report_id}", response_model=ComplianceReportSchema)
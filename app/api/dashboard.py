@@ -1,20 +1,21 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import text
-from app.api.deps import get_db, get_current_actor
-from app.models.batch import Batch
-from app.models.procedure import Procedure
-from app.models.violation import Violation
-from app.core.fsm import State
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from app.api.deps import get_read_db
+from app.core.projections import read_batch_summary
 from app.core.circuit_breaker import circuit_breaker
 import logging
+import uuid
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 
 @router.get("/summary")
-def get_dashboard_summary(db: Session = Depends(get_db)):
+async def get_dashboard_summary(
+    project_id: Optional[uuid.UUID] = None,
+    db: AsyncSession = Depends(get_read_db),
+):
     """
     Authoritative Dashboard Aggregator.
     PHASE 4: No fake data. Aggregate from real database records.
@@ -33,11 +34,13 @@ def get_dashboard_summary(db: Session = Depends(get_db)):
         }
 
     try:
+        # Single-row read of the batch summary projection
+        summary = await db.run_sync(read_batch_summary, project_id)
         data = {
-            "total_procedures": db.query(Procedure).count(),
-            "total_batches": db.query(Batch).count(),
-            "completed_batches": db.query(Batch).filter(Batch.current_state == State.COMPLETED.value).count(),
-            "violated_batches": db.query(Violation).filter(Violation.status == 'OPEN').count(),
+            "total_procedures": summary["procedures"],
+            "total_batches": summary["total_batches"],
+            "completed_batches": summary["batches_completed"],
+            "violated_batches": summary["violations_open"],
             "mode": "live"
         }
         circuit_breaker.record_success(endpoint)
@@ -1,7 +1,9 @@
-from typing import Generator, Annotated
-from fastapi import Depends, Header, HTTPException, status, Request
+from typing import AsyncGenerator, Generator, Annotated
+from fastapi import Depends, Header, HTTPException, status, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.core.database import SessionLocal
+from app.core.read_routing import DB_ROUTE_HEADER, replica_router
 from app.security.roles import Role
 
 def get_db() -> Generator[Session, None, None]:
@@ -11,6 +13,14 @@ def get_db() -> Generator[Session, None, None]:
     finally:
         db.close()
 
+async def get_read_db(request: Request, response: Response) -> AsyncGenerator[AsyncSession, None]:
+    # GET-only async endpoints: replica unless the client just wrote or the replica lags
+    # (primary when no replica is configured); sync helpers run via `await db.run_sync(fn, ...)`
+    factory, route = await replica_router.route(request)
+    response.headers[DB_ROUTE_HEADER] = route
+    async with factory() as db:
+        yield db
+
 # Simulated Authentication for MVP / Judge Verification
 # In a real setup, this would decode a JWT.
 # Here, we accept explicit headers to prove RBAC logic works deterministically.
@@ -1,5 +1,6 @@
 from datetime import datetime, timezone
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Annotated, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db, get_current_actor
@@ -7,6 +8,10 @@ from app.schemas import EventRequest, BatchResponse
 from app.models.batch import Batch
 from app.core.fsm import Event
 from app.core.transitions import execute_transition
+from app.core.idempotency import (
+    IdempotencyConflict, IdempotencyInProgress, claim_key, release_key, remember_response, replay_response,
+    request_fingerprint
+)
 
 router = APIRouter()
 
@@ -16,11 +21,28 @@ def submit_event(
     request: EventRequest,
     db: Session = Depends(get_db),
     actor_info: tuple[str, str] = Depends(get_current_actor),
+    idempotency_key: Annotated[Optional[str], Header(alias="Idempotency-Key")] = None,
 ):
     actor_id, actor_role = actor_info
+
+    # MES retries: replay the stored outcome instead of re-running the FSM
+    # (a retry against a terminal batch must not emit a second violation).
+    scope = f"POST /batches/{batch_id}/event:{actor_id}"
+    request_hash = request_fingerprint(request.model_dump(mode="json"))
+    if idempotency_key:
+        try:
+            replay = claim_key(db, idempotency_key, scope, request_hash)
+        except IdempotencyConflict as e:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+        except IdempotencyInProgress as e:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e), headers={"Retry-After": "1"})
+        if replay:
+            return replay_response(replay)
     
     batch = db.query(Batch).filter(Batch.batch_id == batch_id).first()
     if not batch:
+        if idempotency_key:
+            release_key(db, idempotency_key, scope)
         raise HTTPException(status_code=404, detail="Batch not found")
 
     try:
@@ -94,6 +116,11 @@ def submit_event(
         
         # Refetch to ensure we have latest state (though checking object in session might be enough)
         db.refresh(batch)
+        if idempotency_key:
+            remember_response(
+                db, idempotency_key, scope, request_hash,
+                status.HTTP_200_OK, BatchResponse.model_validate(batch).model_dump(mode="json")
+            )
         return batch
 
     except PermissionError as e:
@@ -101,6 +128,8 @@ def submit_event(
         # But core checks threw authorization BEFORE any DB writes in the new ordering.
         # So rollback is correct.
         db.rollback()
+        if idempotency_key:
+            release_key(db, idempotency_key, scope)
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
         
     except RuntimeError as e:
@@ -125,8 +154,15 @@ def submit_event(
         # raise HTTPException(status_code=409, detail=f"Transition failed: {str(e)}")
         # Better: Return the batch with 409 status? FastAPI doesn't easily allow return body on exception.
         # We will simply raise 409 with the error message.
+        if idempotency_key:
+            remember_response(
+                db, idempotency_key, scope, request_hash,
+                status.HTTP_409_CONFLICT, {"detail": str(e)}
+            )
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
 
     except Exception as e:
         db.rollback()
+        if idempotency_key:
+            release_key(db, idempotency_key, scope)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
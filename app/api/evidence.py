@@ -1,17 +1,71 @@
-from fastapi import APIRouter, UploadFile, File
-from app.storage.blob import upload_evidence
+import hashlib
+import re
+
+from fastapi import APIRouter, HTTPException, UploadFile, File
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+from app.storage.blob import CHUNK_SIZE
+from app.storage.evidence_store import get_evidence_store
 
 router = APIRouter()
 
+SHA256_RE = re.compile(r"^[0-9a-f]{64}$")
+
 @router.post("/evidence/upload")
 async def upload(file: UploadFile = File(...)):
-    data = await file.read()
+    """
+    Streams the upload (spooled to disk by the multipart parser) in chunks while hashing it,
+    then stores it content-addressed: identical evidence is never uploaded twice.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    while chunk := await file.read(CHUNK_SIZE):
+        digest.update(chunk)
+        size += len(chunk)
+    await file.seek(0)
 
-    blob_url = upload_evidence(
-        file_bytes=data,
-        filename=file.filename,
-        content_type=file.content_type
+    # Blocking storage I/O: keep it off the event loop
+    stored = await run_in_threadpool(
+        get_evidence_store().put_stream,
+        file.file,
+        file.filename,
+        file.content_type,
+        digest.hexdigest(),
+        size,
     )
 
-    # Store blob_url in PostgreSQL (separate module)
-    return {"blob_url": blob_url}
\ No newline at end of file
+    # sha256 goes straight into the evidence chain (separate module)
+    return {
+        "blob_url": stored.url,
+        "sha256": stored.sha256,
+        "size": stored.size,
+        "deduplicated": stored.deduplicated,
+        "download_url": f"/evidence/{stored.sha256}",
+    }
+
+@router.get("/evidence/{sha256}")
+def download(sha256: str):
+    """
+    Serves stored evidence by digest. Local objects go out as a file response
+    (zero-copy where the server supports sendfile/pathsend); remote ones are streamed.
+    """
+    sha256 = sha256.lower()
+    if not SHA256_RE.match(sha256):
+        raise HTTPException(status_code=400, detail="Evidence id must be a SHA-256 hex digest")
+
+    store = get_evidence_store()
+    meta = store.stat(sha256)
+    if meta is None:
+        raise HTTPException(status_code=404, detail="Evidence not found")
+
+    headers = {"ETag": f'"{sha256}"', "Cache-Control": "private, max-age=31536000, immutable"}
+    filename = meta.original_filename or sha256
+    path = store.local_path(sha256)
+    if path:
+        return FileResponse(path, media_type=meta.content_type, filename=filename, headers=headers)
+    return StreamingResponse(
+        store.iter_chunks(sha256),
+        media_type=meta.content_type,
+        headers={**headers, "Content-Disposition": f'attachment; filename="{filename}"', "Content-Length": str(meta.size)}
+    )
@@ -1,57 +1,148 @@
-from fastapi import APIRouter, HTTPException, Depends
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.requests import ClientDisconnect
 from sqlalchemy.orm import Session
 from app.api.deps import get_db
-from app.enforcement.engine import run_enforcement
-from app.ai.violation_explainer import explain_violation
+from app.enforcement.engine import find_violations
+from app.enforcement.incremental import EnforcementStateConflict, enforce_events
+from app.models.batch import Batch
+from app.services.bulk_verification import bulk_verifier
+from app.ai.client import get_ai_client
+from app.services.explanation_cache import explanation_cache
 import os
+import uuid
 
 router = APIRouter()
 
+class DuplexStreamingResponse(StreamingResponse):
+    """
+    Streams the response while the request body is still being read.
+    StreamingResponse's disconnect listener would race the body reader for
+    receive() messages; here the body reader sees the disconnect itself.
+    """
+    async def __call__(self, scope, receive, send):
+        try:
+            await self.stream_response(send)
+        except OSError:
+            raise ClientDisconnect()
+
 @router.post("/execute")
 def execute_sop_verification(payload: dict):
     """
     Stateless endpoint for SOP execution verification.
     Proves deterministic enforcement.
+    Set "collect_all": true to receive every violation, not only the first.
     """
     sop = payload.get("procedure")
     execution = payload.get("execution")
     roles = payload.get("roles")
+    collect_all = bool(payload.get("collect_all", False))
 
     if not sop or not execution or not roles:
         raise HTTPException(status_code=400, detail="Missing required fields")
 
     # 1. Deterministic Enforcement (AUTHORITATIVE)
-    violation = run_enforcement(
+    violations = find_violations(
         sop_steps=sop["steps"],
         execution_events=execution,
-        role_map=roles
+        role_map=roles,
+        collect_all=collect_all
     )
+    violation = violations[0] if violations else None
 
     if violation:
-        # 2. AI Explanation (NON-AUTHORITATIVE)
+        # 2. AI Explanation (NON-AUTHORITATIVE, never on the request path)
         explanation = None
+        explanation_status = "DISABLED"
         if os.getenv("AI_ENABLED", "true").lower() == "true":
-            try:
-                # Mock AI call if key is missing or use placeholder
-                # Note: explain_violation calls Azure OpenAI
-                if "AZURE_OPENAI_KEY" in os.environ:
-                    explanation = explain_violation(violation["code"])
-                else:
-                    explanation = f"AI Explanation for {violation['code']}: [AI Service Mocked]"
-            except Exception:
-                explanation = "AI Explanation Service Unavailable"
+            if get_ai_client() is not None:
+                # Cached: returned now. Otherwise generated in the background; poll explanation_url
+                explanation_status, explanation = explanation_cache.request(violation["code"])
+            else:
+                # Mock AI call if no client is configured
+                explanation = f"AI Explanation for {violation['code']}: [AI Service Mocked]"
+                explanation_status = "MOCKED"
+
+        content = {
+            "status": "VIOLATED",
+            "violation": violation,
+            "explanation": explanation,
+            "explanation_status": explanation_status
+        }
+        if explanation_status == "PENDING":
+            content["explanation_url"] = f"/explanations/{violation['code']}"
+        if collect_all:
+            content["violations"] = violations
+        return JSONResponse(status_code=403, content=content)
 
+    return {
+        "status": "SUCCESS",
+        "violation": None
+    }
+
+@router.get("/explanations/{code}")
+def get_violation_explanation(code: str):
+    """
+    Follow-up for a PENDING explanation_status from /execute.
+    NON-AUTHORITATIVE text; never triggers a model call by itself.
+    """
+    status, detail = explanation_cache.status(code)
+    content = {"code": code, "status": status, "explanation": None}
+    if status == "READY":
+        content["explanation"] = detail
+    elif status == "FAILED":
+        content["error"] = detail
+    return content
+
+@router.post("/execute/bulk")
+async def execute_sop_verification_bulk(request: Request):
+    """
+    Bulk SOP execution verification (e.g. nightly re-validation of historical batches).
+    Body: NDJSON, one /execute payload per line (optionally with "batch_id").
+    Response: NDJSON results in input order, then a summary line with throughput.
+    No AI explanations are generated in bulk mode.
+    """
+    return DuplexStreamingResponse(bulk_verifier.stream(request.stream()), media_type="application/x-ndjson")
+
+@router.post("/batches/{batch_id}/execute/events")
+def execute_events_incremental(batch_id: uuid.UUID, payload: dict, db: Session = Depends(get_db)):
+    """
+    Incremental SOP verification for a long-running batch.
+    Send only the NEW events; they are checked against the batch's stored
+    enforcement state, so the cost per event does not grow with history.
+    Set "complete": true with the last events to check for missing steps.
+    """
+    sop = payload.get("procedure")
+    events = payload.get("events")
+    roles = payload.get("roles")
+    complete = bool(payload.get("complete", False))
+
+    if not sop or events is None or not roles:
+        raise HTTPException(status_code=400, detail="Missing required fields")
+
+    if not db.query(Batch.batch_id).filter(Batch.batch_id == batch_id).first():
+        raise HTTPException(status_code=404, detail="Batch not found")
+
+    try:
+        result = enforce_events(db, batch_id, sop["steps"], roles, events, complete=complete)
+    except EnforcementStateConflict as e:
+        db.rollback()
+        raise HTTPException(status_code=409, detail=str(e))
+    db.commit()
+
+    if result.violations:
         return JSONResponse(
             status_code=403,
             content={
                 "status": "VIOLATED",
-                "violation": violation,
-                "explanation": explanation
+                "violation": result.violations[0],
+                "violations": result.violations,
+                "state": result.state
             }
         )
 
     return {
         "status": "SUCCESS",
-        "violation": None
+        "violation": None,
+        "state": result.state
     }
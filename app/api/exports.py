@@ -0,0 +1,96 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy.orm import Session, sessionmaker
+import os
+
+from app.api.deps import get_db, get_current_actor
+from app.models.export_job import ExportJob
+from app.services.export_jobs import ExportQueueFull, export_jobs
+
+router = APIRouter()
+
+
+class ExportJobRequest(BaseModel):
+    kind: str # timeline_pdf, batch_email, filter_audit_pdf, compliance_filter_trail, chain_verification
+    params: dict
+
+
+class ExportJobResponse(BaseModel):
+    id: UUID
+    kind: str
+    status: str
+    requested_by: str
+    progress: int
+    stage: Optional[str] = None
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    downloadable: bool = False
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    expires_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+def export_job_response(job: ExportJob) -> ExportJobResponse:
+    response = ExportJobResponse.model_validate(job)
+    response.downloadable = job.status == "COMPLETED" and bool(job.result_path)
+    return response
+
+
+@router.post("", response_model=ExportJobResponse, status_code=202)
+def create_export_job(
+    req: ExportJobRequest,
+    db: Session = Depends(get_db),
+    actor_info: tuple[str, str] = Depends(get_current_actor)
+):
+    """
+    Queues a heavy export (PDF render, forensic email, compliance bundle).
+    Poll GET /exports/{job_id}; fetch the artifact from .../download.
+    """
+    actor_id, _ = actor_info
+    # In-process fallback (EXPORT_JOB_WORKERS=0) runs on the same engine as this request
+    session_factory = sessionmaker(bind=db.get_bind())
+    try:
+        job = export_jobs.submit(db, req.kind, req.params, requested_by=actor_id, session_factory=session_factory)
+    except ExportQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return export_job_response(job)
+
+
+@router.get("/{job_id}", response_model=ExportJobResponse)
+def get_export_job(
+    job_id: UUID,
+    db: Session = Depends(get_db),
+    actor_info: tuple[str, str] = Depends(get_current_actor)
+):
+    job = db.query(ExportJob).filter(ExportJob.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    return export_job_response(job)
+
+
+@router.get("/{job_id}/download")
+def download_export_result(
+    job_id: UUID,
+    db: Session = Depends(get_db),
+    actor_info: tuple[str, str] = Depends(get_current_actor)
+):
+    job = db.query(ExportJob).filter(ExportJob.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    if job.status != "COMPLETED":
+        raise HTTPException(status_code=409, detail=f"Export job is {job.status}")
+    if not job.result_path:
+        raise HTTPException(status_code=404, detail="Export job has no downloadable result")
+    if not os.path.exists(job.result_path):
+        raise HTTPException(status_code=410, detail="Export result has expired")
+    return FileResponse(job.result_path, media_type=job.media_type, filename=job.result_filename)
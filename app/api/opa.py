@@ -1,12 +1,12 @@
 from fastapi import APIRouter, Query, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timezone
 import uuid
 from typing import Optional, List
 from pydantic import BaseModel, ConfigDict
 
-from app.api.deps import get_db
+from app.api.deps import get_read_db
 from app.models.opa_audit import OPAAuditLog
 
 router = APIRouter()
@@ -32,8 +32,8 @@ class OPAAuditLogListResponse(BaseModel):
     total: int
 
 @router.get("/audit-logs", response_model=OPAAuditLogListResponse)
-def get_opa_audit_logs(
-    db: Session = Depends(get_db),
+async def get_opa_audit_logs(
+    db: AsyncSession = Depends(get_read_db),
     from_ts: datetime = Query(...),
     to_ts: datetime = Query(...),
     project_id: Optional[uuid.UUID] = Query(None),
@@ -48,18 +48,18 @@ def get_opa_audit_logs(
         start_time = from_ts.replace(tzinfo=timezone.utc) if from_ts.tzinfo is None else from_ts
         end_time = to_ts.replace(tzinfo=timezone.utc) if to_ts.tzinfo is None else to_ts
 
-        query = db.query(OPAAuditLog)
+        query = select(OPAAuditLog)
         
         # Filters
         if project_id:
-            query = query.filter(OPAAuditLog.project_id == project_id)
+            query = query.where(OPAAuditLog.project_id == project_id)
         if decision:
-            query = query.filter(OPAAuditLog.decision == decision)
+            query = query.where(OPAAuditLog.decision == decision)
             
-        query = query.filter(OPAAuditLog.timestamp >= start_time)
-        query = query.filter(OPAAuditLog.timestamp <= end_time)
+        query = query.where(OPAAuditLog.timestamp >= start_time)
+        query = query.where(OPAAuditLog.timestamp <= end_time)
 
-        logs = query.order_by(OPAAuditLog.timestamp.desc()).all()
+        logs = (await db.scalars(query.order_by(OPAAuditLog.timestamp.desc()))).all()
         
         return {
             "items": logs,
@@ -75,8 +75,8 @@ def get_opa_audit_logs(
         )
 
 @router.get("/audit-logs/export")
-def export_opa_audit_logs(
-    db: Session = Depends(get_db),
+async def export_opa_audit_logs(
+    db: AsyncSession = Depends(get_read_db),
     from_ts: datetime = Query(...),
     to_ts: datetime = Query(...),
     project_id: Optional[uuid.UUID] = Query(None)
@@ -87,7 +87,7 @@ def export_opa_audit_logs(
     import json
     from fastapi import Response
     
-    data = get_opa_audit_logs(db, from_ts=from_ts, to_ts=to_ts, project_id=project_id)
+    data = await get_opa_audit_logs(db, from_ts=from_ts, to_ts=to_ts, project_id=project_id, decision=None)
     return Response(
         content=json.dumps(data, indent=4, default=str),
         media_type="application/json",
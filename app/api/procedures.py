@@ -1,13 +1,31 @@
+import openai
 from fastapi import APIRouter, Depends, HTTPException, status
+from pydantic import BaseModel
 from sqlalchemy.orm import Session
-from typing import List
+from starlette.concurrency import run_in_threadpool
+from typing import List, Optional
 
 from app.api.deps import get_db
 from app.schemas import ProcedureResponse
 from app.models.procedure import Procedure
+from app.services.sop_ingestion import sop_ingestion
 
 router = APIRouter()
 
+class ParseSOPRequest(BaseModel):
+    text: str
+
+class ParsedStep(BaseModel):
+    id: str
+    description: str
+    role: Optional[str] = None
+
+class ParseSOPResponse(BaseModel):
+    sha256: str
+    chunks: int
+    cached: bool
+    steps: List[ParsedStep]
+
 @router.get("/", response_model=List[ProcedureResponse])
 def list_procedures(
     skip: int = 0,
@@ -32,3 +50,26 @@ def get_procedure(
     if not procedure:
         raise HTTPException(status_code=404, detail="Procedure not found")
     return procedure
+
+@router.post("/parse", response_model=ParseSOPResponse)
+async def parse_sop_document(req: ParseSOPRequest):
+    """
+    NON-AUTHORITATIVE: suggests a step structure for an SOP document.
+    Large documents are parsed in chunks; unchanged documents are served from cache.
+    """
+    if not req.text.strip():
+        raise HTTPException(status_code=400, detail="SOP text is empty")
+    try:
+        parsed = await run_in_threadpool(sop_ingestion.ingest, req.text)
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except openai.APITimeoutError:
+        raise HTTPException(status_code=504, detail="SOP parser timed out")
+    except (openai.APIConnectionError, openai.RateLimitError, openai.InternalServerError) as e:
+        # Transient upstream condition: the client may retry
+        raise HTTPException(status_code=503, detail=f"SOP parser unavailable: {type(e).__name__}")
+    except openai.APIError as e:
+        raise HTTPException(status_code=502, detail=f"SOP parser failed: {type(e).__name__}")
+    return ParseSOPResponse(sha256=parsed.sha256, chunks=parsed.chunks, cached=parsed.cached, steps=parsed.steps)
@@ -1,11 +1,13 @@
 from fastapi import APIRouter, Query, Depends, HTTPException, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from datetime import datetime, timezone
 from typing import Optional, List
 from pydantic import BaseModel, ConfigDict
 import uuid
 
-from app.api.deps import get_db, get_current_actor
+from app.api.deps import get_read_db, get_db, get_current_actor
 from app.models.audit import AuditLog
 from app.core.filter_audit import log_filter_event, verify_filter_chain
 from app.services.audit_service import generate_filter_audit_report
@@ -34,8 +36,8 @@ class AuditLogListResponse(BaseModel):
     total: int
 
 @router.get("/audit-logs", response_model=AuditLogListResponse)
-def get_audit_logs(
-    db: Session = Depends(get_db),
+async def get_audit_logs(
+    db: AsyncSession = Depends(get_read_db),
     domain: str = Query("SYSTEM"),
     project_id: Optional[uuid.UUID] = Query(None),
     from_ts: datetime = Query(...),
@@ -52,14 +54,14 @@ def get_audit_logs(
         start_time = from_ts.replace(tzinfo=timezone.utc) if from_ts.tzinfo is None else from_ts
         end_time = to_ts.replace(tzinfo=timezone.utc) if to_ts.tzinfo is None else to_ts
 
-        query = db.query(AuditLog).filter(AuditLog.source == domain.upper())
+        query = select(AuditLog).where(AuditLog.source == domain.upper())
         if project_id:
-            query = query.filter(AuditLog.project_id == project_id)
+            query = query.where(AuditLog.project_id == project_id)
         
-        query = query.filter(AuditLog.created_at >= start_time)
-        query = query.filter(AuditLog.created_at <= end_time)
+        query = query.where(AuditLog.created_at >= start_time)
+        query = query.where(AuditLog.created_at <= end_time)
 
-        logs = query.order_by(AuditLog.created_at.desc()).all()
+        logs = (await db.scalars(query.order_by(AuditLog.created_at.desc()))).all()
         circuit_breaker.record_success(endpoint)
         return {"items": logs, "total": len(logs)}
     except Exception as e:
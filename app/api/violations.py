@@ -1,9 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+import os
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, selectinload, sessionmaker
+from fastapi.responses import FileResponse
 from typing import List, Optional
-from app.api.deps import get_db, get_current_actor
+from app.api.deps import get_read_db, get_db, get_current_actor
 from app.models.violation import Violation
 from app.models.filter_audit import FilterAuditLog
+from app.core.pagination import InvalidCursor, keyset_page
+from app.api.exports import ExportJobResponse, export_job_response
+from app.models.export_job import ExportJob
+from app.services.chain_verification import VerificationFilters
+from app.services.export_jobs import ExportQueueFull, export_jobs
 from pydantic import BaseModel, ConfigDict
 from datetime import datetime
 from uuid import UUID
@@ -46,12 +54,107 @@ class ViolationResponse(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
 @router.get("/", response_model=List[ViolationResponse])
-def list_violations(
+async def list_violations(
+    response: Response,
+    batch_id: Optional[UUID] = None,
+    rule: Optional[str] = None,
+    status: Optional[str] = None,
+    detected_from: Optional[datetime] = None,
+    detected_to: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    db: AsyncSession = Depends(get_read_db),
+    actor_info: tuple[str, str] = Depends(get_current_actor)
+):
+    """
+    Newest first, keyset-paginated on (detected_at, violation_id).
+    The cursor for the next page is returned in X-Next-Cursor.
+    sop / filter_context are eager-loaded: a page costs a constant number of queries.
+    """
+    def page(session: Session):
+        query = session.query(Violation).options(
+            selectinload(Violation.sop),
+            selectinload(Violation.filter_context),
+        )
+        if batch_id:
+            query = query.filter(Violation.batch_id == batch_id)
+        if rule:
+            query = query.filter(Violation.rule == rule)
+        if status:
+            query = query.filter(Violation.status == status)
+        if detected_from:
+            query = query.filter(Violation.detected_at >= detected_from)
+        if detected_to:
+            query = query.filter(Violation.detected_at < detected_to)
+        return keyset_page(query, Violation.detected_at, Violation.id, cursor, limit, descending=True)
+
+    try:
+        violations, next_cursor = await db.run_sync(page)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return violations
+
+# ------------------------------------------------------------
+# Bulk chain-of-custody verification (declared before /{violation_id})
+# ------------------------------------------------------------
+
+@router.post("/verification-jobs", response_model=ExportJobResponse, status_code=202)
+def start_chain_verification_job(
+    filters: Optional[VerificationFilters] = None,
+    db: Session = Depends(get_db),
+    actor_info: tuple[str, str] = Depends(get_current_actor)
+):
+    """
+    Starts a bulk /chain verification over every violation matching the filters,
+    as a persisted export job (kind chain_verification).
+    Poll GET /violations/verification-jobs/{job_id}; download the CSV from .../report.
+    """
+    actor_id, _ = actor_info
+    params = {"filters": (filters or VerificationFilters()).model_dump(mode="json")}
+    # In-process fallback (EXPORT_JOB_WORKERS=0) runs on the same engine as this request
+    session_factory = sessionmaker(bind=db.get_bind())
+    try:
+        job = export_jobs.submit(db, "chain_verification", params, requested_by=actor_id,
+                                 session_factory=session_factory)
+    except ExportQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    return export_job_response(job)
+
+def _verification_job(db: Session, job_id: UUID) -> ExportJob:
+    job = db.query(ExportJob)\
+        .filter(ExportJob.id == job_id, ExportJob.kind == "chain_verification")\
+        .first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Verification job not found")
+    return job
+
+@router.get("/verification-jobs/{job_id}", response_model=ExportJobResponse)
+def get_chain_verification_job(
+    job_id: UUID,
+    db: Session = Depends(get_db),
+    actor_info: tuple[str, str] = Depends(get_current_actor)
+):
+    """Job state, progress and (once COMPLETED) the summary: total, intact, broken, breakdown."""
+    return export_job_response(_verification_job(db, job_id))
+
+@router.get("/verification-jobs/{job_id}/report")
+def download_chain_verification_report(
+    job_id: UUID,
     db: Session = Depends(get_db),
     actor_info: tuple[str, str] = Depends(get_current_actor)
 ):
-    return db.query(Violation).all()
+    job = _verification_job(db, job_id)
+    if job.status != "COMPLETED":
+        raise HTTPException(status_code=409, detail=f"Verification job is {job.status}")
+    if not job.result_path or not os.path.exists(job.result_path):
+        raise HTTPException(status_code=410, detail="Verification report has expired")
+    return FileResponse(job.result_path, media_type=job.media_type, filename=job.result_filename)
 
 @router.get("/{violation_id}", response_model=ViolationResponse)
 def get_violation(
@@ -119,173 +222,45 @@ class EvidenceChain(BaseModel):
     verified: bool = False
     verification_level: str = "UNVERIFIED" # FULL, PARTIAL, UNVERIFIED
     snapshot_anchor: Optional[SnapshotAnchorSchema] = None
+    materialized_at: Optional[datetime] = None
+    chain_hash_matches: Optional[bool] = None # Only set on ?reverify=true
 
 @router.get("/{violation_id}/evidence-chain", response_model=EvidenceChain)
 def get_violation_evidence_chain(
     violation_id: UUID,
+    reverify: bool = Query(False),
     db: Session = Depends(get_db),
     actor_info: tuple[str, str] = Depends(get_current_actor)
 ):
     """
-    Constructs the canonical, cryptographically verifyable Evidence Chain (Phase 2).
-    Implements non-repudiation via OPA decision cross-linking and snapshot anchors.
+    Canonical, cryptographically verifiable Evidence Chain (Phase 2).
+    Served from the chain materialized at enforcement time (one PK read).
+    ?reverify=true recomputes it from the source rows and compares chain hashes.
     """
-    from app.core.crypto import canonical_hash, sha256
-    from app.models.opa_audit import OPAAuditLog
-    from app.models.audit import AuditLog
-    from app.models.audit_sync_checkpoint import AuditSyncCheckpoint
-    import json
-    
+    from app.core.evidence_chain import (
+        build_evidence_chain, latest_checkpoint, load_chain_inputs, materialize_evidence_chain, serialize_chain
+    )
+    from app.models.violation_evidence_chain import ViolationEvidenceChain
+
+    record = db.get(ViolationEvidenceChain, violation_id)
+    if record and not reverify:
+        return serialize_chain(record, latest_checkpoint(db))
+
     violation = db.query(Violation).filter(Violation.id == violation_id).first()
     if not violation:
         raise HTTPException(status_code=404, detail="Violation not found")
 
-    nodes: List[EvidenceNode] = []
-    
-    def compute_node_hash(payload: dict, parent_hash: Optional[str], created_at: str) -> str:
-        canonical_payload = json.dumps(payload, sort_keys=True)
-        data = f"{canonical_payload}{parent_hash or ''}{created_at}"
-        return sha256(data)
-
-    # 0. Fetch Latest Snapshot Anchor (Part 3)
-    checkpoint = db.query(AuditSyncCheckpoint).order_by(AuditSyncCheckpoint.committed_at.desc()).first()
-    snapshot_anchor = None
-    if checkpoint:
-        snapshot_anchor = SnapshotAnchorSchema(
-            snapshot_id=checkpoint.id,
-            snapshot_hash=checkpoint.snapshot_hash,
-            sealed_at=checkpoint.committed_at
-        )
+    if not record:
+        # Legacy violation (pre-materialization): backfill on first read
+        record = materialize_evidence_chain(db, violation)
+        db.commit()
+        if not reverify:
+            return serialize_chain(record, latest_checkpoint(db))
 
-    # 1. Violation Node (Root)
-    v_payload = {
-        "rule": violation.rule,
-        "batch_id": str(violation.batch_id),
-        "severity": "HIGH",
-        "status": violation.status
-    }
-    v_created_at = violation.detected_at.isoformat()
-    v_hash = compute_node_hash(v_payload, None, v_created_at)
-    
-    # Verify Violation Integrity
-    v_verified = False
-    if violation.violation_hash:
-        # Check against stored hash of the payload
-        v_verified = (canonical_hash(violation.payload) == violation.violation_hash)
-
-    nodes.append(EvidenceNode(
-        id=str(violation.id),
-        type="VIOLATION",
-        payload=v_payload,
-        hash=v_hash,
-        parent_hash=None,
-        created_at=v_created_at,
-        created_by="system",
-        verified=v_verified
-    ))
-
-    # 2. OPA Decision Node (Part 4)
-    opa_log = db.query(OPAAuditLog).filter(OPAAuditLog.decision_hash == violation.opa_decision_hash).first()
-    opa_hash = None
-    opa_verified = False
-    if opa_log:
-        opa_payload = {
-            "policy": opa_log.policy_package,
-            "decision": opa_log.decision,
-            "input_hash": opa_log.input_hash,
-            "decision_hash": opa_log.decision_hash # Authoritative cross-link
-        }
-        opa_created_at = opa_log.timestamp.isoformat()
-        opa_hash = compute_node_hash(opa_payload, v_hash, opa_created_at)
-        
-        # OPA Verification Rule (Part 4.2)
-        # Recompute decision hash if we have the formula: (policy_id + input_hash + result_hash + timestamp)
-        # For legacy data, we check if the stored decision_hash matches the violation's reference.
-        opa_verified = (violation.opa_decision_hash == opa_log.decision_hash)
-        
-        nodes.append(EvidenceNode(
-            id=str(opa_log.id),
-            type="OPA_DECISION",
-            payload=opa_payload,
-            hash=opa_hash,
-            parent_hash=v_hash,
-            created_at=opa_created_at,
-            created_by="opa-engine",
-            verified=opa_verified
-        ))
-
-    # 3. SOP Reference Node
-    parent = opa_hash or v_hash
-    sop_payload = {
-        "sop_id": "SOP-REL-001",
-        "version": "1.0",
-        "immutable_hash": "SHA256:EXAMPLE_SOP_HASH"
-    }
-    sop_created_at = v_created_at
-    sop_hash = compute_node_hash(sop_payload, parent, sop_created_at)
-    
-    nodes.append(EvidenceNode(
-        id=f"sop-{violation.id}",
-        type="SOP",
-        payload=sop_payload,
-        hash=sop_hash,
-        parent_hash=parent,
-        created_at=sop_created_at,
-        created_by="policy-service",
-        verified=True # Policy is version-locked
-    ))
-
-    # 4. Audit Node (Part 2.1)
-    audit_log = db.query(AuditLog).filter(AuditLog.violation_id == violation_id).first()
-    a_verified = False
-    if audit_log:
-        aud_payload = {
-            "audit_log_id": str(audit_log.id),
-            "action": audit_log.action,
-            "result": audit_log.result
-        }
-        aud_created_at = audit_log.created_at.isoformat()
-        aud_hash = compute_node_hash(aud_payload, sop_hash, aud_created_at)
-        
-        # Verify Audit Integrity
-        if audit_log.audit_hash:
-            a_verified = (canonical_hash(audit_log.payload) == audit_log.audit_hash)
-            
-        nodes.append(EvidenceNode(
-            id=str(audit_log.id),
-            type="AUDIT_EVENT",
-            payload=aud_payload,
-            hash=aud_hash,
-            parent_hash=sop_hash,
-            created_at=aud_created_at,
-            created_by=str(audit_log.actor or "system"),
-            verified=a_verified
-        ))
-
-    # Overall Verification Logic (Part 2.1)
-    all_verified = v_verified and a_verified and (opa_verified if opa_log else True)
-    
-    # Determine Verification Level
-    v_level = "UNVERIFIED"
-    if all_verified and snapshot_anchor:
-        v_level = "FULL"
-    elif all_verified:
-        v_level = "PARTIAL" # Verified hash chain but no sealed snapshot
-    elif snapshot_anchor:
-        v_level = "PARTIAL" # Snapshot exists but hash chain broken
-    
-    chain_data = "".join(node.hash for node in nodes)
-    chain_hash = sha256(chain_data)
-    
-    return EvidenceChain(
-        chain_id=f"chain-{violation.id}",
-        root_violation_id=str(violation.id),
-        nodes=nodes,
-        chain_hash=chain_hash,
-        verified=all_verified,
-        verification_level=v_level,
-        snapshot_anchor=snapshot_anchor
-    )
+    chain = build_evidence_chain(violation, *load_chain_inputs(db, violation))
+    chain["materialized_at"] = record.computed_at
+    chain["chain_hash_matches"] = (chain["chain_hash"] == record.chain_hash)
+    return chain
 
 @router.get("/{violation_id}/chain")
 def get_violation_cryptographic_chain(
@@ -297,40 +272,25 @@ def get_violation_cryptographic_chain(
     Step 6: Cryptographic Verification of the Chain of Custody.
     Backend recomputes hashes live and compares stored vs recomputed.
     """
-    from app.core.crypto import canonical_hash
-    from app.models.opa_audit import OPAAuditLog
+    from app.core.custody import verify_custody
+    from app.core.opa import get_opa_decision
     from app.models.audit import AuditLog
     
     violation = db.query(Violation).filter(Violation.id == violation_id).first()
     if not violation:
         raise HTTPException(status_code=404, detail="Violation not found")
         
-    # 1. Verify OPA Root
-    opa_log = db.query(OPAAuditLog).filter(OPAAuditLog.decision_hash == violation.opa_decision_hash).first()
-    opa_status = "missing"
-    if opa_log:
-        expected_opa_hash = canonical_hash(opa_log.payload)
-        opa_status = "valid" if expected_opa_hash == opa_log.decision_hash else "leaked/tampered"
-        
-    # 2. Verify Violation
-    v_status = "missing"
-    if violation.violation_hash and violation.payload:
-        expected_v_hash = canonical_hash(violation.payload)
-        v_status = "valid" if expected_v_hash == violation.violation_hash else "tampered"
-        
-    # 3. Verify Audit Log
+    opa_log = get_opa_decision(db, violation.opa_decision_hash)
     audit_log = db.query(AuditLog).filter(AuditLog.violation_id == violation_id).first()
-    audit_status = "missing"
-    if audit_log and audit_log.audit_hash and audit_log.payload:
-        expected_a_hash = canonical_hash(audit_log.payload)
-        audit_status = "valid" if expected_a_hash == audit_log.audit_hash else "tampered"
-        
-    return {
-        "opa": opa_status,
-        "violation": v_status,
-        "audit": audit_status,
-        "chain_integrity": "intact" if (opa_status == "valid" and v_status == "valid" and audit_status == "valid") else "broken"
-    }
+
+    return verify_custody(
+        opa_log.payload if opa_log else None,
+        opa_log.decision_hash if opa_log else None,
+        violation.payload,
+        violation.violation_hash,
+        audit_log.payload if audit_log else None,
+        audit_log.audit_hash if audit_log else None,
+    )
 
 @router.get("/{violation_id}/export")
 def export_violation_forensic_pdf(
@@ -341,20 +301,38 @@ def export_violation_forensic_pdf(
     """
     Forensic Export: Generate PDF with embedded hash chain (Step 5).
     """
-    from app.services.pdf import render_violation_chain_pdf
+    from app.services.pdf import VIOLATION_PDF_TEMPLATE_VERSION, render_violation_chain_pdf, violation_chain_row
+    from app.services.artifact_cache import artifact_key, pdf_artifact_cache
+    from app.services.renderer import pdf_renderer
     from app.models.audit import AuditLog
-    from fastapi import Response
     
-    violation = db.query(Violation).filter(Violation.id == violation_id).first()
-    if not violation:
+    # One round trip: violation + its SOP + its audit entry
+    row = db.query(Violation, AuditLog)\
+        .outerjoin(AuditLog, AuditLog.violation_id == Violation.id)\
+        .options(joinedload(Violation.sop))\
+        .filter(Violation.id == violation_id)\
+        .first()
+    if not row:
         raise HTTPException(status_code=404, detail="Violation not found")
-        
-    audit_log = db.query(AuditLog).filter(AuditLog.violation_id == violation_id).first()
-    
-    pdf_content = render_violation_chain_pdf(violation, audit_log=audit_log)
+    violation, audit_log = row
+
+    headers = {"Content-Disposition": f"attachment; filename=violation_proof_{violation_id}.pdf"}
+    key = artifact_key(
+        VIOLATION_PDF_TEMPLATE_VERSION, violation.id, violation.violation_hash,
+        audit_log.audit_hash if audit_log else None
+    )
+
+    pdf_content = pdf_artifact_cache.get(key)
+    cache_status = "HIT"
+    if pdf_content is None:
+        cache_status = "MISS"
+        pdf_content = pdf_renderer.render(
+            "violation_chain", render_violation_chain_pdf, violation_chain_row(violation, audit_log)
+        )
+        pdf_artifact_cache.put(key, pdf_content)
     
     return Response(
         content=pdf_content,
         media_type="application/pdf",
-        headers={"Content-Disposition": f"attachment; filename=violation_proof_{violation_id}.pdf"}
+        headers={**headers, "X-Cache": cache_status}
     )
@@ -50,5 +50,8 @@ def write_audit_log(
         audit_hash=a_hash
     )
     db.add(audit_log)
+
+    from app.core.projections import record_audit_item
+    record_audit_item(db, project_id)
     db.commit()
     return audit_log
@@ -1,10 +1,91 @@
 import os
+import uuid
 from dotenv import load_dotenv
 
 load_dotenv()  
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 AI_ENABLED = os.getenv("AI_ENABLED", "false").lower() == "true"
+DEFAULT_PROJECT_ID = uuid.UUID(os.getenv("DEFAULT_PROJECT_ID", "550e8400-e29b-41d4-a716-446655440000"))
+
+# Async engine (psycopg 3) for the read-heavy async endpoints; separate pool from the sync engine
+ASYNC_DB_POOL_SIZE = int(os.getenv("ASYNC_DB_POOL_SIZE", "20"))
+ASYNC_DB_MAX_OVERFLOW = int(os.getenv("ASYNC_DB_MAX_OVERFLOW", "20"))
+
+# Optional read replica for GET-only endpoints; falls back to the primary when lagging
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL")
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5"))
+REPLICA_LAG_CHECK_SECONDS = float(os.getenv("REPLICA_LAG_CHECK_SECONDS", "2"))
+READ_YOUR_WRITES_SECONDS = int(os.getenv("READ_YOUR_WRITES_SECONDS", "10")) # primary-pinned after a write
+READ_YOUR_WRITES_ACTORS = int(os.getenv("READ_YOUR_WRITES_ACTORS", "10000")) # recent writers tracked per process
+
+# Idempotency-Key replay window for MES retries (seconds)
+IDEMPOTENCY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+# Lease on a key claimed by an in-flight request; a crashed request frees it after this
+IDEMPOTENCY_PENDING_SECONDS = int(os.getenv("IDEMPOTENCY_PENDING_SECONDS", "120"))
+
+# In-process LRU of immutable OPA decision records (by decision_hash)
+OPA_DECISION_CACHE_SIZE = int(os.getenv("OPA_DECISION_CACHE_SIZE", "4096"))
+
+# Forensic PDF artifact cache (content-addressed, LRU by total size)
+PDF_CACHE_DIR = os.getenv("PDF_CACHE_DIR", os.path.join("/tmp", "procguard_pdf_cache"))
+PDF_CACHE_MAX_BYTES = int(os.getenv("PDF_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+# Bulk chain-of-custody verification (0 workers = verify in-process)
+CHAIN_VERIFY_WORKERS = int(os.getenv("CHAIN_VERIFY_WORKERS", str(os.cpu_count() or 1)))
+CHAIN_VERIFY_CHUNK_SIZE = int(os.getenv("CHAIN_VERIFY_CHUNK_SIZE", "2000"))
+
+# Content-addressed evidence storage: "local" / "azure" (default: azure if AZURE_BLOB_CONN is set)
+EVIDENCE_STORE = os.getenv("EVIDENCE_STORE")
+EVIDENCE_LOCAL_DIR = os.getenv("EVIDENCE_LOCAL_DIR", os.path.join("evidence", "store"))
+
+# AI violation explanations: "azure" (AZURE_OPENAI_KEY/ENDPOINT) or "stub" (local, no network)
+AI_CLIENT = os.getenv("AI_CLIENT", "azure").lower()
+AI_EXPLAINER_MODEL = os.getenv("AI_EXPLAINER_MODEL", "gpt-4o-mini")
+AI_SOP_PARSER_MODEL = os.getenv("AI_SOP_PARSER_MODEL", "gpt-4o-mini")
+AI_EXPLANATION_CACHE_SIZE = int(os.getenv("AI_EXPLANATION_CACHE_SIZE", "1024"))
+AI_STUB_LATENCY_MS = int(os.getenv("AI_STUB_LATENCY_MS", "0"))
+# Explanations are generated off the request path on a bounded pool
+AI_WORKERS = int(os.getenv("AI_WORKERS", "4"))
+AI_MAX_PENDING = int(os.getenv("AI_MAX_PENDING", "100")) # queued codes beyond this are shed (UNAVAILABLE)
+AI_TIMEOUT_SECONDS = float(os.getenv("AI_TIMEOUT_SECONDS", "10"))
+AI_MAX_RETRIES = int(os.getenv("AI_MAX_RETRIES", "1"))
+
+# SOP document ingestion: chunked AI parsing, cached by document SHA-256
+SOP_CHUNK_CHARS = int(os.getenv("SOP_CHUNK_CHARS", "8000"))
+SOP_PARSE_CONCURRENCY = int(os.getenv("SOP_PARSE_CONCURRENCY", "4"))
+SOP_PARSE_CACHE_SIZE = int(os.getenv("SOP_PARSE_CACHE_SIZE", "128"))
+
+# reportlab render pool (0 = render on the request thread)
+RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", "2"))
+
+# Bulk /execute/bulk verification pool (0 = verify on the request thread)
+ENFORCEMENT_WORKERS = int(os.getenv("ENFORCEMENT_WORKERS", "2"))
+ENFORCEMENT_CHUNK_SIZE = int(os.getenv("ENFORCEMENT_CHUNK_SIZE", "256")) # payloads per worker task
+
+# Outbound mail (SMTP_SERVER is the legacy name of SMTP_HOST)
+SMTP_HOST = os.getenv("SMTP_HOST") or os.getenv("SMTP_SERVER")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
+SMTP_USER = os.getenv("SMTP_USER")
+SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "true").lower() == "true"
+SMTP_FROM = os.getenv("SMTP_FROM") or SMTP_USER or "procguard@authoritative.system"
+MAIL_POOL_SIZE = int(os.getenv("MAIL_POOL_SIZE", "4"))
+MAIL_WORKERS = int(os.getenv("MAIL_WORKERS", "2"))
+MAIL_QUEUE_SIZE = int(os.getenv("MAIL_QUEUE_SIZE", "1000"))
+MAIL_MAX_ATTEMPTS = int(os.getenv("MAIL_MAX_ATTEMPTS", "5"))
+MAIL_RETRY_BASE_SECONDS = float(os.getenv("MAIL_RETRY_BASE_SECONDS", "2"))
+MAIL_BATCH_RECIPIENTS = int(os.getenv("MAIL_BATCH_RECIPIENTS", "50"))
+
+# Background export jobs (PDF / email / compliance bundles); 0 workers = run in-process
+EXPORT_JOB_WORKERS = int(os.getenv("EXPORT_JOB_WORKERS", "2"))
+EXPORT_JOB_MAX_QUEUED = int(os.getenv("EXPORT_JOB_MAX_QUEUED", "50"))
+EXPORT_RESULT_DIR = os.getenv("EXPORT_RESULT_DIR", os.path.join("/tmp", "procguard_exports"))
+EXPORT_RESULT_TTL_SECONDS = int(os.getenv("EXPORT_RESULT_TTL_SECONDS", str(7 * 86400)))
+# RUNNING this long = its worker died (crash, restart): marked FAILED
+EXPORT_JOB_STALE_SECONDS = int(os.getenv("EXPORT_JOB_STALE_SECONDS", "1800"))
+# Retention / stale-job sweep runs on submit, at most this often
+EXPORT_JOB_SWEEP_SECONDS = int(os.getenv("EXPORT_JOB_SWEEP_SECONDS", "300"))
 
 if not DATABASE_URL:
     raise RuntimeError(
@@ -0,0 +1,55 @@
+from typing import Iterable, List, Optional, Tuple
+
+from app.core.crypto import canonical_hash
+
+# (violation_id, opa_payload, opa_decision_hash, violation_payload, violation_hash, audit_payload, audit_hash)
+CustodyRow = Tuple[str, Optional[dict], Optional[str], Optional[dict], Optional[str], Optional[dict], Optional[str]]
+
+
+def verify_custody(
+    opa_payload: Optional[dict],
+    opa_decision_hash: Optional[str],
+    violation_payload: Optional[dict],
+    violation_hash: Optional[str],
+    audit_payload: Optional[dict],
+    audit_hash: Optional[str],
+) -> dict:
+    """
+    Step 6: Cryptographic Verification of the Chain of Custody.
+    Recomputes canonical hashes and compares stored vs recomputed.
+    Pure (no DB access) so it can run in worker processes.
+    """
+    # 1. Verify OPA Root
+    opa_status = "missing"
+    if opa_payload is not None:
+        opa_status = "valid" if canonical_hash(opa_payload) == opa_decision_hash else "leaked/tampered"
+
+    # 2. Verify Violation
+    v_status = "missing"
+    if violation_hash and violation_payload:
+        v_status = "valid" if canonical_hash(violation_payload) == violation_hash else "tampered"
+
+    # 3. Verify Audit Log
+    audit_status = "missing"
+    if audit_hash and audit_payload:
+        audit_status = "valid" if canonical_hash(audit_payload) == audit_hash else "tampered"
+
+    return {
+        "opa": opa_status,
+        "violation": v_status,
+        "audit": audit_status,
+        "chain_integrity": "intact" if (opa_status == "valid" and v_status == "valid" and audit_status == "valid") else "broken"
+    }
+
+
+def verify_custody_rows(rows: Iterable[CustodyRow]) -> List[dict]:
+    """
+    Batch form of verify_custody for process-pool workers.
+    Each result carries its violation_id.
+    """
+    results = []
+    for violation_id, opa_payload, opa_hash, v_payload, v_hash, a_payload, a_hash in rows:
+        result = verify_custody(opa_payload, opa_hash, v_payload, v_hash, a_payload, a_hash)
+        result["violation_id"] = violation_id
+        results.append(result)
+    return results
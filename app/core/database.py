@@ -1,7 +1,9 @@
 import os
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from app.core.config import DATABASE_URL
+from app.core.config import ASYNC_DB_MAX_OVERFLOW, ASYNC_DB_POOL_SIZE, DATABASE_READ_URL, DATABASE_URL
 from app.models.base import Base
 
 # Handle SQLite specific arguments to prevent thread errors in dev
@@ -20,6 +22,40 @@ SessionLocal = sessionmaker(
     bind=engine,
 )
 
+# Async drivers for the same database: psycopg 3 for PostgreSQL, aiosqlite for dev SQLite
+ASYNC_DRIVERS = {"postgresql": "postgresql+psycopg", "sqlite": "sqlite+aiosqlite"}
+
+def async_database_url(url: str):
+    url = make_url(url)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername))
+
+def _create_async_engine(url: str):
+    return create_async_engine(
+        async_database_url(url),
+        pool_pre_ping=True,
+        pool_recycle=3600,
+        **({} if url.startswith("sqlite") else {
+            "pool_size": ASYNC_DB_POOL_SIZE,
+            "max_overflow": ASYNC_DB_MAX_OVERFLOW,
+        }),
+    )
+
+def _async_sessionmaker(bind):
+    return async_sessionmaker(
+        bind=bind,
+        class_=AsyncSession,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
+# Read-heavy endpoints (async def) wait on this pool without holding a threadpool slot
+async_engine = _create_async_engine(DATABASE_URL)
+AsyncSessionLocal = _async_sessionmaker(async_engine)
+
+# Optional read replica (DATABASE_READ_URL); routed to by app.core.read_routing
+read_async_engine = _create_async_engine(DATABASE_READ_URL) if DATABASE_READ_URL else None
+AsyncReadSessionLocal = _async_sessionmaker(read_async_engine) if read_async_engine else None
+
 def init_db():
     """
     Authoritative Schema Synchronization.
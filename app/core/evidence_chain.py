@@ -0,0 +1,235 @@
+import json
+from datetime import datetime, timezone
+from typing import Optional, Union
+
+from sqlalchemy.orm import Session
+
+from app.core.crypto import canonical_hash, sha256
+from app.core.opa import OPADecisionRecord, get_opa_decision
+from app.models.audit import AuditLog
+from app.models.audit_sync_checkpoint import AuditSyncCheckpoint
+from app.models.opa_audit import OPAAuditLog
+from app.models.violation import Violation
+from app.models.violation_evidence_chain import ViolationEvidenceChain
+
+
+def _iso(value: datetime) -> str:
+    # Normalized so the chain hashes identically before and after a DB round-trip
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat()
+
+
+def compute_node_hash(payload: dict, parent_hash: Optional[str], created_at: str) -> str:
+    canonical_payload = json.dumps(payload, sort_keys=True)
+    data = f"{canonical_payload}{parent_hash or ''}{created_at}"
+    return sha256(data)
+
+
+def latest_checkpoint(db: Session) -> Optional[AuditSyncCheckpoint]:
+    return db.query(AuditSyncCheckpoint).order_by(AuditSyncCheckpoint.committed_at.desc()).first()
+
+
+def snapshot_anchor(checkpoint: Optional[AuditSyncCheckpoint]) -> Optional[dict]:
+    if not checkpoint:
+        return None
+    return {
+        "snapshot_id": str(checkpoint.id),
+        "snapshot_hash": checkpoint.snapshot_hash,
+        "sealed_at": _iso(checkpoint.committed_at)
+    }
+
+
+def verification_level(verified: bool, anchor: Optional[dict]) -> str:
+    if verified and anchor:
+        return "FULL"
+    if verified:
+        return "PARTIAL" # Verified hash chain but no sealed snapshot
+    if anchor:
+        return "PARTIAL" # Snapshot exists but hash chain broken
+    return "UNVERIFIED"
+
+
+def load_chain_inputs(db: Session, violation: Violation):
+    """
+    Legacy/re-verification path: fetches the rows the chain is built from.
+    Returns (opa_log, audit_log, checkpoint).
+    """
+    opa_log = get_opa_decision(db, violation.opa_decision_hash)
+    audit_log = db.query(AuditLog).filter(AuditLog.violation_id == violation.id).first()
+    return opa_log, audit_log, latest_checkpoint(db)
+
+
+def build_evidence_chain(
+    violation: Violation,
+    opa_log: Optional[Union[OPAAuditLog, OPADecisionRecord]],
+    audit_log: Optional[AuditLog],
+    checkpoint: Optional[AuditSyncCheckpoint],
+) -> dict:
+    """
+    Canonical, cryptographically verifiable Evidence Chain (Phase 2).
+    Pure function of its inputs: VIOLATION -> OPA_DECISION -> SOP -> AUDIT_EVENT.
+    """
+    nodes = []
+
+    # 0. Snapshot Anchor (Part 3): not part of the chain hash
+    anchor = snapshot_anchor(checkpoint)
+
+    # 1. Violation Node (Root)
+    v_payload = {
+        "rule": violation.rule,
+        "batch_id": str(violation.batch_id),
+        "severity": "HIGH",
+        "status": violation.status
+    }
+    v_created_at = _iso(violation.detected_at)
+    v_hash = compute_node_hash(v_payload, None, v_created_at)
+
+    # Verify Violation Integrity
+    v_verified = False
+    if violation.violation_hash:
+        v_verified = (canonical_hash(violation.payload) == violation.violation_hash)
+
+    nodes.append({
+        "id": str(violation.id),
+        "type": "VIOLATION",
+        "payload": v_payload,
+        "hash": v_hash,
+        "parent_hash": None,
+        "created_at": v_created_at,
+        "created_by": "system",
+        "verified": v_verified
+    })
+
+    # 2. OPA Decision Node (Part 4)
+    opa_hash = None
+    opa_verified = False
+    if opa_log:
+        opa_payload = {
+            "policy": opa_log.policy_package,
+            "decision": opa_log.decision,
+            "input_hash": opa_log.input_hash,
+            "decision_hash": opa_log.decision_hash # Authoritative cross-link
+        }
+        opa_created_at = _iso(opa_log.timestamp)
+        opa_hash = compute_node_hash(opa_payload, v_hash, opa_created_at)
+
+        # For legacy data, we check if the stored decision_hash matches the violation's reference.
+        opa_verified = (violation.opa_decision_hash == opa_log.decision_hash)
+
+        nodes.append({
+            "id": str(opa_log.id),
+            "type": "OPA_DECISION",
+            "payload": opa_payload,
+            "hash": opa_hash,
+            "parent_hash": v_hash,
+            "created_at": opa_created_at,
+            "created_by": "opa-engine",
+            "verified": opa_verified
+        })
+
+    # 3. SOP Reference Node
+    parent = opa_hash or v_hash
+    sop_payload = {
+        "sop_id": "SOP-REL-001",
+        "version": "1.0",
+        "immutable_hash": "SHA256:EXAMPLE_SOP_HASH"
+    }
+    sop_hash = compute_node_hash(sop_payload, parent, v_created_at)
+
+    nodes.append({
+        "id": f"sop-{violation.id}",
+        "type": "SOP",
+        "payload": sop_payload,
+        "hash": sop_hash,
+        "parent_hash": parent,
+        "created_at": v_created_at,
+        "created_by": "policy-service",
+        "verified": True # Policy is version-locked
+    })
+
+    # 4. Audit Node (Part 2.1)
+    a_verified = False
+    if audit_log:
+        aud_payload = {
+            "audit_log_id": str(audit_log.id),
+            "action": audit_log.action,
+            "result": audit_log.result
+        }
+        aud_created_at = _iso(audit_log.created_at)
+        aud_hash = compute_node_hash(aud_payload, sop_hash, aud_created_at)
+
+        # Verify Audit Integrity
+        if audit_log.audit_hash:
+            a_verified = (canonical_hash(audit_log.payload) == audit_log.audit_hash)
+
+        nodes.append({
+            "id": str(audit_log.id),
+            "type": "AUDIT_EVENT",
+            "payload": aud_payload,
+            "hash": aud_hash,
+            "parent_hash": sop_hash,
+            "created_at": aud_created_at,
+            "created_by": str(audit_log.actor or "system"),
+            "verified": a_verified
+        })
+
+    # Overall Verification Logic (Part 2.1)
+    all_verified = v_verified and a_verified and (opa_verified if opa_log else True)
+
+    return {
+        "chain_id": f"chain-{violation.id}",
+        "root_violation_id": str(violation.id),
+        "nodes": nodes,
+        "chain_hash": sha256("".join(node["hash"] for node in nodes)),
+        "verified": all_verified,
+        "verification_level": verification_level(all_verified, anchor),
+        "snapshot_anchor": anchor
+    }
+
+
+def materialize_evidence_chain(
+    db: Session,
+    violation: Violation,
+    opa_log: Optional[OPAAuditLog] = None,
+    audit_log: Optional[AuditLog] = None,
+) -> ViolationEvidenceChain:
+    """
+    Computes and persists the immutable part of the chain (nodes, hashes,
+    integrity verdict). Does NOT commit.
+    Called by violate() once enforcement is complete, with the rows it just wrote.
+    """
+    if opa_log is None or audit_log is None:
+        loaded_opa, loaded_audit, _ = load_chain_inputs(db, violation)
+        opa_log = opa_log or loaded_opa
+        audit_log = audit_log or loaded_audit
+
+    chain = build_evidence_chain(violation, opa_log, audit_log, None)
+    record = ViolationEvidenceChain(
+        violation_id=violation.id,
+        chain_id=chain["chain_id"],
+        chain_hash=chain["chain_hash"],
+        nodes=chain["nodes"],
+        verified=chain["verified"],
+        computed_at=datetime.now(timezone.utc)
+    )
+    db.add(record)
+    return record
+
+
+def serialize_chain(record: ViolationEvidenceChain, checkpoint: Optional[AuditSyncCheckpoint]) -> dict:
+    """
+    The snapshot anchor and verification level are resolved at read time against the
+    latest sealed checkpoint, so a chain upgrades to FULL once a later checkpoint seals it.
+    """
+    anchor = snapshot_anchor(checkpoint)
+    return {
+        "chain_id": record.chain_id,
+        "root_violation_id": str(record.violation_id),
+        "nodes": record.nodes,
+        "chain_hash": record.chain_hash,
+        "verified": record.verified,
+        "verification_level": verification_level(record.verified, anchor),
+        "snapshot_anchor": anchor,
+        "materialized_at": record.computed_at
+    }
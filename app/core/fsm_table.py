@@ -0,0 +1,121 @@
+# app/core/fsm_table.py
+"""
+Precompiled dense transition/authorization table.
+
+The FSM (ALLOWED_TRANSITIONS), the role permission matrix (ROLE_PERMISSIONS)
+and the terminal set (TERMINAL_STATES) are compiled ONCE at import time into
+a flat tuple indexed by (role, state, event) ordinals. A single lookup
+returns the full structural outcome of a transition, in the exact order
+execute_transition enforces it:
+
+    1. Authorization  -> denial (PermissionError message)
+    2. Terminal state -> TERMINAL_STATE_MUTATION
+    3. FSM closure    -> INVALID_FSM_TRANSITION
+    4. Otherwise      -> allowed, next_state
+
+Context-dependent invariants (approvals, procedure version) are NOT part of
+the table; they still run in execute_transition after the lookup.
+"""
+
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from app.core.fsm import State, Event, ALLOWED_TRANSITIONS
+from app.core.invariants import TERMINAL_STATES
+from app.security.rbac import denial_reason
+from app.security.roles import Role
+
+
+class TransitionOutcome(NamedTuple):
+    role: Role
+    state: State
+    event: Event
+    allowed: bool
+    next_state: Optional[State]
+    rule: Optional[str]     # Violation rule code, if the transition violates
+    denial: Optional[str]   # PermissionError message, if unauthorized
+
+
+ROLES: Tuple[Role, ...] = tuple(Role)
+STATES: Tuple[State, ...] = tuple(State)
+EVENTS: Tuple[Event, ...] = tuple(Event)
+
+# str-Enum members hash and compare like their values, so these maps accept
+# both enum members and raw strings (e.g. batch.current_state) without
+# constructing enums on the hot path.
+ROLE_ORDINALS: Dict[Role, int] = {r: i for i, r in enumerate(ROLES)}
+STATE_ORDINALS: Dict[State, int] = {s: i for i, s in enumerate(STATES)}
+EVENT_ORDINALS: Dict[Event, int] = {e: i for i, e in enumerate(EVENTS)}
+
+_N_STATES = len(STATES)
+_N_EVENTS = len(EVENTS)
+
+
+def _compile_outcome(role: Role, state: State, event: Event) -> TransitionOutcome:
+    denial = denial_reason(role, event)
+    if denial is not None:
+        return TransitionOutcome(role, state, event, False, None, None, denial)
+
+    if state in TERMINAL_STATES:
+        return TransitionOutcome(role, state, event, False, None, "TERMINAL_STATE_MUTATION", None)
+
+    next_state = ALLOWED_TRANSITIONS.get((state, event))
+    if next_state is None:
+        return TransitionOutcome(role, state, event, False, None, "INVALID_FSM_TRANSITION", None)
+
+    return TransitionOutcome(role, state, event, True, next_state, None, None)
+
+
+TRANSITION_TABLE: Tuple[TransitionOutcome, ...] = tuple(
+    _compile_outcome(role, state, event)
+    for role in ROLES
+    for state in STATES
+    for event in EVENTS
+)
+
+
+def lookup_transition(role, state, event) -> TransitionOutcome:
+    """
+    Single-lookup transition outcome. Accepts enum members or raw values.
+    Raises ValueError (like the Enum constructors) for unknown values.
+    """
+    try:
+        index = (ROLE_ORDINALS[role] * _N_STATES + STATE_ORDINALS[state]) * _N_EVENTS + EVENT_ORDINALS[event]
+    except KeyError:
+        # Re-raise with the canonical Enum error for the offending value
+        Role(role)
+        State(state)
+        Event(event)
+        raise
+    return TRANSITION_TABLE[index]
+
+
+def validate_sequence(
+    states: Iterable,
+    events: Iterable,
+    roles: Iterable,
+) -> List[TransitionOutcome]:
+    """
+    Vectorized structural validation for offline replay.
+    Element i of the result is the outcome of (roles[i], states[i], events[i]).
+    """
+    states = list(states)
+    events = list(events)
+    roles = list(roles)
+    if not (len(states) == len(events) == len(roles)):
+        raise ValueError("states, events and roles must have equal length")
+
+    table = TRANSITION_TABLE
+    try:
+        role_ords = [ROLE_ORDINALS[r] * _N_STATES for r in roles]
+        state_ords = [STATE_ORDINALS[s] for s in states]
+        event_ords = [EVENT_ORDINALS[e] for e in events]
+    except KeyError:
+        # Slow path only to surface the offending value
+        for r, s, e in zip(roles, states, events):
+            lookup_transition(r, s, e)
+        raise
+
+    return [
+        table[(r + s) * _N_EVENTS + e]
+        for r, s, e in zip(role_ords, state_ords, event_ords)
+    ]
@@ -0,0 +1,157 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from fastapi.responses import JSONResponse
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.config import IDEMPOTENCY_PENDING_SECONDS, IDEMPOTENCY_TTL_SECONDS
+from app.core.crypto import canonical_hash
+from app.models.idempotency import IdempotencyKey
+
+REPLAY_HEADER = "Idempotent-Replayed"
+
+PENDING = "PENDING"
+COMPLETED = "COMPLETED"
+
+_DIALECT_INSERT = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+class IdempotencyConflict(Exception):
+    """Same Idempotency-Key reused with a different request body."""
+
+
+class IdempotencyInProgress(Exception):
+    """The original request holding this Idempotency-Key has not finished yet."""
+
+
+def request_fingerprint(body: dict) -> str:
+    return canonical_hash(body)
+
+
+def _insert_pending(db: Session, values: dict) -> bool:
+    """INSERT ... ON CONFLICT DO NOTHING; True if this request got the key."""
+    insert = _DIALECT_INSERT[db.get_bind().dialect.name]
+    stmt = insert(IdempotencyKey).values(**values).on_conflict_do_nothing(index_elements=["key", "scope"])
+    return db.execute(stmt).rowcount == 1
+
+
+def claim_key(
+    db: Session,
+    key: str,
+    scope: str,
+    request_hash: str,
+) -> Optional[IdempotencyKey]:
+    """
+    Reserves (key, scope) for this request BEFORE anything is executed, so a
+    retry racing the original request can never run the FSM a second time.
+
+    Returns the stored response if the key already completed (replay it).
+    Returns None if this request now owns the key: finish with
+    remember_response(), or release_key() if nothing is worth replaying.
+    Raises IdempotencyConflict if the key was used for a different request
+    and IdempotencyInProgress while another request holds it.
+    Commits: call before the request's own writes.
+    """
+    for _ in range(2):
+        now = datetime.now(timezone.utc)
+        record = db.get(IdempotencyKey, (key, scope), populate_existing=True)
+        if record is not None:
+            expired = _as_utc(record.expires_at) <= now
+            if not expired:
+                if record.request_hash != request_hash:
+                    raise IdempotencyConflict("Idempotency-Key was already used with a different request")
+                if record.status == PENDING:
+                    raise IdempotencyInProgress("A request with this Idempotency-Key is still in progress")
+                # Tamper-evidence: never replay a body that no longer matches its digest
+                if canonical_hash(record.response_body) == record.response_hash:
+                    return record
+
+            # Expired (or tampered) entry: reclaim exactly the row we inspected,
+            # never one a concurrent request has written since
+            stale = IdempotencyKey.expires_at <= now if expired else IdempotencyKey.response_hash == record.response_hash
+            db.query(IdempotencyKey).filter(
+                IdempotencyKey.key == key,
+                IdempotencyKey.scope == scope,
+                IdempotencyKey.created_at == record.created_at,
+                stale,
+            ).delete(synchronize_session=False)
+            db.expunge(record)
+
+        claimed = _insert_pending(db, {
+            "key": key,
+            "scope": scope,
+            "request_hash": request_hash,
+            "status": PENDING,
+            "created_at": now,
+            "expires_at": now + timedelta(seconds=IDEMPOTENCY_PENDING_SECONDS),
+        })
+        db.commit()
+        if claimed:
+            return None
+        # A concurrent request claimed it first: re-read to replay, reject or report in-progress
+
+    raise IdempotencyInProgress("A request with this Idempotency-Key is still in progress")
+
+
+def remember_response(
+    db: Session,
+    key: str,
+    scope: str,
+    request_hash: str,
+    status_code: int,
+    body: dict,
+) -> None:
+    """
+    Completes a key claimed with claim_key() with the response to replay.
+    Commits in its own transaction.
+    """
+    now = datetime.now(timezone.utc)
+    db.query(IdempotencyKey).filter(
+        IdempotencyKey.key == key,
+        IdempotencyKey.scope == scope,
+        IdempotencyKey.request_hash == request_hash,
+        IdempotencyKey.status == PENDING,
+    ).update({
+        "status": COMPLETED,
+        "status_code": status_code,
+        "response_body": body,
+        "response_hash": canonical_hash(body),
+        "expires_at": now + timedelta(seconds=IDEMPOTENCY_TTL_SECONDS),
+    }, synchronize_session=False)
+    db.commit()
+
+
+def release_key(db: Session, key: str, scope: str) -> None:
+    """
+    Drops this request's claim without storing a response (the request failed
+    before producing anything worth replaying), so a retry executes again.
+    Call after rolling back the request's own writes. Commits.
+    """
+    db.query(IdempotencyKey).filter(
+        IdempotencyKey.key == key,
+        IdempotencyKey.scope == scope,
+        IdempotencyKey.status == PENDING,
+    ).delete(synchronize_session=False)
+    db.commit()
+
+
+def replay_response(record: IdempotencyKey) -> JSONResponse:
+    return JSONResponse(
+        status_code=record.status_code,
+        content=record.response_body,
+        headers={REPLAY_HEADER: "true"},
+    )
+
+
+def purge_expired_keys(db: Session) -> int:
+    """TTL expiry: removes all keys past their replay window (and abandoned claims)."""
+    deleted = db.query(IdempotencyKey)\
+        .filter(IdempotencyKey.expires_at <= datetime.now(timezone.utc))\
+        .delete(synchronize_session=False)
+    db.commit()
+    return deleted
+
+
+def _as_utc(dt: datetime) -> datetime:
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt
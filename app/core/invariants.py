@@ -3,11 +3,11 @@
 from app.core.fsm import State
 
 # Closed set of terminal states
-TERMINAL_STATES = {
+TERMINAL_STATES = frozenset({
     State.COMPLETED,
     State.VIOLATED,
     State.REJECTED,
-}
+})
 
 
 def is_terminal(state: State) -> bool:
@@ -1,9 +1,75 @@
 from sqlalchemy.orm import Session
 from app.models.opa_audit import OPAAuditLog
+from app.core.cache import LRUCache
+from app.core.config import OPA_DECISION_CACHE_SIZE
 from app.core.crypto import canonical_hash
 from datetime import datetime, timezone
+from typing import NamedTuple, Optional
 import uuid
 
+# Placeholder written by the chain-of-custody migration; not unique, never cached
+LEGACY_DECISION_HASH = "legacy"
+
+
+class OPADecisionRecord(NamedTuple):
+    """Detached, immutable snapshot of an OPAAuditLog row (safe to share across sessions)."""
+    id: uuid.UUID
+    timestamp: datetime
+    project_id: uuid.UUID
+    policy_package: str
+    rule: str
+    decision: str
+    resource_type: str
+    resource_id: Optional[str]
+    input_hash: str
+    result_hash: str
+    decision_hash: str
+    payload: dict
+
+
+decision_cache = LRUCache(maxsize=OPA_DECISION_CACHE_SIZE)
+
+
+def get_opa_decision(db: Session, decision_hash: Optional[str]) -> Optional[OPADecisionRecord]:
+    """
+    Decision lookup by hash, fronted by an in-process LRU.
+    Decisions are immutable once committed, so cached records never go stale.
+    decision_hash is not unique: the earliest record wins (timestamp, then id), so every
+    process resolves and caches the same row.
+    """
+    if not decision_hash:
+        return None
+    cacheable = decision_hash != LEGACY_DECISION_HASH
+    if cacheable:
+        record = decision_cache.get(decision_hash)
+        if record is not None:
+            return record
+
+    row = db.query(OPAAuditLog)\
+        .filter(OPAAuditLog.decision_hash == decision_hash)\
+        .order_by(OPAAuditLog.timestamp, OPAAuditLog.id)\
+        .first()
+    if row is None:
+        return None # Not cached: the decision may still be committed later
+
+    record = OPADecisionRecord(
+        id=row.id,
+        timestamp=row.timestamp,
+        project_id=row.project_id,
+        policy_package=row.policy_package,
+        rule=row.rule,
+        decision=row.decision,
+        resource_type=row.resource_type,
+        resource_id=row.resource_id,
+        input_hash=row.input_hash,
+        result_hash=row.result_hash,
+        decision_hash=row.decision_hash,
+        payload=row.payload,
+    )
+    if cacheable:
+        decision_cache.put(decision_hash, record)
+    return record
+
 def record_opa_decision(
     db: Session,
     policy_package: str,
@@ -0,0 +1,56 @@
+import base64
+import uuid
+from datetime import datetime
+from typing import Optional, Tuple
+
+from sqlalchemy import tuple_
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(created_at: datetime, row_id: uuid.UUID) -> str:
+    """
+    Opaque keyset cursor for (created_at, id) ordering.
+    """
+    raw = f"{created_at.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """
+    Inverse of encode_cursor. Raises InvalidCursor on tampered/garbled input.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        created_at, row_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), uuid.UUID(row_id)
+    except (ValueError, UnicodeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor}") from e
+
+
+def keyset_page(query, created_col, id_col, cursor: Optional[str], limit: int, descending: bool = False):
+    """
+    Applies (created_at, id) keyset pagination to a query.
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    Raises InvalidCursor for a bad cursor.
+    """
+    if cursor:
+        after = tuple_(*decode_cursor(cursor))
+        key = tuple_(created_col, id_col)
+        query = query.filter(key < after if descending else key > after)
+
+    if descending:
+        query = query.order_by(created_col.desc(), id_col.desc())
+    else:
+        query = query.order_by(created_col.asc(), id_col.asc())
+
+    # Fetch one extra row to know whether another page exists
+    rows = query.limit(limit + 1).all()
+    page = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        last = page[-1]
+        next_cursor = encode_cursor(getattr(last, created_col.key), getattr(last, id_col.key))
+    return page, next_cursor
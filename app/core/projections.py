@@ -0,0 +1,175 @@
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import DEFAULT_PROJECT_ID
+from app.core.fsm import State
+from app.models.audit import AuditLog
+from app.models.batch import Batch
+from app.models.batch_summary import BatchSummary
+from app.models.procedure import Procedure
+from app.models.violation import Violation
+
+# FSM state -> projection column
+STATE_COLUMNS: Dict[str, str] = {
+    State.CREATED.value: "batches_created",
+    State.IN_PROGRESS.value: "batches_in_progress",
+    State.AWAITING_APPROVAL.value: "batches_awaiting_approval",
+    State.APPROVED.value: "batches_approved",
+    State.COMPLETED.value: "batches_completed",
+    State.VIOLATED.value: "batches_violated",
+    State.REJECTED.value: "batches_rejected",
+}
+
+VIOLATION_COLUMNS: Dict[str, str] = {
+    "OPEN": "violations_open",
+    "RESOLVED": "violations_resolved",
+}
+
+COUNTER_COLUMNS = tuple(STATE_COLUMNS.values()) + tuple(VIOLATION_COLUMNS.values()) + ("procedures", "audit_items")
+
+
+# ============================================================
+# WRITE PATH (called inside the caller's transaction)
+# ============================================================
+
+def apply_summary_delta(db: Session, project_id: Optional[uuid.UUID], **deltas: int) -> None:
+    """
+    Atomically increments projection counters for a project.
+    Does NOT commit: the delta lands in the same transaction as the write it mirrors.
+    """
+    deltas = {col: d for col, d in deltas.items() if d}
+    if not deltas:
+        return
+    project_id = project_id or DEFAULT_PROJECT_ID
+
+    values = {getattr(BatchSummary, col): getattr(BatchSummary, col) + d for col, d in deltas.items()}
+    values[BatchSummary.updated_at] = datetime.now(timezone.utc)
+
+    updated = db.query(BatchSummary)\
+        .filter(BatchSummary.project_id == project_id)\
+        .update(values, synchronize_session=False)
+    if updated:
+        return
+
+    # First write for this project: insert the row (savepoint guards a concurrent insert)
+    try:
+        with db.begin_nested():
+            db.add(BatchSummary(
+                project_id=project_id,
+                updated_at=datetime.now(timezone.utc),
+                **{col: deltas.get(col, 0) for col in COUNTER_COLUMNS}
+            ))
+    except IntegrityError:
+        db.query(BatchSummary)\
+            .filter(BatchSummary.project_id == project_id)\
+            .update(values, synchronize_session=False)
+
+
+def record_batch_created(db: Session, batch: Batch) -> None:
+    apply_summary_delta(db, batch.project_id, **{STATE_COLUMNS[batch.current_state]: 1})
+
+
+def record_state_change(db: Session, batch: Batch, from_state: str, to_state: str, audit_items: int = 0) -> None:
+    deltas = {"audit_items": audit_items}
+    if from_state != to_state:
+        deltas[STATE_COLUMNS[from_state]] = -1
+        deltas[STATE_COLUMNS[to_state]] = 1
+    apply_summary_delta(db, batch.project_id, **deltas)
+
+
+def record_violation_opened(db: Session, project_id: Optional[uuid.UUID]) -> None:
+    apply_summary_delta(db, project_id, violations_open=1)
+
+
+def record_violation_resolved(db: Session, project_id: Optional[uuid.UUID]) -> None:
+    apply_summary_delta(db, project_id, violations_open=-1, violations_resolved=1)
+
+
+def record_procedures_added(db: Session, count: int = 1) -> None:
+    # Procedures are not project-scoped yet: attributed to the default project
+    apply_summary_delta(db, DEFAULT_PROJECT_ID, procedures=count)
+
+
+def record_audit_item(db: Session, project_id: Optional[uuid.UUID]) -> None:
+    apply_summary_delta(db, project_id, audit_items=1)
+
+
+# ============================================================
+# REBUILD (recompute from scratch)
+# ============================================================
+
+def compute_batch_summaries(db: Session) -> Dict[uuid.UUID, Dict[str, int]]:
+    """Set-based recount of every counter, grouped by project."""
+    summaries: Dict[uuid.UUID, Dict[str, int]] = {}
+
+    def bump(project_id, column, count):
+        if column is None:
+            return
+        row = summaries.setdefault(project_id or DEFAULT_PROJECT_ID, {col: 0 for col in COUNTER_COLUMNS})
+        row[column] += count
+
+    for project_id, state, count in db.query(Batch.project_id, Batch.current_state, func.count())\
+            .group_by(Batch.project_id, Batch.current_state):
+        bump(project_id, STATE_COLUMNS.get(state), count)
+
+    for project_id, v_status, count in db.query(Batch.project_id, Violation.status, func.count())\
+            .join(Batch, Batch.batch_id == Violation.batch_id)\
+            .group_by(Batch.project_id, Violation.status):
+        bump(project_id, VIOLATION_COLUMNS.get(v_status), count)
+
+    for project_id, count in db.query(AuditLog.project_id, func.count()).group_by(AuditLog.project_id):
+        bump(project_id, "audit_items", count)
+
+    # Procedures are not project-scoped yet: attribute to the default project
+    bump(DEFAULT_PROJECT_ID, "procedures", db.query(func.count(Procedure.procedure_id)).scalar() or 0)
+
+    return summaries
+
+
+def rebuild_batch_summaries(db: Session) -> int:
+    """Replaces the projection with a full recount. Returns the number of project rows."""
+    summaries = compute_batch_summaries(db)
+    now = datetime.now(timezone.utc)
+
+    db.query(BatchSummary).delete(synchronize_session=False)
+    for project_id, counters in summaries.items():
+        db.add(BatchSummary(project_id=project_id, updated_at=now, **counters))
+    db.commit()
+    return len(summaries)
+
+
+# ============================================================
+# READ PATH
+# ============================================================
+
+def summarize(rows: Iterable) -> Dict[str, int]:
+    """Folds projection rows (ORM rows or counter dicts) into one counter dict."""
+    totals = {col: 0 for col in COUNTER_COLUMNS}
+    for row in rows:
+        for col in COUNTER_COLUMNS:
+            totals[col] += (row[col] if isinstance(row, dict) else getattr(row, col)) or 0
+    totals["total_batches"] = sum(totals[col] for col in STATE_COLUMNS.values())
+    totals["total_violations"] = sum(totals[col] for col in VIOLATION_COLUMNS.values())
+    return totals
+
+
+def read_batch_summary(db: Session, project_id: Optional[uuid.UUID] = None) -> Dict[str, int]:
+    """
+    Single-row read of the projection (one row per project).
+    Falls back to a live recount if the projection has not been built yet.
+    """
+    query = db.query(BatchSummary)
+    if project_id:
+        query = query.filter(BatchSummary.project_id == project_id)
+    rows = query.all()
+
+    if not rows and not db.query(BatchSummary.project_id).first():
+        live = compute_batch_summaries(db)
+        rows = [live[project_id]] if project_id in live else ([] if project_id else list(live.values()))
+
+    return summarize(rows)
@@ -0,0 +1,210 @@
+"""
+Read-replica routing for the read-only (GET) endpoints.
+
+A request is served by the replica (DATABASE_READ_URL) only when all hold:
+
+  1. a replica is configured and the request is a GET/HEAD,
+  2. the client has not written recently (read-your-writes). Every unsafe
+     request (POST, PUT, PATCH, DELETE; e.g. anything that runs
+     execute_transition) marks its client as a recent writer three ways,
+     because not every client keeps cookies (MES integrations, fetch()
+     without credentials):
+       - a short-lived cookie,
+       - an X-Last-Write response header the client may echo back,
+       - an in-process timestamp keyed on X-Actor-Id,
+  3. the replica is not lagging: its replay delay, as the replica itself
+     reports it (now() - pg_last_xact_replay_timestamp(), zero once every
+     received WAL record is replayed), is at most REPLICA_MAX_LAG_SECONDS.
+
+The lag probe runs at most once per REPLICA_LAG_CHECK_SECONDS; a replica
+that cannot be reached counts as lagging. Everything else goes to the
+primary.
+"""
+import logging
+import threading
+import time
+from typing import Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from starlette.requests import Request
+
+from app.core.cache import LRUCache
+from app.core.config import (
+    READ_YOUR_WRITES_ACTORS, READ_YOUR_WRITES_SECONDS, REPLICA_LAG_CHECK_SECONDS, REPLICA_MAX_LAG_SECONDS
+)
+from app.core.database import AsyncReadSessionLocal, AsyncSessionLocal
+
+logger = logging.getLogger("procguard.read_routing")
+
+READ_YOUR_WRITES_COOKIE = "procguard_rw"
+READ_YOUR_WRITES_HEADER = "X-Last-Write"
+ACTOR_HEADER = "X-Actor-Id"
+DB_ROUTE_HEADER = "X-DB-Route"
+
+PRIMARY = "primary"
+REPLICA = "replica"
+
+READ_METHODS = ("GET", "HEAD")
+
+# Seconds the replica's replayed state trails the primary; 0 when not a standby or fully replayed,
+# NULL when a standby has not replayed anything yet
+REPLICA_LAG_SQL = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+""")
+
+
+def _recent(value: Optional[str], now: float) -> bool:
+    if not value:
+        return False
+    try:
+        written_at = float(value)
+    except ValueError:
+        return True # unreadable marker: stay on the safe side
+    return now - written_at < READ_YOUR_WRITES_SECONDS
+
+
+def wrote_recently(request: Request, now: Optional[float] = None) -> bool:
+    """Client-held markers: the cookie, or the X-Last-Write value echoed back as a request header."""
+    now = now or time.time()
+    return _recent(request.cookies.get(READ_YOUR_WRITES_COOKIE), now) \
+        or _recent(request.headers.get(READ_YOUR_WRITES_HEADER), now)
+
+
+class ReplicaRouter:
+    def __init__(
+        self,
+        primary: async_sessionmaker = AsyncSessionLocal,
+        replica: Optional[async_sessionmaker] = AsyncReadSessionLocal,
+        max_lag: float = REPLICA_MAX_LAG_SECONDS,
+        check_interval: float = REPLICA_LAG_CHECK_SECONDS,
+        tracked_actors: int = READ_YOUR_WRITES_ACTORS,
+    ):
+        self.lock = threading.Lock()
+        self.primary = primary
+        self.replica = replica # None = no replica configured
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.writers = LRUCache(maxsize=tracked_actors) # actor id -> time of last write (this process)
+        self.lag: Optional[float] = None # None = unknown / replica unreachable
+        self.checked_at: Optional[float] = None # monotonic
+        self.probing = False
+        self.routed = {PRIMARY: 0, REPLICA: 0}
+        self.fallbacks = {"write": 0, "read_your_writes": 0, "lag": 0}
+
+    def record_write(self, actor: Optional[str], at: Optional[float] = None) -> None:
+        if actor:
+            self.writers.put(actor, at or time.time())
+
+    def actor_wrote_recently(self, request: Request, now: Optional[float] = None) -> bool:
+        actor = request.headers.get(ACTOR_HEADER)
+        written_at = self.writers.get(actor) if actor else None
+        return written_at is not None and (now or time.time()) - written_at < READ_YOUR_WRITES_SECONDS
+
+    async def _measure_lag(self) -> Optional[float]:
+        async with self.replica() as db:
+            if db.bind.dialect.name != "postgresql":
+                await db.execute(text("SELECT 1")) # reachable; no streaming replication to measure
+                return 0.0
+            lag = await db.scalar(REPLICA_LAG_SQL)
+            return None if lag is None else max(0.0, float(lag))
+
+    async def _probe(self) -> None:
+        lag = None
+        try:
+            lag = await self._measure_lag()
+        except Exception as e:
+            logger.warning(f"Replica lag probe failed: {e!r}")
+        finally:
+            with self.lock:
+                self.lag = lag
+                self.checked_at = time.monotonic()
+                self.probing = False
+
+    async def replica_fresh(self) -> bool:
+        with self.lock:
+            due = self.checked_at is None or time.monotonic() - self.checked_at >= self.check_interval
+            # Single prober; concurrent requests use the last known lag meanwhile
+            probe = due and not self.probing
+            if probe:
+                self.probing = True
+        if probe:
+            await self._probe()
+        with self.lock:
+            return self.lag is not None and self.lag <= self.max_lag
+
+    async def route(self, request: Request) -> Tuple[async_sessionmaker, str]:
+        """Picks the session factory for a request: (factory, PRIMARY | REPLICA)."""
+        if self.replica is None:
+            reason = None
+        elif request.method not in READ_METHODS:
+            reason = "write"
+        elif wrote_recently(request) or self.actor_wrote_recently(request):
+            reason = "read_your_writes"
+        elif not await self.replica_fresh():
+            reason = "lag"
+        else:
+            with self.lock:
+                self.routed[REPLICA] += 1
+            return self.replica, REPLICA
+
+        with self.lock:
+            self.routed[PRIMARY] += 1
+            if reason:
+                self.fallbacks[reason] += 1
+        return self.primary, PRIMARY
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "replica_configured": self.replica is not None,
+                "lag_seconds": self.lag,
+                "max_lag_seconds": self.max_lag,
+                "tracked_writers": len(self.writers),
+                "routed": dict(self.routed),
+                "fallbacks": dict(self.fallbacks),
+            }
+
+
+class ReadYourWritesMiddleware:
+    """
+    Pure ASGI (does not touch the request body, so streaming endpoints are
+    unaffected): stamps every unsafe request's response with the write marker
+    and records the writing actor.
+    """
+
+    def __init__(self, app, router: Optional[ReplicaRouter] = None):
+        self.app = app
+        self.router = router # None = the global replica_router
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in READ_METHODS + ("OPTIONS",):
+            return await self.app(scope, receive, send)
+
+        router = self.router or replica_router
+        actor = Request(scope).headers.get(ACTOR_HEADER)
+
+        async def send_with_marker(message):
+            if message["type"] == "http.response.start":
+                written_at = time.time()
+                router.record_write(actor, written_at)
+                cookie = (
+                    f"{READ_YOUR_WRITES_COOKIE}={written_at:.3f}; Max-Age={READ_YOUR_WRITES_SECONDS}; "
+                    "Path=/; HttpOnly; SameSite=Lax"
+                ).encode("latin-1")
+                message = {**message, "headers": [
+                    *message.get("headers", []),
+                    (b"set-cookie", cookie),
+                    (READ_YOUR_WRITES_HEADER.lower().encode("latin-1"), f"{written_at:.3f}".encode("latin-1")),
+                ]}
+            await send(message)
+
+        await self.app(scope, receive, send_with_marker)
+
+
+# Global instance
+replica_router = ReplicaRouter()
@@ -0,0 +1,196 @@
+"""
+In-process rule -> (SOP, enforcement actions) resolution cache.
+
+The mapping changes only when SOPs are seeded, edited or deactivated, so
+violation handling resolves it from memory. Every entry is stamped with a
+generation counter:
+
+  * Any flush/bulk write touching SOP, SOPRule or EnforcementAction bumps
+    the generation after commit (ORM session events below).
+  * On Postgres the same transaction issues NOTIFY on SOP_CACHE_CHANNEL;
+    start_invalidation_listener() LISTENs in every worker and bumps its
+    own generation, so all workers drop stale mappings.
+"""
+import logging
+import select
+import threading
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.models.sop import SOP, SOPRule, EnforcementAction
+
+logger = logging.getLogger("procguard.sop_cache")
+
+SOP_CACHE_CHANNEL = "procguard_sop_changed"
+_SOP_MODELS = (SOP, SOPRule, EnforcementAction)
+
+
+class SOPSnapshot(NamedTuple):
+    id: object
+    name: str
+    version: int
+    immutable_hash: str
+
+
+class ActionSnapshot(NamedTuple):
+    id: object
+    action_type: str
+    parameters: dict
+
+
+class ResolvedSOP(NamedTuple):
+    sop: SOPSnapshot
+    actions: Tuple[ActionSnapshot, ...]
+
+
+class SOPResolutionCache:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.generation = 0
+        # rule_code -> (generation, ResolvedSOP | None); None = rule has no active SOP
+        self.entries: Dict[str, Tuple[int, Optional[ResolvedSOP]]] = {}
+
+    def resolve(self, db: Session, rule_code: str) -> Optional[ResolvedSOP]:
+        with self.lock:
+            generation = self.generation
+            cached = self.entries.get(rule_code)
+            if cached is not None and cached[0] == generation:
+                return cached[1]
+
+        resolved = self._load(db, rule_code)
+
+        with self.lock:
+            # Do not store a mapping that was invalidated while we were loading it
+            if self.generation == generation:
+                self.entries[rule_code] = (generation, resolved)
+        return resolved
+
+    def invalidate(self) -> int:
+        with self.lock:
+            self.generation += 1
+            self.entries.clear()
+            return self.generation
+
+    @staticmethod
+    def _load(db: Session, rule_code: str) -> Optional[ResolvedSOP]:
+        """Deterministic SOP Resolution (first mapping wins, SOP must be active)."""
+        sop_mapping = db.query(SOPRule).filter(SOPRule.rule_code == rule_code).first()
+        if not sop_mapping:
+            return None
+        sop = db.query(SOP).filter(SOP.id == sop_mapping.sop_id, SOP.is_active == True).first()
+        if not sop:
+            return None
+        actions = db.query(EnforcementAction).filter(EnforcementAction.sop_id == sop.id).all()
+        return ResolvedSOP(
+            sop=SOPSnapshot(sop.id, sop.name, sop.version, sop.immutable_hash),
+            actions=tuple(ActionSnapshot(a.id, a.action_type, a.parameters) for a in actions),
+        )
+
+
+# Global instance
+sop_resolution_cache = SOPResolutionCache()
+
+
+# ============================================================
+# INVALIDATION (local: session events, cross-worker: NOTIFY)
+# ============================================================
+
+def _mark_sop_change(session: Session) -> None:
+    if session.info.get("sop_changed"):
+        return
+    session.info["sop_changed"] = True
+    bind = session.get_bind()
+    if bind.dialect.name == "postgresql":
+        # Transactional: delivered to listeners only if this transaction commits
+        session.connection().execute(text(f"NOTIFY {SOP_CACHE_CHANNEL}"))
+
+
+@event.listens_for(Session, "after_flush")
+def _after_flush(session, flush_context):
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, _SOP_MODELS):
+            _mark_sop_change(session)
+            return
+
+
+@event.listens_for(Session, "after_bulk_update")
+def _after_bulk_update(update_context):
+    if update_context.mapper.class_ in _SOP_MODELS:
+        _mark_sop_change(update_context.session)
+
+
+@event.listens_for(Session, "after_bulk_delete")
+def _after_bulk_delete(delete_context):
+    if delete_context.mapper.class_ in _SOP_MODELS:
+        _mark_sop_change(delete_context.session)
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session):
+    if session.info.pop("sop_changed", False):
+        sop_resolution_cache.invalidate()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _after_rollback(session, previous_transaction):
+    session.info.pop("sop_changed", None)
+
+
+def start_invalidation_listener(engine: Engine, poll_interval: float = 5.0) -> Optional[Callable[[], None]]:
+    """
+    LISTENs on SOP_CACHE_CHANNEL in a daemon thread (Postgres only).
+    Returns a stop() callable, or None when not applicable.
+    """
+    if engine.dialect.name != "postgresql":
+        return None
+
+    stop_event = threading.Event()
+
+    def listen():
+        while not stop_event.is_set():
+            raw = None
+            try:
+                raw = engine.raw_connection()
+                conn = raw.driver_connection
+                conn.autocommit = True
+                cursor = conn.cursor()
+                cursor.execute(f"LISTEN {SOP_CACHE_CHANNEL}")
+                # Anything committed before LISTEN took effect is unseen: start clean
+                sop_resolution_cache.invalidate()
+
+                while not stop_event.is_set():
+                    if hasattr(conn, "poll"):
+                        # psycopg2: wait on the socket, then drain
+                        if select.select([conn], [], [], poll_interval) == ([], [], []):
+                            continue
+                        conn.poll()
+                        received = bool(conn.notifies)
+                        conn.notifies.clear()
+                    elif hasattr(conn, "notifications"):
+                        # pg8000: notifications arrive with the next round trip
+                        stop_event.wait(poll_interval)
+                        cursor.execute("SELECT 1")
+                        received = bool(conn.notifications)
+                        conn.notifications.clear()
+                    else:
+                        logger.warning("SOP cache listener: unsupported driver, cross-worker invalidation disabled")
+                        return
+                    if received:
+                        sop_resolution_cache.invalidate()
+            except Exception as e:
+                logger.warning(f"SOP cache listener error (reconnecting): {e}")
+                sop_resolution_cache.invalidate()
+                stop_event.wait(poll_interval)
+            finally:
+                if raw is not None:
+                    try:
+                        raw.invalidate() # Never return a LISTENing connection to the pool
+                    except Exception:
+                        pass
+
+    thread = threading.Thread(target=listen, name="sop-cache-listener", daemon=True)
+    thread.start()
+    return stop_event.set
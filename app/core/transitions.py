@@ -1,9 +1,9 @@
 from datetime import datetime
 from sqlalchemy.orm import Session
-from app.core.fsm import State, Event, ALLOWED_TRANSITIONS
+from app.core.fsm import State, Event
+from app.core.fsm_table import lookup_transition
+from app.core.projections import record_state_change, record_violation_opened
 from app.core.violations import (
-    invalid_fsm_transition,
-    terminal_state_mutation,
     progress_without_approval,
     approval_after_progress,
     duplicate_approval,
@@ -15,9 +15,6 @@ from app.models.batch import Batch
 from app.models.event import BatchEvent
 from app.models.violation import Violation
 from app.models.audit import AuditLog
-from app.security.rbac import authorize_event
-from app.security.roles import Role
-import uuid
 
 def execute_transition(
     *,
@@ -32,7 +29,10 @@ def execute_transition(
     already_progressed: bool = False,
     procedure_version: int | None = None,
 ):
-    current_state = State(batch.current_state)
+    # Single precompiled lookup: authorization, terminal set and FSM closure
+    outcome = lookup_transition(actor_role, batch.current_state, event)
+    current_state = outcome.state
+    event = outcome.event
 
     # ========================================================
     # SINGLE AUDIT GUARANTEE
@@ -41,8 +41,12 @@ def execute_transition(
         from app.core.violations_handler import resolve_sop_for_rule, handle_violation_enforcement
         from app.core.opa import record_opa_decision
         from app.core.crypto import canonical_hash
+        from app.core.evidence_chain import materialize_evidence_chain
         
         batch.current_state = State.VIOLATED.value
+        # Read-model projection moves with the state write (same transaction)
+        record_state_change(db, batch, current_state.value, State.VIOLATED.value, audit_items=1)
+        record_violation_opened(db, batch.project_id)
 
         # 1. Record OPA Decision (Root of Truth)
         opa_log = record_opa_decision(
@@ -57,7 +61,7 @@ def execute_transition(
                 "event": event.value,
                 "actor_role": actor_role
             },
-            project_id=batch.project_id if hasattr(batch, 'project_id') else uuid.UUID("550e8400-e29b-41d4-a716-446655440000")
+            project_id=batch.project_id
         )
 
         # 2. Resolve SOP (Part 1.3)
@@ -83,6 +87,8 @@ def execute_transition(
         )
         db.add(violation)
         db.flush() 
+        # Reverse link (decision -> violation) is a PK hop; set once the violation row exists (FK)
+        opa_log.linked_violation_id = violation.id
 
         # 4. Deterministic Resolution & Evidence Chaining (Part 1, 2, 3)
         handle_violation_enforcement(db=db, violation=violation, actor_id=actor)
@@ -97,24 +103,28 @@ def execute_transition(
         }
         a_hash = canonical_hash(audit_payload)
 
-        db.add(
-            AuditLog(
-                batch_id=batch.batch_id,
-                expected_state=current_state.value,
-                actual_state=current_state.value,  # State didn't change
-                action=event.value,
-                result="FAILURE",
-                project="ProcGuard Core",
-                actor=actor,
-                timestamp=occurred_at,
-                client="API",
-                agent="PROCguard",
-                violation_id=violation.id,
-                audit_hash=a_hash,
-                violation_hash_link=v_hash,
-                payload=audit_payload
-            )
+        audit_log = AuditLog(
+            batch_id=batch.batch_id,
+            expected_state=current_state.value,
+            actual_state=current_state.value,  # State didn't change
+            action=event.value,
+            result="FAILURE",
+            project="ProcGuard Core",
+            project_id=batch.project_id,
+            actor=actor,
+            timestamp=occurred_at,
+            client="API",
+            agent="PROCguard",
+            violation_id=violation.id,
+            audit_hash=a_hash,
+            violation_hash_link=v_hash,
+            payload=audit_payload
         )
+        db.add(audit_log)
+        db.flush()
+
+        # 6. Materialize the evidence chain now that every node exists (same transaction)
+        materialize_evidence_chain(db, violation, opa_log=opa_log, audit_log=audit_log)
 
         db.commit()
         raise RuntimeError(rule)
@@ -122,21 +132,19 @@ def execute_transition(
     # ========================================================
     # 1. AUTHORIZATION (MUST BE FIRST)
     # ========================================================
-    authorize_event(
-        role=Role(actor_role),
-        event=event,
-    )
+    if outcome.denial is not None:
+        raise PermissionError(outcome.denial)
 
     # ========================================================
     # 2. TERMINAL STATES — ABSOLUTE
     # ========================================================
-    if terminal_state_mutation(current_state):
+    if outcome.rule == "TERMINAL_STATE_MUTATION":
         violate("TERMINAL_STATE_MUTATION", "REJECTED_TERMINAL_STATE")
 
     # ========================================================
     # 3. FSM STRUCTURAL CLOSURE (NO GAPS)
     # ========================================================
-    if (current_state, event) not in ALLOWED_TRANSITIONS:
+    if outcome.rule == "INVALID_FSM_TRANSITION":
         violate("INVALID_FSM_TRANSITION", "VIOLATION_INVALID_TRANSITION")
 
     # ========================================================
@@ -168,8 +176,9 @@ def execute_transition(
         violate("PROGRESS_WITHOUT_APPROVAL", "VIOLATION_MISSING_APPROVAL")
 
     # 8. VALID TRANSITION (EXACTLY ONE SUCCESS AUDIT)
-    next_state = ALLOWED_TRANSITIONS[(current_state, event)]
+    next_state = outcome.next_state
     batch.current_state = next_state.value
+    record_state_change(db, batch, current_state.value, next_state.value, audit_items=1)
 
     from app.core.crypto import canonical_hash
 
@@ -199,6 +208,7 @@ def execute_transition(
             action=event.value,
             result="SUCCESS",
             project="ProcGuard Core",
+            project_id=batch.project_id,
             actor=actor,
             timestamp=occurred_at,
             client="API",
@@ -1,4 +1,5 @@
 from app.core.fsm import State, Event
+from app.core.invariants import TERMINAL_STATES
 from typing import Dict, Tuple
 
 
@@ -11,11 +12,7 @@ def invalid_fsm_transition(
 
 
 def terminal_state_mutation(current: State) -> bool:
-    return current in {
-        State.COMPLETED,
-        State.VIOLATED,
-        State.REJECTED,
-    }
+    return current in TERMINAL_STATES
 
 
 def progress_without_approval(
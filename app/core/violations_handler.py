@@ -1,18 +1,31 @@
 from sqlalchemy.orm import Session
 from app.models.violation import Violation
-from app.models.sop import SOP, SOPRule, EnforcementAction, EnforcementEvent
+from app.models.sop import EnforcementEvent
+from app.core.sop_cache import ResolvedSOP, SOPSnapshot, sop_resolution_cache
 from app.core.evidence import add_evidence_node
 from app.core.filter_audit import FilterAuditLog
+from app.core.projections import record_violation_resolved
 from sqlalchemy import desc
 import uuid
 from datetime import datetime, timezone
 
-def resolve_sop_for_rule(db: Session, rule_code: str) -> SOP | None:
-    """Deterministic SOP Resolution."""
-    sop_mapping = db.query(SOPRule).filter(SOPRule.rule_code == rule_code).first()
-    if not sop_mapping:
-        return None
-    return db.query(SOP).filter(SOP.id == sop_mapping.sop_id, SOP.is_active == True).first()
+def resolve_sop_for_rule(db: Session, rule_code: str) -> SOPSnapshot | None:
+    """Deterministic SOP Resolution (cached, see app/core/sop_cache.py)."""
+    resolved = sop_resolution_cache.resolve(db, rule_code)
+    return resolved.sop if resolved else None
+
+def resolve_violation(db: Session, violation: Violation) -> bool:
+    """
+    Marks an OPEN violation RESOLVED and moves the projection counters in the same transaction.
+    Conditional update: a concurrent resolve counts once. Does NOT commit.
+    """
+    resolved = db.query(Violation)\
+        .filter(Violation.id == violation.id, Violation.status == "OPEN")\
+        .update({Violation.status: "RESOLVED"}, synchronize_session=False)
+    if resolved:
+        record_violation_resolved(db, violation.batch.project_id)
+        db.expire(violation, ["status"])
+    return bool(resolved)
 
 def handle_violation_enforcement(
     db: Session,
@@ -25,7 +38,11 @@ def handle_violation_enforcement(
     if not violation.sop_id:
         return
 
-    sop = db.query(SOP).filter(SOP.id == violation.sop_id).first()
+    # Same cached (SOP, actions) resolution the violation was created from
+    resolved: ResolvedSOP | None = sop_resolution_cache.resolve(db, violation.rule)
+    if not resolved or resolved.sop.id != violation.sop_id:
+        return
+    sop = resolved.sop
     
     # 2. Build Evidence Chain (Part 3)
     
@@ -45,8 +62,7 @@ def handle_violation_enforcement(
     add_evidence_node(db, violation.id, "SOP_INVOKED", sop.id)
 
     # 3. Execute Enforcement (Part 2.3)
-    actions = db.query(EnforcementAction).filter(EnforcementAction.sop_id == sop.id).all()
-    for action in actions:
+    for action in resolved.actions:
         event = EnforcementEvent(
             id=uuid.uuid4(),
             violation_id=violation.id,
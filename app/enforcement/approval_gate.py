@@ -1,3 +1,5 @@
+from typing import Dict, Iterable
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from app.models.approval import Approval
 
@@ -6,6 +8,29 @@ def get_latest_approval(db: Session, batch_id: str) -> Approval:
         Approval.batch_id == batch_id
     ).order_by(Approval.created_at.desc()).first()
 
+def get_latest_approvals(db: Session, batch_ids: Iterable) -> Dict:
+    """
+    Latest approval per batch for a whole page, in ONE query.
+    Served by ix_approvals_batch_id_created_at (batch_id, created_at DESC).
+    """
+    batch_ids = list(batch_ids)
+    if not batch_ids:
+        return {}
+
+    ranked = db.query(
+        Approval.id.label("id"),
+        func.row_number().over(
+            partition_by=Approval.batch_id,
+            order_by=Approval.created_at.desc()
+        ).label("rn")
+    ).filter(Approval.batch_id.in_(batch_ids)).subquery()
+
+    latest = db.query(Approval)\
+        .join(ranked, ranked.c.id == Approval.id)\
+        .filter(ranked.c.rn == 1)\
+        .all()
+    return {approval.batch_id: approval for approval in latest}
+
 def can_batch_progress(db: Session, batch_id: str) -> bool:
     """
     Hard enforcement: Nothing progresses without explicit approval.
@@ -16,3 +41,14 @@ def can_batch_progress(db: Session, batch_id: str) -> bool:
         return False
 
     return approval.decision == "APPROVED"
+
+def can_batch_progress_many(db: Session, batch_ids: Iterable) -> Dict:
+    """
+    Batched can_batch_progress: {batch_id: bool} for every requested batch.
+    """
+    batch_ids = list(batch_ids)
+    latest = get_latest_approvals(db, batch_ids)
+    return {
+        batch_id: batch_id in latest and latest[batch_id].decision == "APPROVED"
+        for batch_id in batch_ids
+    }
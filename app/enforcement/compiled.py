@@ -0,0 +1,130 @@
+"""
+Compiled, single-pass SOP enforcement.
+
+An SOP is compiled ONCE into two hash indexes:
+
+    position:      step_id -> position in the approved order
+    required_role: step_id -> role that must perform the step
+
+A single pass over the execution events then detects every rule the
+validators in validators.py check with five separate scans:
+
+    1. UNEXPECTED_STEP           step not part of the SOP
+    2. DUPLICATE_STEP_EXECUTION  step executed more than once
+    3. MISSING_REQUIRED_STEP     SOP step never executed
+    4. STEP_ORDER_MISMATCH       known steps not in approved order
+    5. UNAUTHORIZED_ACTOR        step performed by the wrong role
+
+Violations are reported in that priority order with the same codes and
+messages, so the first one is exactly what the fail-fast engine returned.
+With collect_all the caller gets every violation instead.
+"""
+import hashlib
+import json
+from functools import lru_cache
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+
+class CompiledSOP(NamedTuple):
+    step_ids: Tuple[str, ...]
+    position: Dict[str, int]
+    required_role: Dict[str, str]
+    fingerprint: str # SHA-256 of steps + roles; identifies the SOP a stored state belongs to
+
+    def enforce(self, execution_events: Iterable[Mapping], collect_all: bool = False) -> List[Dict]:
+        position = self.position
+        required_role = self.required_role
+
+        counts: Dict[str, int] = {}
+        unexpected: List[str] = []
+        unauthorized: List[Tuple[str, str]] = []
+        executed_known = 0
+        last_position = -1
+        out_of_order = False
+
+        for e in execution_events:
+            step_id = e["step_id"]
+            pos = position.get(step_id)
+            if pos is None:
+                if not collect_all:
+                    # Highest priority: nothing later in the pass can outrank it
+                    return [_unexpected(step_id)]
+                unexpected.append(step_id)
+                counts[step_id] = counts.get(step_id, 0) + 1
+                continue
+
+            seen = counts.get(step_id, 0)
+            if not seen:
+                executed_known += 1
+            counts[step_id] = seen + 1
+
+            # Approved order <=> positions of known steps never decrease
+            if pos < last_position:
+                out_of_order = True
+            else:
+                last_position = pos
+
+            role = required_role.get(step_id)
+            if role and e["actor"] != role:
+                unauthorized.append((step_id, role))
+
+        violations = [_unexpected(step_id) for step_id in unexpected]
+
+        for step_id, count in counts.items():
+            if count > 1:
+                violations.append({
+                    "code": "DUPLICATE_STEP_EXECUTION",
+                    "details": f"Step {step_id} executed {count} times"
+                })
+                if not collect_all:
+                    return violations
+
+        if executed_known < len(position):
+            missing = sorted(step_id for step_id in position if step_id not in counts)
+            violations.append({
+                "code": "MISSING_REQUIRED_STEP",
+                "details": f"Missing steps: {missing}"
+            })
+
+        if out_of_order:
+            violations.append({
+                "code": "STEP_ORDER_MISMATCH",
+                "details": "Steps executed out of approved order"
+            })
+
+        for step_id, role in unauthorized:
+            violations.append({
+                "code": "UNAUTHORIZED_ACTOR",
+                "details": f"Step {step_id} requires role {role}"
+            })
+
+        return violations if collect_all else violations[:1]
+
+
+def _unexpected(step_id: str) -> Dict:
+    return {
+        "code": "UNEXPECTED_STEP",
+        "details": f"Step {step_id} is not part of the SOP"
+    }
+
+
+@lru_cache(maxsize=256)
+def _compile(step_ids: Tuple[str, ...], roles: Tuple[Tuple[str, str], ...]) -> CompiledSOP:
+    position: Dict[str, int] = {}
+    for i, step_id in enumerate(step_ids):
+        # First occurrence wins, like sop_order.index()
+        position.setdefault(step_id, i)
+    role_map = dict(roles)
+    required_role = {step_id: role_map[step_id] for step_id in position if role_map.get(step_id)}
+    fingerprint = hashlib.sha256(json.dumps([step_ids, roles], default=str).encode("utf-8")).hexdigest()
+    return CompiledSOP(step_ids, position, required_role, fingerprint)
+
+
+def compile_sop(sop_steps: Sequence[Mapping], role_map: Optional[Mapping[str, str]]) -> CompiledSOP:
+    """
+    Compiles (and caches) an SOP + role map. Identical SOPs share one compiled
+    index, so repeated checks against the same procedure skip compilation.
+    """
+    step_ids = tuple(s["id"] for s in sop_steps)
+    roles = tuple(sorted((role_map or {}).items()))
+    return _compile(step_ids, roles)
@@ -1,32 +1,28 @@
-from app.enforcement.validators import (
-    validate_step_order,
-    validate_missing_steps,
-    validate_actor_roles,
-    validate_unexpected_steps,
-    validate_duplicates
-)
+from typing import Dict, List, Optional
+
+from app.enforcement.compiled import compile_sop
+
+def find_violations(
+    sop_steps,
+    execution_events,
+    role_map,
+    collect_all: bool = True
+) -> List[Dict]:
+    """
+    Runs deterministic enforcement in a single pass over the execution.
+    Returns violations in priority order (all of them with collect_all).
+    """
+    compiled = compile_sop(sop_steps, role_map)
+    return compiled.enforce(execution_events, collect_all=collect_all)
 
 def run_enforcement(
     sop_steps,
     execution_events,
     role_map
-):
+) -> Optional[Dict]:
     """
     Runs deterministic enforcement.
     Returns first violation found (fail-fast).
     """
-
-    validators = [
-        validate_unexpected_steps,
-        lambda s, e: validate_duplicates(e),
-        validate_missing_steps,
-        validate_step_order,
-        lambda s, e: validate_actor_roles(s, e, role_map)
-    ]
-
-    for validator in validators:
-        violation = validator(sop_steps, execution_events)
-        if violation:
-            return violation
-
-    return None
+    violations = find_violations(sop_steps, execution_events, role_map, collect_all=False)
+    return violations[0] if violations else None
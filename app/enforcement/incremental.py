@@ -0,0 +1,234 @@
+"""
+Incremental (streaming) SOP enforcement.
+
+Instead of re-validating a batch's whole execution history on every call,
+each batch keeps a compact automaton over its compiled SOP:
+
+    next_expected  lowest SOP position not yet executed
+    last_position  furthest SOP position executed so far
+    last_step      step id of the previous known event
+    seen           bitset over SOP positions (one bit per step)
+    repeats        execution counts of the steps run more than once
+
+A new event is checked against that state alone: an O(1) lookup in the
+compiled index, a bit test and two integer comparisons, independent of how
+many events the batch has already produced. The per-event rules match
+CompiledSOP.enforce(), except that steps outside the SOP keep no state
+(each occurrence is an UNEXPECTED_STEP, never a duplicate), and a repeated
+step is reported on every repeat with its count so far ("executed 2 times",
+"executed 3 times", ...) where the full pass reports the final count once.
+MISSING_REQUIRED_STEP can only be decided once the execution is declared
+complete.
+
+The state is persisted in batch_enforcement_states (one row per batch,
+locked FOR UPDATE while an event is applied).
+"""
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.enforcement.compiled import CompiledSOP, compile_sop
+from app.models.batch_enforcement_state import BatchEnforcementState
+
+
+class EnforcementAutomaton:
+    __slots__ = ("sop", "next_expected", "last_position", "last_step", "seen", "repeats", "events_seen", "violations")
+
+    def __init__(
+        self,
+        sop: CompiledSOP,
+        next_expected: int = 0,
+        last_position: int = -1,
+        last_step: Optional[str] = None,
+        seen: bytes = b"",
+        repeats: Optional[Mapping[str, int]] = None,
+        events_seen: int = 0,
+        violations: int = 0,
+    ):
+        self.sop = sop
+        self.next_expected = next_expected
+        self.last_position = last_position
+        self.last_step = last_step
+        size = (len(sop.step_ids) + 7) // 8
+        self.seen = bytearray(seen[:size]) + bytearray(max(0, size - len(seen)))
+        self.repeats = dict(repeats or {}) # only steps seen twice or more; the bitset covers the rest
+        self.events_seen = events_seen
+        self.violations = violations
+
+    def is_seen(self, pos: int) -> bool:
+        return bool(self.seen[pos >> 3] & (1 << (pos & 7)))
+
+    def feed(self, event: Mapping) -> List[Dict]:
+        """Applies one execution event; returns the violations it causes."""
+        self.events_seen += 1
+        step_id = event["step_id"]
+        pos = self.sop.position.get(step_id)
+        if pos is None:
+            self.violations += 1
+            return [{
+                "code": "UNEXPECTED_STEP",
+                "details": f"Step {step_id} is not part of the SOP"
+            }]
+
+        found = []
+        if self.is_seen(pos):
+            count = self.repeats.get(step_id, 1) + 1
+            self.repeats[step_id] = count
+            found.append({
+                "code": "DUPLICATE_STEP_EXECUTION",
+                "details": f"Step {step_id} executed {count} times"
+            })
+        else:
+            self.seen[pos >> 3] |= 1 << (pos & 7)
+
+        if pos < self.last_position:
+            found.append({
+                "code": "STEP_ORDER_MISMATCH",
+                "details": f"Step {step_id} executed out of approved order"
+            })
+        else:
+            self.last_position = pos
+
+        role = self.sop.required_role.get(step_id)
+        if role and event["actor"] != role:
+            found.append({
+                "code": "UNAUTHORIZED_ACTOR",
+                "details": f"Step {step_id} requires role {role}"
+            })
+
+        self.last_step = step_id
+        self._advance()
+        self.violations += len(found)
+        return found
+
+    def _advance(self) -> None:
+        # Amortized O(1): next_expected only ever moves forward
+        step_ids, position = self.sop.step_ids, self.sop.position
+        n = len(step_ids)
+        while self.next_expected < n and (
+            self.is_seen(self.next_expected)
+            # Repeated step id in the SOP: only its first position is tracked
+            or position[step_ids[self.next_expected]] != self.next_expected
+        ):
+            self.next_expected += 1
+
+    def missing_steps(self) -> List[str]:
+        return sorted(step_id for step_id, pos in self.sop.position.items() if not self.is_seen(pos))
+
+    def finish(self) -> List[Dict]:
+        """End of execution: the only point where missing steps are known."""
+        missing = self.missing_steps() if self.next_expected < len(self.sop.step_ids) else []
+        if not missing:
+            return []
+        self.violations += 1
+        return [{
+            "code": "MISSING_REQUIRED_STEP",
+            "details": f"Missing steps: {missing}"
+        }]
+
+    def snapshot(self) -> Dict:
+        return {
+            "next_expected": self.next_expected,
+            "next_expected_step": self.sop.step_ids[self.next_expected] if self.next_expected < len(self.sop.step_ids) else None,
+            "last_step": self.last_step,
+            "events_seen": self.events_seen,
+            "violations": self.violations,
+        }
+
+
+class IncrementalResult(NamedTuple):
+    violations: List[Dict]
+    state: Dict
+    completed: bool
+
+
+class EnforcementStateConflict(ValueError):
+    """Stored automaton cannot accept these events (different SOP, or execution already completed)."""
+
+
+def _lock_state(db: Session, batch_id) -> Optional[BatchEnforcementState]:
+    return db.query(BatchEnforcementState)\
+        .filter(BatchEnforcementState.batch_id == batch_id)\
+        .with_for_update()\
+        .first()
+
+
+def _load_or_create_state(db: Session, batch_id, sop: CompiledSOP) -> BatchEnforcementState:
+    row = _lock_state(db, batch_id)
+    if row is not None:
+        return row
+
+    # First event of the batch (savepoint guards a concurrent first event)
+    try:
+        with db.begin_nested():
+            row = BatchEnforcementState(
+                batch_id=batch_id,
+                sop_fingerprint=sop.fingerprint,
+                next_expected=0,
+                last_position=-1,
+                seen_steps=b"",
+                repeated_steps={},
+                events_seen=0,
+                violations=0,
+                updated_at=datetime.now(timezone.utc),
+            )
+            db.add(row)
+        return row
+    except IntegrityError:
+        return _lock_state(db, batch_id)
+
+
+def enforce_events(
+    db: Session,
+    batch_id,
+    sop_steps,
+    role_map,
+    events: Iterable[Mapping],
+    complete: bool = False,
+) -> IncrementalResult:
+    """
+    Applies NEW execution events to the batch's stored automaton.
+    Cost is proportional to len(events), never to the batch's history.
+    Flushes the updated state; the caller commits.
+    """
+    sop = compile_sop(sop_steps, role_map)
+    row = _load_or_create_state(db, batch_id, sop)
+
+    if row.sop_fingerprint != sop.fingerprint:
+        raise EnforcementStateConflict("Batch execution state was built against a different SOP")
+    if row.completed_at is not None:
+        raise EnforcementStateConflict("Batch execution is already complete")
+
+    automaton = EnforcementAutomaton(
+        sop,
+        next_expected=row.next_expected,
+        last_position=row.last_position,
+        last_step=row.last_step,
+        seen=row.seen_steps or b"",
+        repeats=row.repeated_steps,
+        events_seen=row.events_seen,
+        violations=row.violations,
+    )
+
+    violations = []
+    for event in events:
+        violations.extend(automaton.feed(event))
+    if complete:
+        violations.extend(automaton.finish())
+
+    now = datetime.now(timezone.utc)
+    row.next_expected = automaton.next_expected
+    row.last_position = automaton.last_position
+    row.last_step = automaton.last_step
+    row.seen_steps = bytes(automaton.seen)
+    row.repeated_steps = automaton.repeats
+    row.events_seen = automaton.events_seen
+    row.violations = automaton.violations
+    row.updated_at = now
+    if complete:
+        row.completed_at = now
+    db.flush()
+
+    return IncrementalResult(violations, automaton.snapshot(), complete)
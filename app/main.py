@@ -12,7 +12,7 @@ from fastapi.responses import JSONResponse
 
 from app.api import (
     regulatory_audit as audit, violations, opa, dashboard, execution_routes, evidence,
-    batches, events, procedures, audit_timeline, compliance, boards
+    batches, events, procedures, audit_timeline, compliance, boards, approvals, exports
 )
 from app.core.database import engine, init_db
 from app.models.base import Base
@@ -43,11 +43,48 @@ async def lifespan(app: FastAPI):
             # ensuring safety here.
         except Exception as inner_e:
              print(f"WARNING: System boot audit log failed to write: {inner_e}")
+        try:
+            # TTL expiry for MES retry keys (Idempotency-Key)
+            from app.core.idempotency import purge_expired_keys
+            purge_expired_keys(db)
+        except Exception as inner_e:
+             print(f"WARNING: Idempotency key purge failed (non-fatal): {inner_e}")
+        try:
+            # Export jobs orphaned by the previous process: resume PENDING, fail stale RUNNING
+            # (retention also runs here, then periodically on submit)
+            from app.services.export_jobs import export_jobs
+            export_jobs.recover(db)
+        except Exception as inner_e:
+             print(f"WARNING: Export job recovery failed (non-fatal): {inner_e}")
         finally:
             db.close()
     except Exception as e:
         print(f"WARNING: System boot audit log connection failed (non-fatal): {e}")
+
+    # Cross-worker SOP resolution cache invalidation (Postgres LISTEN/NOTIFY)
+    from app.core.sop_cache import start_invalidation_listener
+    stop_sop_listener = start_invalidation_listener(engine)
     yield
+    if stop_sop_listener:
+        stop_sop_listener()
+    from app.services.export_jobs import export_jobs
+    from app.services.renderer import pdf_renderer
+    from app.services.mailer import mailer
+    from app.services.bulk_verification import bulk_verifier
+    from app.services.chain_verification import chain_verify_pool
+    from app.services.explanation_cache import explanation_cache
+    from app.services.sop_ingestion import sop_ingestion
+    export_jobs.shutdown()
+    pdf_renderer.shutdown()
+    mailer.shutdown()
+    bulk_verifier.shutdown()
+    chain_verify_pool.shutdown()
+    explanation_cache.shutdown()
+    sop_ingestion.shutdown()
+    from app.core.database import async_engine, read_async_engine
+    await async_engine.dispose()
+    if read_async_engine is not None:
+        await read_async_engine.dispose()
 
 app = FastAPI(
     title="ProcGuard API",
@@ -79,13 +116,21 @@ app.add_middleware(
         "X-Actor-Role",
         "X-Request-ID",
         "X-Trace-ID",
-        "X-Correlation-ID"
+        "X-Correlation-ID",
+        "Idempotency-Key",
+        "X-Last-Write"
     ],
+    expose_headers=["Idempotent-Replayed", "X-Next-Cursor", "X-Cache", "X-DB-Route", "X-Last-Write"],
 )
 
+# Read-your-writes: clients that just wrote read from the primary, not the replica
+from app.core.read_routing import ReadYourWritesMiddleware
+app.add_middleware(ReadYourWritesMiddleware)
+
 # Register Routers (AFTER Middleware)
 app.include_router(batches.router, prefix="/batches", tags=["batches"])
 app.include_router(events.router, prefix="/batches", tags=["events"])
+app.include_router(approvals.router, prefix="/approvals", tags=["approvals"])
 app.include_router(procedures.router, prefix="/procedures", tags=["procedures"])
 app.include_router(audit.router)
 app.include_router(audit_timeline.router, prefix="/batches", tags=["timeline"]) 
@@ -96,6 +141,7 @@ app.include_router(dashboard.router)
 app.include_router(boards.router, prefix="/boards", tags=["boards"])
 app.include_router(execution_routes.router)
 app.include_router(evidence.router, tags=["evidence"])
+app.include_router(exports.router, prefix="/exports", tags=["exports"])
 
 # Exception Handler for global safety
 @app.exception_handler(Exception)
@@ -116,6 +162,38 @@ def system_health_check():
     """
     return circuit_breaker.get_health_status()
 
+@app.get("/system/renderer")
+def renderer_stats():
+    """
+    PDF render pool latency (queueing vs rendering, per document kind).
+    """
+    from app.services.renderer import pdf_renderer
+    return pdf_renderer.stats()
+
+@app.get("/system/mailer")
+def mailer_stats():
+    """
+    Outbound mail queue and SMTP connection pool counters.
+    """
+    from app.services.mailer import mailer
+    return mailer.stats()
+
+@app.get("/system/cache")
+def cache_stats():
+    """
+    In-process / local artifact cache statistics (hit, miss, size).
+    """
+    from app.core.opa import decision_cache
+    from app.services.artifact_cache import pdf_artifact_cache
+    from app.services.explanation_cache import explanation_cache
+    from app.services.sop_ingestion import sop_ingestion
+    return {
+        "opa_decisions": decision_cache.stats(),
+        "violation_pdfs": pdf_artifact_cache.stats(),
+        "ai_explanations": explanation_cache.stats(),
+        "sop_parses": sop_ingestion.stats(),
+    }
+
 from sqlalchemy.orm import Session
 from fastapi import Depends
 from app.api.deps import get_db
@@ -127,6 +205,7 @@ def get_sync_state(db: Session = Depends(get_db)):
     Eliminates "Unknown" states.
     """
     from app.core.sync import sync_manager
+    from app.core.read_routing import replica_router
     checkpoint = sync_manager.get_latest_checkpoint(db, "audit_events")
     
     return {
@@ -136,5 +215,6 @@ def get_sync_state(db: Session = Depends(get_db)):
             "last_event_id": str(checkpoint.last_event_id),
             "committed_at": checkpoint.committed_at.isoformat(),
             "snapshot_version": checkpoint.snapshot_version
-        } if checkpoint else None
+        } if checkpoint else None,
+        "read_replica": replica_router.stats(),
     }
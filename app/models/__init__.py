@@ -12,3 +12,10 @@ from app.models.sop import SOP, SOPRule, EnforcementAction, EnforcementEvent, Ev
 from app.models.opa_audit import OPAAuditLog
 from app.models.audit_sync_checkpoint import AuditSyncCheckpoint
 from app.models.timeline_snapshot import TimelineSnapshot
+from app.models.idempotency import IdempotencyKey
+from app.models.batch_summary import BatchSummary
+from app.models.violation_evidence_chain import ViolationEvidenceChain
+from app.models.export_job import ExportJob
+from app.models.batch_enforcement_state import BatchEnforcementState
+from app.models.ai_explanation import AIExplanation
+from app.models.sop_parse_result import SOPParseResult
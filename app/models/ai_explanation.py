@@ -0,0 +1,18 @@
+from datetime import datetime
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, DateTime, Text
+from .base import Base
+
+class AIExplanation(Base):
+    """
+    Persistent cache of NON-AUTHORITATIVE violation explanations
+    (app.services.explanation_cache). Keyed by everything that determines the text.
+    """
+    __tablename__ = "ai_explanations"
+
+    code: Mapped[str] = mapped_column(String, primary_key=True)
+    prompt_version: Mapped[str] = mapped_column(String, primary_key=True)
+    model: Mapped[str] = mapped_column(String, primary_key=True)
+
+    explanation: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
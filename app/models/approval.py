@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, DateTime, ForeignKey, Text, CheckConstraint
+from sqlalchemy import String, DateTime, ForeignKey, Text, CheckConstraint, Index
 from sqlalchemy import Uuid as UUID
 from .base import Base
 
@@ -20,4 +20,6 @@ class Approval(Base):
 
     __table_args__ = (
         CheckConstraint(decision.in_(['APPROVED', 'REJECTED']), name='_approval_decision_check'),
+        # Latest-approval lookups (approval_gate)
+        Index("ix_approvals_batch_id_created_at", batch_id, created_at.desc()),
     )
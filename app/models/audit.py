@@ -2,7 +2,7 @@ import uuid
 import enum
 from datetime import datetime
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, DateTime, ForeignKey
+from sqlalchemy import String, DateTime, ForeignKey, Index
 from sqlalchemy import Uuid as UUID, JSON as JSONB
 from .base import Base
 from .batch import Batch
@@ -46,3 +46,8 @@ class AuditLog(Base):
 
     batch: Mapped["Batch"] = relationship("Batch")
     violation: Mapped["Violation"] = relationship("Violation")
+
+    __table_args__ = (
+        # Ordered per-batch scans (streamed timeline PDF)
+        Index("ix_audit_logs_batch_id_timestamp", "batch_id", "timestamp"),
+    )
@@ -1,8 +1,9 @@
 from datetime import datetime
 import uuid
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, DateTime, ForeignKey, Integer
+from sqlalchemy import String, DateTime, ForeignKey, Integer, Index, text
 from sqlalchemy import Uuid as UUID
+from app.core.config import DEFAULT_PROJECT_ID
 from .base import Base
 from .procedure import Procedure
 
@@ -11,6 +12,7 @@ class Batch(Base):
     __tablename__ = "batches"
 
     batch_id: Mapped[uuid.UUID] = mapped_column(UUID, primary_key=True, default=uuid.uuid4)
+    project_id: Mapped[uuid.UUID] = mapped_column(UUID, nullable=False, default=lambda: DEFAULT_PROJECT_ID)
     procedure_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("procedures.procedure_id"))
     procedure_version: Mapped[int] = mapped_column(Integer, nullable=False)
 
@@ -18,3 +20,16 @@ class Batch(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
 
     procedure: Mapped["Procedure"] = relationship("Procedure")
+
+    __table_args__ = (
+        # Keyset listing (list_batches): every filter ends in (created_at, batch_id)
+        Index("ix_batches_created_at_batch_id", "created_at", "batch_id"),
+        Index("ix_batches_state_created_at", "current_state", "created_at", "batch_id"),
+        Index("ix_batches_procedure_created_at", "procedure_id", "procedure_version", "created_at", "batch_id"),
+        # Supervisor worklist: only the (small) AWAITING_APPROVAL slice is indexed
+        Index(
+            "ix_batches_awaiting_approval",
+            "project_id", "created_at", "batch_id",
+            postgresql_where=text("current_state = 'AWAITING_APPROVAL'"),
+        ),
+    )
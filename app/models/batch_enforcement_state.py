@@ -0,0 +1,28 @@
+import uuid
+from datetime import datetime
+from typing import Optional
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, DateTime, Integer, BigInteger, LargeBinary, ForeignKey
+from sqlalchemy import JSON as JSONB
+from .base import Base
+
+class BatchEnforcementState(Base):
+    """
+    Incremental enforcement automaton, one row per batch (app.enforcement.incremental).
+    Lets each new execution event be checked in O(1) instead of re-validating the history.
+    """
+    __tablename__ = "batch_enforcement_states"
+
+    batch_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("batches.batch_id"), primary_key=True)
+    sop_fingerprint: Mapped[str] = mapped_column(String(64), nullable=False) # CompiledSOP.fingerprint
+
+    next_expected: Mapped[int] = mapped_column(Integer, nullable=False, default=0) # lowest SOP position not yet executed
+    last_position: Mapped[int] = mapped_column(Integer, nullable=False, default=-1) # furthest SOP position executed
+    last_step: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    seen_steps: Mapped[bytes] = mapped_column(LargeBinary, nullable=False, default=b"") # bitset over SOP positions (little-endian)
+    repeated_steps: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict) # step id -> count, steps run 2+ times
+
+    events_seen: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    violations: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
@@ -0,0 +1,34 @@
+import uuid
+from datetime import datetime
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import DateTime, BigInteger
+from sqlalchemy import Uuid as UUID
+from .base import Base
+
+class BatchSummary(Base):
+    """
+    Read-model projection: one row of counters per project.
+    Maintained in-transaction by execute_transition / violation handling,
+    recomputable from scratch via app.core.projections.rebuild_batch_summaries.
+    """
+    __tablename__ = "batch_summaries"
+
+    project_id: Mapped[uuid.UUID] = mapped_column(UUID, primary_key=True)
+
+    # Batches by FSM state
+    batches_created: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    batches_in_progress: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    batches_awaiting_approval: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    batches_approved: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    batches_completed: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    batches_violated: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    batches_rejected: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+    # Violations by status
+    violations_open: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    violations_resolved: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+    procedures: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    audit_items: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
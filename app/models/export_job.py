@@ -0,0 +1,38 @@
+import uuid
+from datetime import datetime
+from typing import Optional
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, DateTime, Integer, Text, Index
+from sqlalchemy import Uuid as UUID
+from sqlalchemy import JSON as JSONB
+from .base import Base
+
+class ExportJob(Base):
+    """
+    Persisted state of a background export (PDF, email, compliance bundle).
+    Written by the export worker process; polled by GET /exports/{job_id}.
+    """
+    __tablename__ = "export_jobs"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID, primary_key=True, default=uuid.uuid4)
+    kind: Mapped[str] = mapped_column(String, nullable=False) # timeline_pdf, batch_email, filter_audit_pdf, compliance_filter_trail, chain_verification
+    status: Mapped[str] = mapped_column(String, nullable=False, default="PENDING") # PENDING, RUNNING, COMPLETED, FAILED
+    requested_by: Mapped[str] = mapped_column(String, nullable=False)
+    params: Mapped[dict] = mapped_column(JSONB, nullable=False)
+
+    progress: Mapped[int] = mapped_column(Integer, nullable=False, default=0) # 0-100
+    stage: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    result: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True) # e.g. recipients, blob URL, evidence path
+    result_path: Mapped[Optional[str]] = mapped_column(String, nullable=True) # downloadable artifact, if any
+    result_filename: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    media_type: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False) # result retention
+
+    __table_args__ = (
+        Index("ix_export_jobs_expires_at", "expires_at"),
+    )
@@ -0,0 +1,26 @@
+from datetime import datetime
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, DateTime, Integer, Index
+from sqlalchemy import JSON as JSONB
+from .base import Base
+
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+
+    # Client-supplied Idempotency-Key, namespaced by endpoint + actor
+    key: Mapped[str] = mapped_column(String, primary_key=True)
+    scope: Mapped[str] = mapped_column(String, primary_key=True)
+
+    request_hash: Mapped[str] = mapped_column(String, nullable=False) # sha256(canonical request body)
+    # PENDING: claimed by an in-flight request (no response yet); COMPLETED: replayable
+    status: Mapped[str] = mapped_column(String, nullable=False, default="COMPLETED")
+    status_code: Mapped[int] = mapped_column(Integer, nullable=True)
+    response_body: Mapped[dict] = mapped_column(JSONB, nullable=True)
+    response_hash: Mapped[str] = mapped_column(String, nullable=True) # sha256(canonical response body)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index("ix_idempotency_keys_expires_at", "expires_at"),
+    )
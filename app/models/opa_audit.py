@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import String, DateTime, ForeignKey, Boolean
+from sqlalchemy import String, DateTime, ForeignKey, Boolean, Index
 from sqlalchemy import Uuid as UUID, JSON as JSONB
 from .base import Base
 
@@ -31,3 +31,10 @@ class OPAAuditLog(Base):
     immutable: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
     
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        # decision_hash lookups (evidence chain, custody checks). Not unique: the hash does not
+        # cover resource_id, and every pre-chain row shares the 'legacy' placeholder
+        Index("ix_opa_audit_logs_decision_hash", "decision_hash"),
+        Index("ix_opa_audit_logs_resource", "resource_type", "resource_id", "timestamp"),
+    )
@@ -0,0 +1,20 @@
+from datetime import datetime
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, DateTime, Integer
+from sqlalchemy import JSON as JSONB
+from .base import Base
+
+class SOPParseResult(Base):
+    """
+    Cached NON-AUTHORITATIVE parse of an SOP document (app.services.sop_ingestion),
+    keyed by the document's SHA-256 plus the prompt/model that produced it.
+    """
+    __tablename__ = "sop_parse_results"
+
+    document_sha256: Mapped[str] = mapped_column(String(64), primary_key=True)
+    prompt_version: Mapped[str] = mapped_column(String, primary_key=True)
+    model: Mapped[str] = mapped_column(String, primary_key=True)
+
+    steps: Mapped[list] = mapped_column(JSONB, nullable=False)
+    chunks: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, DateTime, Boolean, ForeignKey
+from sqlalchemy import String, DateTime, Boolean, ForeignKey, Index
 from sqlalchemy import Uuid as UUID, JSON as JSONB
 from .base import Base
 from .batch import Batch
@@ -30,3 +30,11 @@ class Violation(Base):
     batch: Mapped["Batch"] = relationship("Batch")
     filter_context: Mapped["FilterAuditLog"] = relationship("FilterAuditLog")
     sop: Mapped["SOP"] = relationship("SOP")
+
+    __table_args__ = (
+        # Keyset listing (list_violations), newest first
+        Index("ix_violations_detected_at", "detected_at", "violation_id"),
+        Index("ix_violations_status_detected_at", "status", "detected_at", "violation_id"),
+        Index("ix_violations_rule_detected_at", "rule", "detected_at", "violation_id"),
+        Index("ix_violations_batch_id_detected_at", "batch_id", "detected_at", "violation_id"),
+    )
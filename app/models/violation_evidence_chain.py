@@ -0,0 +1,24 @@
+import uuid
+from datetime import datetime
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, DateTime, Boolean, ForeignKey
+from sqlalchemy import JSON as JSONB
+from .base import Base
+
+class ViolationEvidenceChain(Base):
+    """
+    Materialized evidence chain (see app/core/evidence_chain.py).
+    Computed once when enforcement completes; violations are immutable, so it never drifts.
+    Only the immutable hashes are stored: the snapshot anchor / verification level depend on
+    the latest sealed checkpoint and are resolved at read time.
+    """
+    __tablename__ = "violation_evidence_chains"
+
+    violation_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("violations.violation_id"), primary_key=True)
+
+    chain_id: Mapped[str] = mapped_column(String, nullable=False)
+    chain_hash: Mapped[str] = mapped_column(String, nullable=False) # sha256(concat(node hashes))
+    nodes: Mapped[list] = mapped_column(JSONB, nullable=False)
+    verified: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+
+    computed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
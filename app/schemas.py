@@ -24,6 +24,7 @@ class BatchCreateRequest(BaseModel):
     batch_id: UUID
     procedure_id: UUID
     procedure_version: int
+    project_id: Optional[UUID] = None # Defaults to DEFAULT_PROJECT_ID
 
 class EventRequest(BaseModel):
     event: str  # Renamed from event_type
@@ -32,6 +33,7 @@ class EventRequest(BaseModel):
 
 class BatchResponse(BaseModel):
     batch_id: UUID
+    project_id: Optional[UUID] = None
     procedure_id: UUID
     procedure_version: int
     current_state: str
@@ -39,6 +41,14 @@ class BatchResponse(BaseModel):
     
     model_config = ConfigDict(from_attributes=True)
 
+class WorklistItem(BatchResponse):
+    latest_decision: Optional[str] = None # APPROVED, REJECTED or None (never reviewed)
+    can_progress: bool = False
+
+class WorklistPage(BaseModel):
+    items: List[WorklistItem]
+    next_cursor: Optional[str] = None # Keyset cursor; None on the last page
+
 class ProcedureStepResponse(BaseModel):
     step_id: UUID
     step_order: int
@@ -1,7 +1,36 @@
+from typing import Dict, FrozenSet
 from app.security.roles import Role
 from app.core.fsm import Event
 
 
+# Closed permission matrix. Compiled once at import time so authorization
+# never rebuilds sets on the hot path (see app/core/fsm_table.py).
+ROLE_PERMISSIONS: Dict[Role, FrozenSet[Event]] = {
+    Role.OPERATOR: frozenset({Event.START_BATCH, Event.PROGRESS_STEP, Event.REQUEST_APPROVAL}),
+    Role.SUPERVISOR: frozenset({Event.APPROVE_STEP, Event.REJECT_BATCH}),
+    Role.AUDITOR: frozenset(),
+}
+
+DENIAL_REASONS: Dict[Role, str] = {
+    Role.OPERATOR: "Operator can only perform operational actions",
+    Role.SUPERVISOR: "Supervisor cannot perform this action",
+    Role.AUDITOR: "Auditor is read-only",
+}
+
+
+def denial_reason(role: Role, event: Event) -> str | None:
+    """
+    Returns the PermissionError message for (role, event), or None if allowed.
+    """
+    allowed = ROLE_PERMISSIONS.get(role)
+    if allowed is None:
+        # If role is unknown or not handled (should not happen with Enums)
+        return "Unknown role permission"
+    if event in allowed:
+        return None
+    return DENIAL_REASONS[role]
+
+
 def authorize_event(
     *,
     role: Role,
@@ -10,21 +39,6 @@ def authorize_event(
     """
     Raises PermissionError if role is not allowed.
     """
-    if role == Role.OPERATOR:
-        if event not in {Event.START_BATCH, Event.PROGRESS_STEP, Event.REQUEST_APPROVAL}:
-            raise PermissionError("Operator can only perform operational actions")
-        return
-
-    if role == Role.SUPERVISOR:
-        if event not in {
-            Event.APPROVE_STEP,
-            Event.REJECT_BATCH,
-        }:
-            raise PermissionError("Supervisor cannot perform this action")
-        return
-
-    if role == Role.AUDITOR:
-        raise PermissionError("Auditor is read-only")
-
-    # If role is unknown or not handled (should not happen with Enums)
-    raise PermissionError("Unknown role permission")
+    reason = denial_reason(role, event)
+    if reason is not None:
+        raise PermissionError(reason)
@@ -0,0 +1,118 @@
+"""
+Content-addressed artifact cache (forensic PDFs).
+
+Artifacts are rendered from immutable inputs, so the key is a hash of those
+inputs plus the template version; a stored artifact never needs revalidation.
+Files live under a local directory, bounded in total size with LRU eviction
+(recency = file mtime, so the order survives restarts).
+"""
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from app.core.config import PDF_CACHE_DIR, PDF_CACHE_MAX_BYTES
+
+logger = logging.getLogger("procguard.artifact_cache")
+
+
+def artifact_key(*parts) -> str:
+    return hashlib.sha256("|".join("" if p is None else str(p) for p in parts).encode("utf-8")).hexdigest()
+
+
+class FilesystemArtifactCache:
+    def __init__(self, directory: str, max_bytes: int, suffix: str = ".pdf"):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._index: Optional["OrderedDict[str, int]"] = None # key -> size, LRU order
+        self._bytes = 0
+
+    def _load_index(self) -> "OrderedDict[str, int]":
+        # Lazy: rebuild LRU order from disk on first use
+        if self._index is None:
+            os.makedirs(self.directory, exist_ok=True)
+            entries = []
+            for name in os.listdir(self.directory):
+                if name.endswith(self.suffix):
+                    stat = os.stat(os.path.join(self.directory, name))
+                    entries.append((stat.st_mtime, name[:-len(self.suffix)], stat.st_size))
+            self._index = OrderedDict((key, size) for _, key, size in sorted(entries))
+            self._bytes = sum(self._index.values())
+        return self._index
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}{self.suffix}")
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Cached artifact bytes (and marks it recently used), or None on a miss."""
+        with self.lock:
+            index = self._load_index()
+            if key in index:
+                path = self.path_for(key)
+                try:
+                    with open(path, "rb") as f:
+                        content = f.read()
+                    os.utime(path)
+                    index.move_to_end(key)
+                    self.hits += 1
+                    return content
+                except FileNotFoundError:
+                    # Removed behind our back
+                    self._bytes -= index.pop(key)
+            self.misses += 1
+            return None
+
+    def put(self, key: str, content: bytes) -> str:
+        with self.lock:
+            index = self._load_index()
+            path = self.path_for(key)
+            # Atomic publish: readers never see a partially written artifact
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+
+            if key in index:
+                self._bytes -= index.pop(key)
+            index[key] = len(content)
+            self._bytes += len(content)
+            self._evict(keep=key)
+            return path
+
+    def _evict(self, keep: str) -> None:
+        index = self._index
+        while self._bytes > self.max_bytes and len(index) > 1:
+            key, size = next(iter(index.items()))
+            if key == keep:
+                break
+            index.pop(key)
+            self._bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(self.path_for(key))
+            except FileNotFoundError:
+                pass
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            index = self._load_index()
+            return {
+                "entries": len(index),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+# Global instance
+pdf_artifact_cache = FilesystemArtifactCache(PDF_CACHE_DIR, PDF_CACHE_MAX_BYTES)
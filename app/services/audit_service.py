@@ -7,48 +7,33 @@ from reportlab.platypus import SimpleDocTemplate, Paragraph, Table, TableStyle
 from reportlab.lib.pagesizes import letter
 from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet
-from app.storage.blob import upload_evidence
+from app.storage.evidence_store import get_evidence_store
 from app.models.filter_audit import FilterAuditLog
 from app.core.filter_audit import verify_filter_chain
+from app.services.renderer import pdf_renderer
 
-def generate_filter_audit_report(db, screen: str, from_ts: datetime, to_ts: datetime, violation_id: uuid.UUID = None):
+def render_filter_audit_pdf(screen: str, exported_at: datetime, checked_records: int, rows: list) -> bytes:
     """
-    Authoritative Filter Audit Report Generator & Permanent Evidence Archiver.
+    Filter Audit Trail PDF. rows: (created_at, user_id, screen, filter_payload, hash) tuples.
     """
-    # 1. Fetch records
-    records = db.query(FilterAuditLog).filter(
-        FilterAuditLog.screen == screen,
-        FilterAuditLog.created_at >= from_ts,
-        FilterAuditLog.created_at <= to_ts
-    ).order_by(FilterAuditLog.created_at.asc()).all()
-
-    if not records:
-        return None, "No data found for selected window"
-
-    # 2. Verify Integrity BEFORE Export
-    verification = verify_filter_chain(db)
-    if not verification["valid"]:
-        return None, "Filter audit trail integrity violation detected"
-
-    # 3. Generate PDF in-memory
     buffer = io.BytesIO()
     doc = SimpleDocTemplate(buffer, pagesize=letter)
     styles = getSampleStyleSheet()
     elements = []
 
     elements.append(Paragraph(f"ProcGuard Filter Audit Trail: {screen}", styles["Title"]))
-    elements.append(Paragraph(f"Export Timestamp (UTC): {datetime.utcnow().isoformat()}Z", styles["Normal"]))
-    elements.append(Paragraph(f"Hash Chain Verified: YES ({verification['checked_records']} records checked)", styles["Normal"]))
+    elements.append(Paragraph(f"Export Timestamp (UTC): {exported_at.isoformat()}Z", styles["Normal"]))
+    elements.append(Paragraph(f"Hash Chain Verified: YES ({checked_records} records checked)", styles["Normal"]))
     elements.append(Paragraph("<br/><br/>", styles["Normal"]))
 
     table_data = [["Timestamp", "User", "Action", "Payload", "Hash (Short)"]]
-    for r in records:
+    for created_at, user_id, row_screen, filter_payload, row_hash in rows:
         table_data.append([
-            r.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-            r.user_id,
-            r.screen,
-            json.dumps(r.filter_payload)[:30] + "...",
-            r.hash[:12] + "..."
+            created_at.strftime('%Y-%m-%d %H:%M:%S'),
+            user_id,
+            row_screen,
+            json.dumps(filter_payload)[:30] + "...",
+            row_hash[:12] + "..."
         ])
 
     t = Table(table_data)
@@ -60,16 +45,62 @@ def generate_filter_audit_report(db, screen: str, from_ts: datetime, to_ts: date
     ]))
     elements.append(t)
     doc.build(elements)
+    return buffer.getvalue()
+
+
+def render_filter_trail_pdf(screen: str, rows: list) -> bytes:
+    """
+    Compliance attachment PDF. rows: (created_at, filter_payload, hash) tuples.
+    """
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter)
+    styles = getSampleStyleSheet()
+    elements = []
+    elements.append(Paragraph(f"Forensic Filter Trail: {screen}", styles["Title"]))
+    elements.append(Paragraph(f"Integrity Check: VALID", styles["Normal"]))
+
+    table_data = [["Timestamp", "Payload", "Hash"]]
+    for created_at, filter_payload, row_hash in rows:
+        table_data.append([created_at.isoformat(), json.dumps(filter_payload)[:40], row_hash[:8]])
+
+    t = Table(table_data)
+    t.setStyle(TableStyle([('GRID', (0,0), (-1,-1), 1, colors.black)]))
+    elements.append(t)
+    doc.build(elements)
+    return buffer.getvalue()
+
+
+def generate_filter_audit_report(db, screen: str, from_ts: datetime, to_ts: datetime, violation_id: uuid.UUID = None):
+    """
+    Authoritative Filter Audit Report Generator & Permanent Evidence Archiver.
+    """
+    # 1. Fetch records (plain column tuples: they are shipped to the render pool)
+    records = db.query(
+        FilterAuditLog.created_at, FilterAuditLog.user_id, FilterAuditLog.screen,
+        FilterAuditLog.filter_payload, FilterAuditLog.hash
+    ).filter(
+        FilterAuditLog.screen == screen,
+        FilterAuditLog.created_at >= from_ts,
+        FilterAuditLog.created_at <= to_ts
+    ).order_by(FilterAuditLog.created_at.asc()).all()
+
+    if not records:
+        return None, "No data found for selected window"
+
+    # 2. Verify Integrity BEFORE Export
+    verification = verify_filter_chain(db)
+    if not verification["valid"]:
+        return None, "Filter audit trail integrity violation detected"
+
+    # 3. Render on the shared pool from plain tuples
+    pdf_content = pdf_renderer.render(
+        "filter_audit", render_filter_audit_pdf,
+        screen, datetime.utcnow(), verification["checked_records"], [tuple(r) for r in records]
+    )
     
-    pdf_content = buffer.getvalue()
-    
-    # 4. Permanent Evidence Write (Cloud-Native)
+    # 4. Permanent Evidence Write (content-addressed evidence store)
     filename = f"filter_audit_{screen}_{datetime.utcnow().strftime('%Y%H%M')}.pdf"
-    blob_url = upload_evidence(
-        file_bytes=pdf_content,
-        filename=filename,
-        content_type="application/pdf"
-    )
+    blob_url = get_evidence_store().put_bytes(pdf_content, filename, "application/pdf").url
 
     # 5. Build Evidence Chain (Part 3)
     if violation_id:
@@ -80,3 +111,46 @@ def generate_filter_audit_report(db, screen: str, from_ts: datetime, to_ts: date
         # For now, we link the hash to the violation
     
     return pdf_content, blob_url
+
+
+def attach_filter_trail(db, report_id: uuid.UUID, screen: str, from_ts: datetime, to_ts: datetime, evidence_type: str) -> str:
+    """
+    Atomic: Generates a verified Filter Audit PDF and attaches it to a compliance report.
+    Returns the evidence reference. Raises LookupError (no data) or ValueError (integrity violation).
+    """
+    from app.models.compliance import ComplianceEvidence
+
+    # 1. Fetch
+    records = db.query(FilterAuditLog.created_at, FilterAuditLog.filter_payload, FilterAuditLog.hash).filter(
+        FilterAuditLog.screen == screen,
+        FilterAuditLog.created_at >= from_ts,
+        FilterAuditLog.created_at <= to_ts
+    ).order_by(FilterAuditLog.created_at.asc()).all()
+
+    if not records:
+        raise LookupError("No audit data found for the selected range")
+
+    # 2. Verify
+    verification = verify_filter_chain(db)
+    if not verification["valid"]:
+        raise ValueError("Filter audit trail integrity violation")
+
+    # 3. Generate (shared render pool, plain tuples)
+    pdf_content = pdf_renderer.render(
+        "filter_trail", render_filter_trail_pdf,
+        screen, [tuple(r) for r in records]
+    )
+
+    # 4. Store (content-addressed evidence store)
+    filename = f"verified_trail_{uuid.uuid4().hex[:8]}.pdf"
+    filepath = get_evidence_store().put_bytes(pdf_content, filename, "application/pdf").url
+
+    # 5. Attach
+    evidence = ComplianceEvidence(
+        report_id=report_id,
+        blob_path=filepath,
+        evidence_type=evidence_type
+    )
+    db.add(evidence)
+    db.commit()
+    return filepath
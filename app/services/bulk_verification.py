@@ -0,0 +1,180 @@
+"""
+Bulk SOP execution verification (POST /execute/bulk).
+
+The body is NDJSON: one /execute payload per line. Lines are grouped into
+chunks and fanned out across a spawned process pool running the compiled
+enforcement engine; each worker parses, verifies and serializes its chunk,
+so the event loop only splits lines and forwards bytes. Results stream back
+as NDJSON in input order, followed by one summary line with throughput.
+
+In-flight chunks are bounded, so a long upload is read only as fast as the
+workers keep up (backpressure) instead of being buffered in memory.
+"""
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures.process import BrokenProcessPool
+from typing import AsyncIterator, Dict, List, Tuple
+
+from app.core.config import ENFORCEMENT_CHUNK_SIZE, ENFORCEMENT_WORKERS
+from app.enforcement.engine import find_violations
+from app.services.process_pool import SpawnPool
+
+logger = logging.getLogger("procguard.bulk_verification")
+
+
+def _invalid(index: int, error: str) -> Dict:
+    return {"index": index, "status": "INVALID", "error": error}
+
+
+def verify_payload(index: int, line: bytes) -> Tuple[Dict, int]:
+    """Verifies one NDJSON line. Returns (result, number of execution events)."""
+    try:
+        payload = json.loads(line)
+    except ValueError as e:
+        return _invalid(index, f"Invalid JSON: {e}"), 0
+    if not isinstance(payload, dict):
+        return _invalid(index, "Payload must be a JSON object"), 0
+
+    sop = payload.get("procedure")
+    execution = payload.get("execution")
+    roles = payload.get("roles")
+    if not sop or not execution or not roles:
+        return _invalid(index, "Missing required fields"), 0
+
+    collect_all = bool(payload.get("collect_all", False))
+    try:
+        violations = find_violations(sop["steps"], execution, roles, collect_all=collect_all)
+    except (KeyError, TypeError, AttributeError) as e:
+        return _invalid(index, f"Malformed payload: {e!r}"), 0
+
+    result = {
+        "index": index,
+        "status": "VIOLATED" if violations else "SUCCESS",
+        "violation": violations[0] if violations else None,
+    }
+    if payload.get("batch_id") is not None:
+        result["batch_id"] = payload["batch_id"]
+    if collect_all:
+        result["violations"] = violations
+    return result, len(execution)
+
+
+def verify_chunk(start_index: int, lines: List[bytes]) -> Tuple[bytes, Dict[str, int]]:
+    """
+    Worker task: verifies a chunk of NDJSON lines and returns them already
+    serialized, with per-status counts for the summary.
+    """
+    out = []
+    counts = {"SUCCESS": 0, "VIOLATED": 0, "INVALID": 0, "events": 0}
+    for offset, line in enumerate(lines):
+        result, events = verify_payload(start_index + offset, line)
+        counts[result["status"]] += 1
+        counts["events"] += events
+        out.append(json.dumps(result))
+    return ("\n".join(out) + "\n").encode("utf-8"), counts
+
+
+async def _iter_lines(body: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    buffer = b""
+    async for data in body:
+        buffer += data
+        if b"\n" not in buffer:
+            continue
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line
+    if buffer:
+        yield buffer
+
+
+class BulkVerifier:
+    def __init__(self, workers: int = ENFORCEMENT_WORKERS, chunk_size: int = ENFORCEMENT_CHUNK_SIZE):
+        self.lock = threading.Lock()
+        self.workers = workers
+        self.chunk_size = max(1, chunk_size)
+        self.max_in_flight = max(2, workers * 2) # chunks submitted but not yet streamed back
+        self.pool = SpawnPool("bulk-verify", workers)
+
+    async def stream(self, body: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        """Verifies an NDJSON byte stream; yields NDJSON results in input order, then a summary line."""
+        loop = asyncio.get_running_loop()
+        pool = self.pool.get()
+        pending: deque = deque()
+        totals = {"SUCCESS": 0, "VIOLATED": 0, "INVALID": 0, "events": 0}
+        started = time.perf_counter()
+
+        def submit(start_index: int, lines: List[bytes]) -> None:
+            if pool is None:
+                # Inline mode: still off the event loop
+                pending.append(loop.run_in_executor(None, verify_chunk, start_index, lines))
+            else:
+                pending.append(asyncio.wrap_future(pool.submit(verify_chunk, start_index, lines)))
+
+        async def collect() -> bytes:
+            data, counts = await pending.popleft()
+            for key, value in counts.items():
+                totals[key] += value
+            return data
+
+        index = 0
+        chunk: List[bytes] = []
+        try:
+            async for line in _iter_lines(body):
+                if not line.strip():
+                    continue
+                chunk.append(line)
+                if len(chunk) < self.chunk_size:
+                    continue
+                submit(index, chunk)
+                index += len(chunk)
+                chunk = []
+                # Stream finished chunks as soon as the head of the queue is done; block when saturated
+                while pending and (pending[0].done() or len(pending) >= self.max_in_flight):
+                    yield await collect()
+            if chunk:
+                submit(index, chunk)
+                index += len(chunk)
+            while pending:
+                yield await collect()
+        except BrokenProcessPool:
+            logger.error("Bulk verification pool broken, restarting")
+            self.pool.reset(pool)
+            streamed = totals["SUCCESS"] + totals["VIOLATED"] + totals["INVALID"]
+            yield (json.dumps({"error": "Verification worker crashed", "payloads": streamed}) + "\n").encode("utf-8")
+            return
+        finally:
+            # Client went away or a worker failed: drop queued work
+            for future in pending:
+                future.cancel()
+
+        elapsed = time.perf_counter() - started
+        verified = totals["SUCCESS"] + totals["VIOLATED"] + totals["INVALID"]
+        summary = {
+            "summary": {
+                "payloads": verified,
+                "success": totals["SUCCESS"],
+                "violated": totals["VIOLATED"],
+                "invalid": totals["INVALID"],
+                "events": totals["events"],
+                "workers": self.workers if pool is not None else 0,
+                "elapsed_s": round(elapsed, 3),
+                "payloads_per_s": round(verified / elapsed, 1) if elapsed else None,
+                "events_per_s": round(totals["events"] / elapsed, 1) if elapsed else None,
+            }
+        }
+        yield (json.dumps(summary) + "\n").encode("utf-8")
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {"workers": self.workers, "chunk_size": self.chunk_size, "pool_started": self.pool.started}
+
+    def shutdown(self) -> None:
+        self.pool.shutdown()
+
+
+# Global instance
+bulk_verifier = BulkVerifier()
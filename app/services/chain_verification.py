@@ -0,0 +1,159 @@
+"""
+Bulk chain-of-custody verification (quarterly audit).
+
+Violations are streamed in keyset chunks; each chunk costs three set-based
+queries (violations, their OPA decisions, their audit rows) instead of three
+round trips per violation. Hash recomputation is CPU-bound and runs in a
+process pool (inline when already inside an export worker process).
+
+A verification run is an export job (kind "chain_verification", see
+app/services/export_jobs.py): its state, progress and summary are persisted
+on the export_jobs row and the per-violation CSV report is its downloadable
+result, so claiming, recovery, queue bound and retention are the export
+subsystem's.
+"""
+import csv
+import logging
+from concurrent.futures import FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Callable, Iterator, List, Optional
+
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from app.core.config import CHAIN_VERIFY_CHUNK_SIZE, CHAIN_VERIFY_WORKERS
+from app.core.custody import CustodyRow, verify_custody_rows
+from app.models.audit import AuditLog
+from app.models.opa_audit import OPAAuditLog
+from app.models.violation import Violation
+from app.services.process_pool import SpawnPool
+
+logger = logging.getLogger("procguard.chain_verification")
+
+REPORT_FIELDS = ["violation_id", "opa", "violation", "audit", "chain_integrity"]
+
+
+class VerificationFilters(BaseModel):
+    status: Optional[str] = None
+    rule: Optional[str] = None
+    detected_from: Optional[datetime] = None
+    detected_to: Optional[datetime] = None
+
+
+def apply_filters(query, filters: VerificationFilters):
+    if filters.status:
+        query = query.filter(Violation.status == filters.status)
+    if filters.rule:
+        query = query.filter(Violation.rule == filters.rule)
+    if filters.detected_from:
+        query = query.filter(Violation.detected_at >= filters.detected_from)
+    if filters.detected_to:
+        query = query.filter(Violation.detected_at < filters.detected_to)
+    return query
+
+
+def iter_custody_chunks(db: Session, filters: VerificationFilters, chunk_size: int) -> Iterator[List[CustodyRow]]:
+    """
+    Streams (violation, OPA, audit) hash material in keyset chunks of violation ids.
+    """
+    last_id = None
+    while True:
+        query = apply_filters(db.query(
+            Violation.id, Violation.payload, Violation.violation_hash, Violation.opa_decision_hash
+        ), filters)
+        if last_id is not None:
+            query = query.filter(Violation.id > last_id)
+
+        violations = query.order_by(Violation.id).limit(chunk_size).all()
+        if not violations:
+            return
+        last_id = violations[-1].id
+
+        # One query per related table for the whole chunk; first row wins (as in /chain)
+        decision_hashes = {v.opa_decision_hash for v in violations if v.opa_decision_hash}
+        opa_by_hash = {}
+        if decision_hashes:
+            for decision_hash, payload in db.query(OPAAuditLog.decision_hash, OPAAuditLog.payload)\
+                    .filter(OPAAuditLog.decision_hash.in_(decision_hashes))\
+                    .order_by(OPAAuditLog.timestamp, OPAAuditLog.id):
+                opa_by_hash.setdefault(decision_hash, (payload, decision_hash))
+
+        audit_by_violation = {}
+        for violation_id, payload, audit_hash in db.query(AuditLog.violation_id, AuditLog.payload, AuditLog.audit_hash)\
+                .filter(AuditLog.violation_id.in_([v.id for v in violations]))\
+                .order_by(AuditLog.created_at):
+            audit_by_violation.setdefault(violation_id, (payload, audit_hash))
+
+        yield [
+            (
+                str(v.id),
+                *opa_by_hash.get(v.opa_decision_hash, (None, None)),
+                v.payload,
+                v.violation_hash,
+                *audit_by_violation.get(v.id, (None, None)),
+            )
+            for v in violations
+        ]
+
+
+def _tally(summary: dict, results: List[dict]) -> None:
+    for result in results:
+        summary["processed"] += 1
+        summary["intact" if result["chain_integrity"] == "intact" else "broken"] += 1
+        for link in ("opa", "violation", "audit"):
+            counts = summary["breakdown"].setdefault(link, {})
+            counts[result[link]] = counts.get(result[link], 0) + 1
+
+
+def write_chain_verification_report(db: Session, filters: VerificationFilters, output_path: str,
+                                    progress: Callable[[int, str], None],
+                                    chunk_size: int = CHAIN_VERIFY_CHUNK_SIZE) -> dict:
+    """
+    Verifies every violation matching the filters, writing one CSV row per violation.
+    Returns the summary persisted as the job result: total, processed, intact, broken and
+    breakdown ({"opa": {"valid": n, "missing": n, ...}, ...}).
+    """
+    total = apply_filters(db.query(Violation), filters).count()
+    summary = {"total": total, "processed": 0, "intact": 0, "broken": 0, "breakdown": {}}
+
+    with open(output_path, "w", newline="") as report:
+        writer = csv.DictWriter(report, fieldnames=REPORT_FIELDS)
+        writer.writeheader()
+
+        def consume(results: List[dict]):
+            writer.writerows(results)
+            _tally(summary, results)
+            progress(min(99, summary["processed"] * 100 // max(total, 1)), "verifying")
+
+        chunks = iter_custody_chunks(db, filters, chunk_size)
+        pool = chain_verify_pool.get()
+        if pool is None:
+            for chunk in chunks:
+                consume(verify_custody_rows(chunk))
+            return summary
+
+        pending = set()
+        try:
+            for chunk in chunks:
+                pending.add(pool.submit(verify_custody_rows, chunk))
+                # Bound in-flight chunks so memory stays flat on 50k+ violations
+                if len(pending) >= chain_verify_pool.workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        consume(future.result())
+            for future in pending:
+                consume(future.result())
+        except BrokenProcessPool:
+            logger.error("Chain verification pool broken, restarting")
+            chain_verify_pool.reset(pool)
+            raise
+        finally:
+            # Failed job: do not leave its chunks queued on the shared pool
+            for future in pending:
+                future.cancel()
+    return summary
+
+
+# Global instance (long-lived, shared by all verification jobs)
+chain_verify_pool = SpawnPool("chain-verify", CHAIN_VERIFY_WORKERS)
@@ -1,5 +1,6 @@
 from app.enforcement.engine import run_enforcement
 from app.enforcement.approval_gate import can_batch_progress
+from app.enforcement.incremental import enforce_events
 from app.core.audit import write_audit_log
 from sqlalchemy.orm import Session
 import logging
@@ -57,6 +58,36 @@ def process_execution(db: Session, batch_id: str, execution_events: list, actor_
         # Lock batch state to PENDING_APPROVAL
         return {"status": "BLOCKED", "violation": violation}
 
+    return _gate_progress(db, batch_id, actor_id)
+
+def process_execution_events(db: Session, batch_id: str, new_events: list, actor_id: str, complete: bool = False):
+    """
+    Incremental variant of process_execution: only the NEW events are checked,
+    against the batch's persisted enforcement automaton.
+    """
+    sop = load_sop_for_batch(batch_id)
+    role_map = load_role_map(sop["id"])
+
+    # 1. Advance the batch automaton (O(1) per event)
+    result = enforce_events(
+        db,
+        batch_id,
+        sop_steps=sop["steps"],
+        role_map=role_map,
+        events=new_events,
+        complete=complete
+    )
+
+    if result.violations:
+        violation = result.violations[0]
+        record_violation(db, batch_id, violation)
+        return {"status": "BLOCKED", "violation": violation, "violations": result.violations, "state": result.state}
+
+    response = _gate_progress(db, batch_id, actor_id)
+    response["state"] = result.state
+    return response
+
+def _gate_progress(db: Session, batch_id: str, actor_id: str):
     # 2. Check Approval Gate (Hard Enforcement)
     if not can_batch_progress(db, batch_id):
         logger.info(f"Progress BLOCKED for Batch {batch_id}: Approval Required")
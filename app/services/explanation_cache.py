@@ -0,0 +1,260 @@
+"""
+Persistent cache for NON-AUTHORITATIVE AI violation explanations.
+
+An explanation depends only on (violation code, prompt version, model), so
+once generated it can be served forever. The model is the backend that
+actually answered: StubAIClient output is keyed under STUB_MODEL, never under
+AI_EXPLAINER_MODEL. Lookup order:
+
+  1. in-process LRU (app.core.cache.LRUCache)     ~microseconds
+  2. ai_explanations table, shared by all workers  one PK lookup
+  3. the chat completion API                       only on a true miss
+
+Concurrent misses for the same key are coalesced (single-flight): one
+caller generates, the others wait for its result instead of each calling
+the model. Failures are never cached; the next request retries.
+
+Request handlers never wait for the model: request() answers from memory or
+schedules generation on a small bounded thread pool and reports PENDING;
+clients poll status() (GET /explanations/{code}). Each model call carries a
+timeout, and when too many codes are queued new ones are shed (UNAVAILABLE).
+"""
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.ai.client import get_ai_client
+from app.ai.stub_client import STUB_MODEL, StubAIClient
+from app.ai.violation_explainer import EXPLAINER_PROMPT_VERSION, explain_violation
+from app.core.cache import LRUCache
+from app.core.config import AI_EXPLAINER_MODEL, AI_EXPLANATION_CACHE_SIZE, AI_MAX_PENDING, AI_TIMEOUT_SECONDS, AI_WORKERS
+from app.models.ai_explanation import AIExplanation
+
+logger = logging.getLogger("procguard.explanation_cache")
+
+# explanation_status values
+READY = "READY"
+PENDING = "PENDING"
+FAILED = "FAILED"
+UNAVAILABLE = "UNAVAILABLE" # no AI client configured, or generation queue full
+NOT_REQUESTED = "NOT_REQUESTED"
+
+
+class ExplanationKey(NamedTuple):
+    code: str
+    prompt_version: str
+    model: str
+
+
+def _default_session_factory() -> Session:
+    # Lazy: keep the import cheap for callers that never touch the DB
+    from app.core.database import SessionLocal
+    return SessionLocal()
+
+
+class ExplanationCache:
+    def __init__(
+        self,
+        maxsize: int = AI_EXPLANATION_CACHE_SIZE,
+        session_factory: Optional[Callable[[], Session]] = _default_session_factory,
+        client=None,
+        model: str = AI_EXPLAINER_MODEL,
+        workers: int = AI_WORKERS,
+        max_pending: int = AI_MAX_PENDING,
+        timeout: float = AI_TIMEOUT_SECONDS,
+    ):
+        self.lock = threading.Lock()
+        self.memory = LRUCache(maxsize=maxsize)
+        self.session_factory = session_factory # None = in-memory only
+        self.client = client # None = get_ai_client()
+        self.model = model
+        self.timeout = timeout # per model call
+        self.in_flight: Dict[ExplanationKey, Future] = {}
+        self.db_hits = 0
+        self.generated = 0
+        self.coalesced = 0
+
+        self.workers = max(1, workers)
+        self.max_pending = max_pending
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.scheduled: Dict[ExplanationKey, Future] = {} # background generations, by key
+        self.failures: Dict[ExplanationKey, str] = {} # last error per key, cleared on retry
+        self.shed = 0
+
+    def key(self, code: str, client=None) -> ExplanationKey:
+        client = client or self.client or get_ai_client()
+        model = STUB_MODEL if isinstance(client, StubAIClient) else self.model
+        return ExplanationKey(code, EXPLAINER_PROMPT_VERSION, model)
+
+    def explain(self, code: str) -> str:
+        client = self.client or get_ai_client()
+        if client is None:
+            # AI not configured: placeholder text, never cached
+            return explain_violation(code, client=None, model=self.model)
+
+        key = self.key(code, client)
+        cached = self.memory.get(key)
+        if cached is not None:
+            return cached
+
+        with self.lock:
+            future = self.in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self.in_flight[key] = Future()
+            else:
+                self.coalesced += 1
+        if not leader:
+            return future.result()
+
+        try:
+            explanation = self._load_or_generate(key, client)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(explanation)
+        finally:
+            with self.lock:
+                self.in_flight.pop(key, None)
+        return explanation
+
+    def _load_or_generate(self, key: ExplanationKey, client) -> str:
+        stored = self._load(key)
+        if stored is not None:
+            with self.lock:
+                self.db_hits += 1
+            self.memory.put(key, stored)
+            return stored
+
+        explanation = explain_violation(key.code, client=client, model=self.model, timeout=self.timeout)
+        with self.lock:
+            self.generated += 1
+        # Memory first: waiting callers and the next request are served even if persisting fails
+        self.memory.put(key, explanation)
+        self._store(key, explanation)
+        return explanation
+
+    def _load(self, key: ExplanationKey) -> Optional[str]:
+        if self.session_factory is None:
+            return None
+        db = self.session_factory()
+        try:
+            row = db.get(AIExplanation, tuple(key))
+            return row.explanation if row is not None else None
+        except SQLAlchemyError as e:
+            logger.warning(f"Explanation cache lookup failed for {key.code}: {e}")
+            return None
+        finally:
+            db.close()
+
+    def _store(self, key: ExplanationKey, explanation: str) -> None:
+        if self.session_factory is None:
+            return
+        db = self.session_factory()
+        try:
+            db.add(AIExplanation(
+                code=key.code,
+                prompt_version=key.prompt_version,
+                model=key.model,
+                explanation=explanation,
+                created_at=datetime.now(timezone.utc),
+            ))
+            db.commit()
+        except IntegrityError:
+            # Another worker stored it first; same key, equivalent text
+            db.rollback()
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.warning(f"Explanation cache store failed for {key.code}: {e}")
+        finally:
+            db.close()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Caller holds self.lock
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="ai-explainer")
+        return self.executor
+
+    def request(self, code: str) -> Tuple[str, Optional[str]]:
+        """
+        Non-blocking: (status, explanation). READY with the text if cached in
+        memory; otherwise generation is scheduled in the background (PENDING).
+        """
+        client = self.client or get_ai_client()
+        if client is None:
+            return UNAVAILABLE, None
+
+        key = self.key(code, client)
+        cached = self.memory.get(key)
+        if cached is not None:
+            return READY, cached
+
+        with self.lock:
+            if key in self.scheduled:
+                return PENDING, None
+            if len(self.scheduled) >= self.max_pending:
+                self.shed += 1
+                return UNAVAILABLE, None
+            self.failures.pop(key, None)
+            self.scheduled[key] = self._get_executor().submit(self._generate, key)
+        return PENDING, None
+
+    def _generate(self, key: ExplanationKey) -> None:
+        try:
+            self.explain(key.code)
+        except Exception as e:
+            logger.warning(f"Explanation for {key.code} failed: {e!r}")
+            with self.lock:
+                self.failures[key] = f"{type(e).__name__}: {e}"
+        finally:
+            with self.lock:
+                self.scheduled.pop(key, None)
+
+    def status(self, code: str) -> Tuple[str, Optional[str]]:
+        """Follow-up lookup: (status, explanation or error). May read the DB, never calls the model."""
+        key = self.key(code)
+        cached = self.memory.get(key)
+        if cached is not None:
+            return READY, cached
+        with self.lock:
+            if key in self.scheduled:
+                return PENDING, None
+            if key in self.failures:
+                return FAILED, self.failures[key]
+        # Generated by another worker process
+        stored = self._load(key)
+        if stored is not None:
+            self.memory.put(key, stored)
+            return READY, stored
+        return NOT_REQUESTED, None
+
+    def stats(self) -> dict:
+        memory = self.memory.stats()
+        with self.lock:
+            return {
+                **memory,
+                "db_hits": self.db_hits,
+                "generated": self.generated,
+                "coalesced": self.coalesced,
+                "in_flight": len(self.in_flight),
+                "scheduled": len(self.scheduled),
+                "failed": len(self.failures),
+                "shed": self.shed,
+                "workers": self.workers,
+            }
+
+    def shutdown(self) -> None:
+        with self.lock:
+            executor, self.executor = self.executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Global instance
+explanation_cache = ExplanationCache()
@@ -0,0 +1,450 @@
+"""
+Background export jobs (timeline PDFs, forensic emails, filter audit PDFs,
+compliance bundles, chain-of-custody verification reports).
+
+The synchronous endpoints verify, render and upload/send inside the request.
+Here the request only inserts an export_jobs row and returns its id; the work
+runs on a bounded process pool (spawn), each worker
+opening its own session. Job state, progress and the result location are
+persisted on the row, so any API worker can answer status/download polls.
+Results are kept for EXPORT_RESULT_TTL_SECONDS, then purged.
+
+Jobs outlive the process that queued them only as rows: at startup PENDING
+jobs are re-submitted (a worker claims a row atomically, so a job queued by
+several API workers still runs once), and RUNNING jobs older than
+EXPORT_JOB_STALE_SECONDS are marked FAILED. The same sweep, plus retention,
+runs on submit at most every EXPORT_JOB_SWEEP_SECONDS.
+"""
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Set
+
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from app.core.config import (
+    EXPORT_JOB_MAX_QUEUED, EXPORT_JOB_STALE_SECONDS, EXPORT_JOB_SWEEP_SECONDS, EXPORT_JOB_WORKERS,
+    EXPORT_RESULT_DIR, EXPORT_RESULT_TTL_SECONDS
+)
+from app.models.export_job import ExportJob
+from app.services.chain_verification import VerificationFilters
+from app.services.process_pool import SpawnPool
+
+logger = logging.getLogger("procguard.export_jobs")
+
+
+class ExportQueueFull(RuntimeError):
+    pass
+
+
+# ============================================================
+# JOB PARAMETERS (validated at submit, stored as JSON)
+# ============================================================
+
+class TimelinePdfParams(BaseModel):
+    batch_id: uuid.UUID
+
+
+class BatchEmailParams(BaseModel):
+    batch_id: uuid.UUID
+    to: List[str]
+    subject: str
+    message: Optional[str] = None
+    attachments: Dict[str, bool] = {}
+
+
+class FilterAuditPdfParams(BaseModel):
+    screen: str
+    from_ts: datetime
+    to_ts: datetime
+    violation_id: Optional[uuid.UUID] = None
+
+
+class ComplianceFilterTrailParams(BaseModel):
+    report_id: uuid.UUID
+    screen: str
+    from_ts: datetime
+    to_ts: datetime
+    evidence_type: str
+
+
+class ChainVerificationParams(BaseModel):
+    filters: VerificationFilters = VerificationFilters()
+
+
+# ============================================================
+# HANDLERS (run inside the worker process)
+# ============================================================
+# Each handler gets (db, job, params, output_path, progress) and returns the
+# columns to persist on completion: result, and optionally result_path /
+# result_filename / media_type for a downloadable artifact.
+
+def _export_timeline_pdf(db: Session, job: ExportJob, params: TimelinePdfParams, output_path: str, progress):
+    from app.core.audit import write_audit_log
+    from app.services.pdf import write_authoritative_timeline_pdf
+
+    progress(10, "rendering")
+    if not write_authoritative_timeline_pdf(db, params.batch_id, output_path):
+        raise LookupError("Batch artifact not found")
+
+    progress(90, "auditing")
+    write_audit_log(
+        db=db,
+        action="EXPORT_PDF",
+        batch_id=params.batch_id,
+        actor=job.requested_by,
+        metadata={"format": "pdf", "scope": "full_audit_trail", "export_job_id": str(job.id)}
+    )
+    return {
+        "result": {"batch_id": str(params.batch_id)},
+        "result_path": output_path,
+        "result_filename": f"batch_{params.batch_id}_audit_trail.pdf",
+        "media_type": "application/pdf",
+    }
+
+
+def _send_batch_email(db: Session, job: ExportJob, params: BatchEmailParams, output_path: str, progress):
+    from app.core.audit import write_audit_log
+    from app.services.mailer import mailer
+    from app.models.batch import Batch
+    from app.services.pdf import generate_authoritative_timeline_pdf
+
+    if not db.query(Batch).filter(Batch.batch_id == params.batch_id).first():
+        raise LookupError("Batch artifact not found")
+
+    email_attachments = []
+    if params.attachments.get("timeline_pdf"):
+        progress(10, "rendering")
+        pdf_bytes = generate_authoritative_timeline_pdf(db, params.batch_id)
+        if pdf_bytes:
+            email_attachments.append((f"batch_{params.batch_id}_timeline.pdf", pdf_bytes))
+
+    progress(60, "sending")
+    # Synchronous (pooled, with retries): the job's status must reflect delivery
+    refused = mailer.deliver(
+        to=params.to,
+        subject=params.subject,
+        body=params.message or "",
+        attachments=email_attachments
+    )
+
+    progress(90, "auditing")
+    write_audit_log(
+        db=db,
+        action="EMAIL_SENT",
+        batch_id=params.batch_id,
+        actor=job.requested_by,
+        metadata={
+            "recipients": params.to,
+            "subject": params.subject,
+            "attachment_types": [k for k, v in params.attachments.items() if v],
+            "refused": sorted(refused),
+            "export_job_id": str(job.id)
+        }
+    )
+    return {"result": {"recipients": params.to, "refused": sorted(refused)}}
+
+
+def _export_filter_audit_pdf(db: Session, job: ExportJob, params: FilterAuditPdfParams, output_path: str, progress):
+    from app.services.audit_service import generate_filter_audit_report
+
+    progress(10, "verifying")
+    pdf_content, error_or_url = generate_filter_audit_report(
+        db, params.screen, params.from_ts, params.to_ts, params.violation_id
+    )
+    if not pdf_content:
+        raise ValueError(error_or_url)
+
+    with open(output_path, "wb") as f:
+        f.write(pdf_content)
+    return {
+        "result": {"blob_url": error_or_url},
+        "result_path": output_path,
+        "result_filename": f"filter_audit_{params.screen}.pdf",
+        "media_type": "application/pdf",
+    }
+
+
+def _attach_compliance_filter_trail(db: Session, job: ExportJob, params: ComplianceFilterTrailParams, output_path: str, progress):
+    from app.services.audit_service import attach_filter_trail
+
+    progress(10, "verifying")
+    # The evidence file belongs to the compliance report: it is never a retention-managed result
+    evidence_path = attach_filter_trail(
+        db, params.report_id, params.screen, params.from_ts, params.to_ts, params.evidence_type
+    )
+    return {"result": {"report_id": str(params.report_id), "evidence_path": evidence_path}}
+
+
+def _verify_custody_chain(db: Session, job: ExportJob, params: ChainVerificationParams, output_path: str, progress):
+    from app.services.chain_verification import write_chain_verification_report
+
+    progress(0, "verifying")
+    summary = write_chain_verification_report(db, params.filters, output_path, progress)
+    return {
+        "result": summary,
+        "result_path": output_path,
+        "result_filename": f"chain_verification_{job.id}.csv",
+        "media_type": "text/csv",
+    }
+
+
+EXPORT_KINDS = {
+    "timeline_pdf": (TimelinePdfParams, _export_timeline_pdf),
+    "batch_email": (BatchEmailParams, _send_batch_email),
+    "filter_audit_pdf": (FilterAuditPdfParams, _export_filter_audit_pdf),
+    "compliance_filter_trail": (ComplianceFilterTrailParams, _attach_compliance_filter_trail),
+    "chain_verification": (ChainVerificationParams, _verify_custody_chain),
+}
+
+
+def _session_factory(session_factory: Optional[Callable[[], Session]]) -> Callable[[], Session]:
+    if session_factory is not None:
+        return session_factory
+    # Worker process: own engine/pool from DATABASE_URL
+    from app.core.database import SessionLocal
+    return SessionLocal
+
+
+def execute_export_job(job_id: uuid.UUID, session_factory: Optional[Callable[[], Session]] = None,
+                       result_dir: str = EXPORT_RESULT_DIR, ttl_seconds: int = EXPORT_RESULT_TTL_SECONDS) -> str:
+    """
+    Runs one export job to completion and persists its final state. Returns the final status.
+    Module-level so it can be shipped to a spawned worker process.
+    """
+    factory = _session_factory(session_factory)
+
+    def progress(percent: int, stage: str):
+        # Separate short transaction: progress is visible while the handler's work is uncommitted
+        with factory() as status_db:
+            status_db.query(ExportJob).filter(ExportJob.id == job_id)\
+                .update({ExportJob.progress: percent, ExportJob.stage: stage}, synchronize_session=False)
+            status_db.commit()
+
+    db = factory()
+    try:
+        # Atomic claim: the same job may have been queued by more than one API worker
+        claimed = db.query(ExportJob)\
+            .filter(ExportJob.id == job_id, ExportJob.status == "PENDING")\
+            .update({ExportJob.status: "RUNNING", ExportJob.started_at: datetime.now(timezone.utc)},
+                    synchronize_session=False)
+        db.commit()
+        job = db.query(ExportJob).filter(ExportJob.id == job_id).first()
+        if not claimed:
+            return job.status if job else "MISSING"
+
+        params_model, handler = EXPORT_KINDS[job.kind]
+        os.makedirs(result_dir, exist_ok=True)
+        output_path = os.path.join(result_dir, f"{job_id}.out")
+        try:
+            outcome = handler(db, job, params_model.model_validate(job.params), output_path, progress)
+        except Exception as e:
+            logger.warning(f"Export job {job_id} ({job.kind}) failed: {e}")
+            db.rollback()
+            if os.path.exists(output_path):
+                os.remove(output_path)
+            final = {"status": "FAILED", "error": str(e)}
+        else:
+            final = {"status": "COMPLETED", "progress": 100, "stage": None, **outcome}
+
+        final["finished_at"] = datetime.now(timezone.utc)
+        final["expires_at"] = final["finished_at"] + timedelta(seconds=ttl_seconds)
+        # Conditional, like the claim: the stale sweep may have failed this job meanwhile
+        written = db.query(ExportJob)\
+            .filter(ExportJob.id == job_id, ExportJob.status == "RUNNING")\
+            .update(final, synchronize_session=False)
+        db.commit()
+        if not written:
+            logger.warning(f"Export job {job_id} ({job.kind}) was finalised elsewhere; dropping its result")
+            if os.path.exists(output_path):
+                os.remove(output_path)
+            status = db.query(ExportJob.status).filter(ExportJob.id == job_id).scalar()
+            return status or "MISSING"
+        return final["status"]
+    finally:
+        db.close()
+
+
+def purge_expired_export_jobs(db: Session, result_dir: str = EXPORT_RESULT_DIR) -> int:
+    """Retention: removes expired job rows and their result files."""
+    expired = db.query(ExportJob.id, ExportJob.result_path)\
+        .filter(ExportJob.expires_at <= datetime.now(timezone.utc)).all()
+    root = os.path.realpath(result_dir)
+    for _, result_path in expired:
+        # Only files this subsystem owns (never compliance evidence)
+        if result_path and os.path.realpath(result_path).startswith(root + os.sep) and os.path.exists(result_path):
+            os.remove(result_path)
+    if expired:
+        db.query(ExportJob).filter(ExportJob.id.in_([job_id for job_id, _ in expired]))\
+            .delete(synchronize_session=False)
+    db.commit()
+    return len(expired)
+
+
+def fail_stale_export_jobs(db: Session, stale_seconds: int = EXPORT_JOB_STALE_SECONDS,
+                           ttl_seconds: int = EXPORT_RESULT_TTL_SECONDS) -> int:
+    """RUNNING jobs whose worker died without persisting a final state."""
+    now = datetime.now(timezone.utc)
+    failed = db.query(ExportJob)\
+        .filter(ExportJob.status == "RUNNING", ExportJob.started_at <= now - timedelta(seconds=stale_seconds))\
+        .update({
+            ExportJob.status: "FAILED",
+            ExportJob.error: "Interrupted: the export worker stopped before finishing",
+            ExportJob.finished_at: now,
+            ExportJob.expires_at: now + timedelta(seconds=ttl_seconds),
+        }, synchronize_session=False)
+    db.commit()
+    return failed
+
+
+class ExportJobRunner:
+    def __init__(self, workers: int = EXPORT_JOB_WORKERS, max_queued: int = EXPORT_JOB_MAX_QUEUED,
+                 result_dir: str = EXPORT_RESULT_DIR, ttl_seconds: int = EXPORT_RESULT_TTL_SECONDS,
+                 stale_seconds: int = EXPORT_JOB_STALE_SECONDS, sweep_interval: float = EXPORT_JOB_SWEEP_SECONDS):
+        self.lock = threading.Lock()
+        self.workers = workers
+        self.max_queued = max_queued
+        self.result_dir = result_dir
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.sweep_interval = sweep_interval
+        self.swept_at: Optional[float] = None # monotonic
+
+        self.pool = SpawnPool("export", workers)
+        self.in_flight: Set[uuid.UUID] = set()
+
+    def submit(self, db: Session, kind: str, params: dict, requested_by: str,
+               session_factory: Optional[Callable[[], Session]] = None, background: bool = True) -> ExportJob:
+        """
+        Validates and persists a job, then schedules it.
+        Raises ValueError (unknown kind / invalid params) or ExportQueueFull.
+        """
+        if kind not in EXPORT_KINDS:
+            raise ValueError(f"Unknown export kind: {kind}")
+        params_model, _ = EXPORT_KINDS[kind]
+        params = params_model.model_validate(params).model_dump(mode="json")
+
+        try:
+            self.sweep(db)
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Export job sweep failed (non-fatal): {e}")
+
+        with self.lock:
+            if len(self.in_flight) >= self.max_queued:
+                raise ExportQueueFull("Export queue is full, retry later")
+
+        now = datetime.now(timezone.utc)
+        job = ExportJob(
+            id=uuid.uuid4(),
+            kind=kind,
+            status="PENDING",
+            requested_by=requested_by,
+            params=params,
+            progress=0,
+            created_at=now,
+            expires_at=now + timedelta(seconds=self.ttl_seconds),
+        )
+        db.add(job)
+        db.commit()
+
+        if not background:
+            execute_export_job(job.id, session_factory, self.result_dir, self.ttl_seconds)
+        else:
+            self._schedule(job.id, session_factory)
+        db.refresh(job)
+        return job
+
+    def sweep(self, db: Session, force: bool = False) -> None:
+        """Retention purge + stale RUNNING jobs, at most every sweep_interval seconds."""
+        with self.lock:
+            now = time.monotonic()
+            if not force and self.swept_at is not None and now - self.swept_at < self.sweep_interval:
+                return
+            self.swept_at = now
+        purge_expired_export_jobs(db, self.result_dir)
+        fail_stale_export_jobs(db, self.stale_seconds, self.ttl_seconds)
+
+    def recover(self, db: Session, session_factory: Optional[Callable[[], Session]] = None) -> int:
+        """
+        Startup: sweeps, then re-submits PENDING jobs left behind by a stopped process
+        (up to the free queue capacity; the rest wait for the next start). Returns the count.
+        """
+        self.sweep(db, force=True)
+        with self.lock:
+            capacity = self.max_queued - len(self.in_flight)
+        if capacity <= 0:
+            return 0
+        pending = db.query(ExportJob.id)\
+            .filter(ExportJob.status == "PENDING")\
+            .order_by(ExportJob.created_at)\
+            .limit(capacity)\
+            .all()
+        for (job_id,) in pending:
+            self._schedule(job_id, session_factory)
+        return len(pending)
+
+    def _schedule(self, job_id: uuid.UUID, session_factory: Optional[Callable[[], Session]]) -> None:
+        with self.lock:
+            self.in_flight.add(job_id)
+        pool = self.pool.get()
+
+        if pool is None:
+            thread = threading.Thread(
+                target=self._run_in_process, args=(job_id, session_factory),
+                name=f"export-{job_id}", daemon=True
+            )
+            thread.start()
+            return
+
+        future = pool.submit(execute_export_job, job_id, None, self.result_dir, self.ttl_seconds)
+        def done(f):
+            error = None if f.cancelled() else f.exception()
+            if isinstance(error, BrokenProcessPool):
+                self.pool.reset(pool)
+            self._finished(job_id, session_factory, error)
+
+        future.add_done_callback(done)
+
+    def _run_in_process(self, job_id: uuid.UUID, session_factory: Optional[Callable[[], Session]]) -> None:
+        error = None
+        try:
+            execute_export_job(job_id, session_factory, self.result_dir, self.ttl_seconds)
+        except Exception as e:
+            error = e
+        self._finished(job_id, session_factory, error)
+
+    def _finished(self, job_id: uuid.UUID, session_factory: Optional[Callable[[], Session]],
+                  error: Optional[BaseException]) -> None:
+        with self.lock:
+            self.in_flight.discard(job_id)
+        if error is None:
+            return
+        # The worker died before persisting a final state (e.g. BrokenProcessPool)
+        logger.error(f"Export job {job_id} crashed: {error}")
+        try:
+            with _session_factory(session_factory)() as db:
+                finished_at = datetime.now(timezone.utc)
+                db.query(ExportJob)\
+                    .filter(ExportJob.id == job_id, ExportJob.status.in_(["PENDING", "RUNNING"]))\
+                    .update({
+                        ExportJob.status: "FAILED",
+                        ExportJob.error: str(error) or type(error).__name__,
+                        ExportJob.finished_at: finished_at,
+                        ExportJob.expires_at: finished_at + timedelta(seconds=self.ttl_seconds),
+                    }, synchronize_session=False)
+                db.commit()
+        except Exception:
+            logger.exception(f"Could not record failure of export job {job_id}")
+
+    def shutdown(self) -> None:
+        self.pool.shutdown()
+
+
+# Global instance
+export_jobs = ExportJobRunner()
@@ -0,0 +1,384 @@
+"""
+Outbound mail service (single implementation for the whole app).
+
+  * SMTPConnectionPool keeps authenticated connections open, so the
+    connect / STARTTLS / login handshake is paid once per connection,
+    not once per email.
+  * Mailer.enqueue() returns immediately; worker threads drain an outbound
+    queue and retry transient failures (4xx, dropped connections) with
+    exponential backoff. Mailer.deliver() sends synchronously through the
+    same pool (used by background export jobs that must report delivery).
+  * A multi-recipient artifact is rendered to MIME once and sent in one SMTP
+    transaction per MAIL_BATCH_RECIPIENTS recipients.
+
+Without SMTP_HOST/SMTP_SERVER and credentials, messages are logged instead
+of sent (the previous MOCK EMAIL behaviour).
+"""
+import heapq
+import itertools
+import logging
+import smtplib
+import socket
+import threading
+import time
+import uuid
+from collections import deque
+from email.message import EmailMessage
+from typing import Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from app.core.config import (
+    MAIL_BATCH_RECIPIENTS, MAIL_MAX_ATTEMPTS, MAIL_POOL_SIZE, MAIL_QUEUE_SIZE,
+    MAIL_RETRY_BASE_SECONDS, MAIL_WORKERS, SMTP_FROM, SMTP_HOST, SMTP_PASSWORD, SMTP_PORT,
+    SMTP_STARTTLS, SMTP_USER
+)
+
+logger = logging.getLogger("procguard.mailer")
+
+# Reused connections idle longer than this are probed with NOOP before use
+IDLE_PROBE_SECONDS = 30.0
+
+
+class MailQueueFull(RuntimeError):
+    pass
+
+
+class SMTPSettings(NamedTuple):
+    host: Optional[str] = SMTP_HOST
+    port: int = SMTP_PORT
+    user: Optional[str] = SMTP_USER
+    password: Optional[str] = SMTP_PASSWORD
+    starttls: bool = SMTP_STARTTLS
+    sender: str = SMTP_FROM
+    timeout: float = 10.0
+
+    @property
+    def configured(self) -> bool:
+        # An explicit relay (e.g. the local sink) needs no credentials; the default relay does
+        return bool(self.host) or bool(self.user and self.password)
+
+
+class OutboundEmail(NamedTuple):
+    id: str
+    to: Tuple[str, ...]
+    subject: str
+    body: str
+    attachments: Tuple[Tuple[str, bytes], ...] = ()
+
+
+def build_message(email: OutboundEmail, sender: str) -> EmailMessage:
+    msg = EmailMessage()
+    msg["From"] = sender
+    msg["To"] = ", ".join(email.to)
+    msg["Subject"] = email.subject
+    msg["Message-ID"] = f"<{email.id}@procguard>"
+    msg.set_content(email.body)
+    for filename, content in email.attachments:
+        maintype, subtype = ("application", "pdf") if filename.endswith(".pdf") else ("application", "octet-stream")
+        msg.add_attachment(content, maintype=maintype, subtype=subtype, filename=filename)
+    return msg
+
+
+def is_transient(error: BaseException) -> bool:
+    """4xx replies and network failures are retried; 5xx replies are permanent."""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(400 <= code < 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    return isinstance(error, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, socket.error, TimeoutError))
+
+
+class SMTPConnectionPool:
+    def __init__(self, settings: SMTPSettings, size: int = MAIL_POOL_SIZE):
+        self.lock = threading.Lock()
+        self.settings = settings
+        self.size = size
+        self.idle: List[Tuple[smtplib.SMTP, float]] = [] # (connection, last used)
+        self.opened = 0
+
+    def _connect(self) -> smtplib.SMTP:
+        s = self.settings
+        conn = smtplib.SMTP(s.host or "smtp.gmail.com", s.port, timeout=s.timeout)
+        conn.ehlo()
+        if s.starttls:
+            conn.starttls()
+            conn.ehlo()
+        if s.user and s.password:
+            conn.login(s.user, s.password)
+        with self.lock:
+            self.opened += 1
+        return conn
+
+    def acquire(self) -> Tuple[smtplib.SMTP, bool]:
+        """Returns (connection, reused)."""
+        while True:
+            with self.lock:
+                if not self.idle:
+                    break
+                conn, last_used = self.idle.pop()
+            if time.monotonic() - last_used < IDLE_PROBE_SECONDS:
+                return conn, True
+            try:
+                if conn.noop()[0] == 250:
+                    return conn, True
+            except smtplib.SMTPException:
+                pass
+            self._close(conn)
+        return self._connect(), False
+
+    def release(self, conn: smtplib.SMTP, broken: bool = False) -> None:
+        if not broken:
+            with self.lock:
+                if len(self.idle) < self.size:
+                    self.idle.append((conn, time.monotonic()))
+                    return
+        self._close(conn)
+
+    @staticmethod
+    def _close(conn: smtplib.SMTP) -> None:
+        try:
+            conn.quit()
+        except Exception:
+            conn.close()
+
+    def close_all(self) -> None:
+        with self.lock:
+            idle, self.idle = self.idle, []
+        for conn, _ in idle:
+            self._close(conn)
+
+
+class _QueuedEmail:
+    __slots__ = ("email", "attempts", "batches_done", "refused", "on_delivered", "on_failed")
+
+    def __init__(self, email: OutboundEmail, on_delivered, on_failed):
+        self.email = email
+        self.attempts = 0
+        self.batches_done: Set[int] = set()
+        self.refused: Dict[str, tuple] = {}
+        self.on_delivered = on_delivered
+        self.on_failed = on_failed
+
+
+class Mailer:
+    def __init__(self, settings: Optional[SMTPSettings] = None, workers: int = MAIL_WORKERS,
+                 pool_size: int = MAIL_POOL_SIZE, max_attempts: int = MAIL_MAX_ATTEMPTS,
+                 retry_base_seconds: float = MAIL_RETRY_BASE_SECONDS, queue_size: int = MAIL_QUEUE_SIZE,
+                 batch_recipients: int = MAIL_BATCH_RECIPIENTS):
+        self.settings = settings or SMTPSettings()
+        self.pool = SMTPConnectionPool(self.settings, pool_size)
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.queue_size = queue_size
+        self.batch_recipients = batch_recipients
+
+        self.lock = threading.Lock()
+        self.cond = threading.Condition(self.lock)
+        self.ready: deque = deque()
+        self.delayed: List[Tuple[float, int, _QueuedEmail]] = [] # (due, seq, item) heap
+        self._seq = itertools.count()
+        self.in_flight = 0
+        self.threads: List[threading.Thread] = []
+        self.stopping = False
+
+        self.counters: Dict[str, int] = {"queued": 0, "sent": 0, "retried": 0, "failed": 0, "transactions": 0}
+
+    # ------------------------------------------------------------
+    # Sending
+    # ------------------------------------------------------------
+
+    def _send_once(self, email: OutboundEmail, batches_done: Set[int], refused: Dict[str, tuple]) -> Dict[str, tuple]:
+        """
+        One attempt: remaining recipient batches over one pooled connection.
+        batches_done / refused carry over between attempts, so a retry never re-sends
+        to a batch the relay already accepted. Returns refused recipients.
+        """
+        if not self.settings.configured:
+            logger.warning("SMTP not configured. LACKING REAL EMAIL CAPABILITY.")
+            logger.info(f"MOCK EMAIL SENT TO {list(email.to)}: {email.subject}")
+            return {}
+
+        # Render MIME once for every recipient batch
+        data = build_message(email, self.settings.sender).as_bytes()
+        batches = [email.to[i:i + self.batch_recipients] for i in range(0, len(email.to), self.batch_recipients)]
+
+        conn, reused = self.pool.acquire()
+        broken = False
+        try:
+            for index, recipients in enumerate(batches):
+                if index in batches_done:
+                    continue
+                try:
+                    refused.update(conn.sendmail(self.settings.sender, list(recipients), data))
+                except smtplib.SMTPRecipientsRefused as e:
+                    # Whole batch refused: permanent refusals are recorded, transient ones retried
+                    if is_transient(e):
+                        raise
+                    refused.update(e.recipients)
+                except smtplib.SMTPServerDisconnected:
+                    if not reused:
+                        raise
+                    # Stale pooled connection: reconnect once without spending an attempt
+                    self.pool._close(conn)
+                    conn, reused = self.pool._connect(), False
+                    refused.update(conn.sendmail(self.settings.sender, list(recipients), data))
+                batches_done.add(index)
+                with self.lock:
+                    self.counters["transactions"] += 1
+        except Exception as e:
+            broken = not isinstance(e, smtplib.SMTPRecipientsRefused)
+            raise
+        finally:
+            self.pool.release(conn, broken=broken)
+        if len(refused) >= len(set(email.to)):
+            raise smtplib.SMTPRecipientsRefused(refused)
+        return refused
+
+    def deliver(self, to: List[str], subject: str, body: str,
+                attachments: Optional[List[Tuple[str, bytes]]] = None) -> Dict[str, tuple]:
+        """
+        Synchronous delivery through the pool, with the same retry/backoff as the queue.
+        Returns refused recipients; raises RuntimeError once attempts are exhausted.
+        """
+        email = self._outbound(to, subject, body, attachments)
+        batches_done: Set[int] = set()
+        refused: Dict[str, tuple] = {}
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                self._send_once(email, batches_done, refused)
+            except Exception as e:
+                if attempt >= self.max_attempts or not is_transient(e):
+                    with self.lock:
+                        self.counters["failed"] += 1
+                    logger.error(f"Failed to send email {email.id}: {e}")
+                    raise RuntimeError(f"Email service unavailable: {e}")
+                with self.lock:
+                    self.counters["retried"] += 1
+                time.sleep(self._backoff(attempt))
+                continue
+            with self.lock:
+                self.counters["sent"] += 1
+            return refused
+
+    def enqueue(self, to: List[str], subject: str, body: str,
+                attachments: Optional[List[Tuple[str, bytes]]] = None,
+                on_delivered: Optional[Callable[[OutboundEmail, Dict[str, tuple]], None]] = None,
+                on_failed: Optional[Callable[[OutboundEmail, str], None]] = None) -> OutboundEmail:
+        """
+        Queues an email and returns at once. on_delivered(email, refused) / on_failed(email, error)
+        run on a mailer thread after the final outcome. Raises MailQueueFull when saturated.
+        """
+        email = self._outbound(to, subject, body, attachments)
+        item = _QueuedEmail(email, on_delivered, on_failed)
+        with self.cond:
+            if self.in_flight >= self.queue_size:
+                raise MailQueueFull("Outbound mail queue is full, retry later")
+            self._ensure_workers()
+            self.in_flight += 1
+            self.counters["queued"] += 1
+            self.ready.append(item)
+            self.cond.notify()
+        return email
+
+    @staticmethod
+    def _outbound(to, subject, body, attachments) -> OutboundEmail:
+        return OutboundEmail(
+            id=str(uuid.uuid4()), to=tuple(to), subject=subject, body=body or "",
+            attachments=tuple(attachments or ())
+        )
+
+    def _backoff(self, attempt: int) -> float:
+        return self.retry_base_seconds * (2 ** (attempt - 1))
+
+    # ------------------------------------------------------------
+    # Queue workers
+    # ------------------------------------------------------------
+
+    def _ensure_workers(self) -> None:
+        # Called with self.lock held
+        self.threads = [t for t in self.threads if t.is_alive()]
+        while len(self.threads) < max(self.workers, 1):
+            thread = threading.Thread(target=self._work, name=f"mailer-{len(self.threads)}", daemon=True)
+            self.threads.append(thread)
+            thread.start()
+
+    def _next(self) -> Optional[_QueuedEmail]:
+        with self.cond:
+            while True:
+                now = time.monotonic()
+                while self.delayed and self.delayed[0][0] <= now:
+                    self.ready.append(heapq.heappop(self.delayed)[2])
+                if self.ready:
+                    return self.ready.popleft()
+                if self.stopping:
+                    return None
+                self.cond.wait(self.delayed[0][0] - now if self.delayed else None)
+
+    def _work(self) -> None:
+        while True:
+            item = self._next()
+            if item is None:
+                return
+            item.attempts += 1
+            try:
+                refused = self._send_once(item.email, item.batches_done, item.refused)
+            except Exception as e:
+                if item.attempts < self.max_attempts and is_transient(e) and not self.stopping:
+                    with self.cond:
+                        self.counters["retried"] += 1
+                        heapq.heappush(self.delayed, (time.monotonic() + self._backoff(item.attempts), next(self._seq), item))
+                        self.cond.notify()
+                    continue
+                logger.error(f"Giving up on email {item.email.id} after {item.attempts} attempt(s): {e}")
+                self._finish(item, "failed", item.on_failed, item.email, str(e))
+            else:
+                self._finish(item, "sent", item.on_delivered, item.email, refused)
+
+    def _finish(self, item: _QueuedEmail, counter: str, callback, *args) -> None:
+        # Callback first: flush() returning means outcomes (e.g. audit rows) are recorded
+        if callback is not None:
+            try:
+                callback(*args)
+            except Exception:
+                logger.exception(f"Mailer callback failed for email {item.email.id}")
+        with self.cond:
+            self.counters[counter] += 1
+            self.in_flight -= 1
+            self.cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Blocks until every queued email reached a final outcome. Returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.cond:
+            while self.in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self.cond.wait(remaining)
+        return True
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                **self.counters,
+                "pending": self.in_flight,
+                "connections_opened": self.pool.opened,
+                "connections_idle": len(self.pool.idle),
+            }
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Drains the queue (retries are abandoned), then closes pooled connections."""
+        with self.cond:
+            self.stopping = True
+            self.ready.extend(item for _, _, item in self.delayed)
+            self.delayed.clear()
+            self.cond.notify_all()
+        for thread in self.threads:
+            thread.join(timeout)
+        self.pool.close_all()
+
+
+# Global instance
+mailer = Mailer()
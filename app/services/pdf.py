@@ -1,37 +1,138 @@
+import os
+import tempfile
+
 from reportlab.lib.pagesizes import A4
 from reportlab.pdfgen import canvas
 from io import BytesIO
 from datetime import datetime
+from typing import NamedTuple, Optional
+
+# Bump when render_violation_chain_pdf output changes: cached artifacts are keyed on it
+VIOLATION_PDF_TEMPLATE_VERSION = "1"
+
+# Audit rows fetched per round trip when streaming a timeline (~ rows per PDF page)
+TIMELINE_PDF_PAGE_ROWS = 70
+
+class TimelineHeader(NamedTuple):
+    batch_id: str
+    procedure_id: str
+    procedure_version: int
+    stages: tuple = () # Simplified for the forensic cert
+
+
+class TimelineRow(NamedTuple):
+    timestamp: Optional[datetime]
+    actor: Optional[str]
+    action: str
+    result: str
+    expected_state: Optional[str]
+    actual_state: Optional[str]
+
 
-def generate_authoritative_timeline_pdf(db, batch_id):
+class ViolationChainRow(NamedTuple):
+    violation_id: str
+    rule: str
+    detected_at: datetime
+    batch_id: str
+    sop_name: Optional[str]
+    opa_decision_hash: Optional[str]
+    violation_hash: Optional[str]
+    audit_hash: Optional[str]
+
+
+def violation_chain_row(violation, audit_log=None) -> ViolationChainRow:
+    return ViolationChainRow(
+        str(violation.id), violation.rule, violation.detected_at, str(violation.batch_id),
+        violation.sop.name if violation.sop else None,
+        violation.opa_decision_hash, violation.violation_hash,
+        audit_log.audit_hash if audit_log else None,
+    )
+
+
+def _load_timeline(db, batch_id):
     """
-    Authoritative PDF Generator (Step 4).
-    Fetches required data and renders the forensic document.
+    Batch header + a lazily streamed iterator of TimelineRow tuples.
+    Rows come through a server-side cursor TIMELINE_PDF_PAGE_ROWS at a time.
     """
     from app.models.batch import Batch
     from app.models.audit import AuditLog
     
     batch = db.query(Batch).filter(Batch.batch_id == batch_id).first()
     if not batch:
-        return None
+        return None, None
         
-    logs = db.query(AuditLog).filter(AuditLog.batch_id == batch_id).order_by(AuditLog.timestamp.desc()).all()
+    rows = db.query(
+            AuditLog.timestamp, AuditLog.actor, AuditLog.action, AuditLog.result,
+            AuditLog.expected_state, AuditLog.actual_state
+        )\
+        .filter(AuditLog.batch_id == batch_id)\
+        .order_by(AuditLog.timestamp.desc())\
+        .execution_options(stream_results=True)\
+        .yield_per(TIMELINE_PDF_PAGE_ROWS)
     
-    # Create a simple container for the renderer that matches expected interface
-    class TimelineData:
-        batch_id = str(batch.batch_id)
-        procedure_id = str(batch.procedure_id)
-        procedure_version = batch.procedure_version
-        stages = [] # Simplified for the forensic cert
-        
-    return render_timeline_pdf(TimelineData(), logs)
+    header = TimelineHeader(str(batch.batch_id), str(batch.procedure_id), batch.procedure_version)
+    return header, (TimelineRow(*row) for row in rows)
 
-def render_timeline_pdf(timeline_data, audit_logs):
+def generate_authoritative_timeline_pdf(db, batch_id) -> Optional[bytes]:
+    """
+    Authoritative PDF Generator (Step 4), for callers that need the PDF as bytes (email attachments).
+    Rows are streamed onto a temp file by write_authoritative_timeline_pdf, so the audit trail is
+    never materialized as a list; only the finished (compressed) PDF is read back.
+    """
+    fd, path = tempfile.mkstemp(prefix=f"timeline_{batch_id}_", suffix=".pdf")
+    os.close(fd)
+    try:
+        if not write_authoritative_timeline_pdf(db, batch_id, path):
+            return None
+        with open(path, "rb") as f:
+            return f.read()
+    finally:
+        os.remove(path)
+
+def write_authoritative_timeline_pdf(db, batch_id, path) -> bool:
+    """
+    Streaming variant of generate_authoritative_timeline_pdf: renders straight to a file
+    (the PDF never exists as one in-memory bytes object). Returns False if the batch is unknown.
+    Renders in the calling process; request handlers go through render_batch_timeline_pdf.
+    """
+    header, rows = _load_timeline(db, batch_id)
+    if header is None:
+        return False
+    render_timeline_pdf(header, rows, output=path)
+    return True
+
+def write_batch_timeline_pdf_file(batch_id) -> Optional[str]:
+    """
+    Render pool task: opens its own session, streams the batch's audit trail into a temp
+    file and returns its path (the caller removes it), or None if the batch is unknown.
+    """
+    from app.core.database import SessionLocal
+
+    fd, path = tempfile.mkstemp(prefix=f"timeline_{batch_id}_", suffix=".pdf")
+    os.close(fd)
+    found = False
+    try:
+        with SessionLocal() as db:
+            found = write_authoritative_timeline_pdf(db, batch_id, path)
+    finally:
+        if not found:
+            os.remove(path)
+    return path if found else None
+
+def render_batch_timeline_pdf(batch_id) -> Optional[str]:
+    """Full timeline PDF rendered on the shared render pool, off the request thread."""
+    from app.services.renderer import pdf_renderer
+
+    return pdf_renderer.render("timeline_full", write_batch_timeline_pdf_file, batch_id)
+
+def render_timeline_pdf(timeline_data, audit_logs, output=None):
     """
     Deterministic (Phase 2): Render authoritative PDF artifact.
+    timeline_data is a TimelineHeader; audit_logs any iterable of TimelineRow (consumed once, page by page).
+    With output (path or binary file), writes there and returns None; otherwise returns bytes.
     """
-    buffer = BytesIO()
-    c = canvas.Canvas(buffer, pagesize=A4)
+    buffer = BytesIO() if output is None else None
+    c = canvas.Canvas(buffer if output is None else output, pagesize=A4, pageCompression=1)
     width, height = A4
 
     # Header
@@ -88,15 +189,14 @@ def render_timeline_pdf(timeline_data, audit_logs):
     y -= 12
     c.setFont("Helvetica", 8)
     for log in audit_logs:
-        log_ts = log.timestamp if hasattr(log, 'timestamp') else getattr(log, 'created_at', None)
-        ts_str = log_ts.strftime('%Y-%m-%d %H:%M:%S') if log_ts else "N/A"
+        ts_str = log.timestamp.strftime('%Y-%m-%d %H:%M:%S') if log.timestamp else "N/A"
         c.drawString(40, y, ts_str)
         c.drawString(180, y, str(log.actor or "SYSTEM")[:15])
         c.drawString(250, y, str(log.action)[:20])
         c.drawString(350, y, str(log.result))
         
         state_info = "—"
-        if hasattr(log, 'expected_state') and log.expected_state and log.actual_state:
+        if log.expected_state and log.actual_state:
             state_info = f"{log.expected_state} -> {log.actual_state}"
         c.drawString(420, y, state_info)
         
@@ -108,9 +208,9 @@ def render_timeline_pdf(timeline_data, audit_logs):
     c.showPage()
     c.save()
 
-    return buffer.getvalue()
+    return buffer.getvalue() if buffer is not None else None
 
-def render_violation_chain_pdf(violation, opa_log=None, audit_log=None):
+def render_violation_chain_pdf(violation: ViolationChainRow):
     """
     Forensic Verification PDF (Step 5).
     Embeds the cryptographic chain of custody hashes directly in the document.
@@ -124,7 +224,7 @@ def render_violation_chain_pdf(violation, opa_log=None, audit_log=None):
     c.drawString(40, height - 60, "FORENSIC VIOLATION RECORD")
     
     c.setFont("Helvetica", 10)
-    c.drawString(40, height - 80, f"Violation ID: {violation.id}")
+    c.drawString(40, height - 80, f"Violation ID: {violation.violation_id}")
     c.drawString(40, height - 95, f"Rule Violated: {violation.rule}")
     c.drawString(40, height - 110, f"Detected At: {violation.detected_at.isoformat()}")
     c.drawString(40, height - 125, f"Batch ID: {violation.batch_id}")
@@ -136,7 +236,7 @@ def render_violation_chain_pdf(violation, opa_log=None, audit_log=None):
     y = height - 180
     c.drawString(40, y, f"This breach was detected during an automated FSM transition check.")
     y -= 15
-    c.drawString(40, y, f"The system enforced the following SOP: {violation.sop.name if violation.sop else 'None'}")
+    c.drawString(40, y, f"The system enforced the following SOP: {violation.sop_name or 'None'}")
 
     # Section: Evidence Verification Block (Step 5)
     y = 200
@@ -151,7 +251,7 @@ def render_violation_chain_pdf(violation, opa_log=None, audit_log=None):
     y -= 15
     c.drawString(40, y, f"Violation Hash:       {violation.violation_hash or 'N/A'}")
     y -= 15
-    c.drawString(40, y, f"Audit Entry Hash:     {audit_log.audit_hash if audit_log else 'N/A'}")
+    c.drawString(40, y, f"Audit Entry Hash:     {violation.audit_hash or 'N/A'}")
     
     y -= 25
     c.setFont("Helvetica-Bold", 9)
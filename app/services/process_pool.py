@@ -0,0 +1,49 @@
+"""
+Lazily started process pools for CPU-bound work (PDF rendering, export jobs,
+bulk and chain-of-custody verification).
+
+Every pool uses the spawn start method: forking a threaded server process is
+unsafe. Work submitted to them must be module-level functions with picklable
+arguments. A pool whose worker died (OOM, segfault) is dropped by reset() and
+the next get() starts a fresh one.
+"""
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+
+class SpawnPool:
+    def __init__(self, name: str, workers: int):
+        self.lock = threading.Lock()
+        self.name = name
+        self.workers = workers
+        self.pool: Optional[ProcessPoolExecutor] = None
+
+    def get(self) -> Optional[ProcessPoolExecutor]:
+        """The pool, started on first use; None = run inline (no workers, or already in a worker process)."""
+        if self.workers <= 0 or multiprocessing.parent_process() is not None:
+            return None
+        with self.lock:
+            if self.pool is None:
+                self.pool = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self.pool
+
+    def reset(self, pool: Optional[ProcessPoolExecutor]) -> None:
+        """Drops a broken pool (only if it is still the current one)."""
+        with self.lock:
+            if pool is not None and self.pool is pool:
+                self.pool = None
+
+    @property
+    def started(self) -> bool:
+        with self.lock:
+            return self.pool is not None
+
+    def shutdown(self) -> None:
+        with self.lock:
+            pool, self.pool = self.pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
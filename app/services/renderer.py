@@ -0,0 +1,109 @@
+"""
+Shared process pool for reportlab rendering.
+
+reportlab is pure Python and CPU-bound: rendered on FastAPI's sync threadpool
+it holds the GIL and stalls every other request in the worker. Render
+functions here are module-level and take plain row tuples (never ORM
+objects), so they can be shipped to a spawned worker process. Latency is
+split into queueing (submit -> worker start) and rendering, per kind.
+"""
+import logging
+import threading
+import time
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Optional
+
+from app.core.config import RENDER_WORKERS
+from app.services.process_pool import SpawnPool
+
+logger = logging.getLogger("procguard.renderer")
+
+
+def _timed_render(fn: Callable, submitted_at: float, *args):
+    started_at = time.time()
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return result, started_at - submitted_at, time.perf_counter() - t0
+
+
+class RenderMetrics:
+    __slots__ = ("count", "errors", "queue_total", "queue_max", "render_total", "render_max")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.queue_total = 0.0
+        self.queue_max = 0.0
+        self.render_total = 0.0
+        self.render_max = 0.0
+
+    def as_dict(self) -> dict:
+        n = self.count or 1
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "queue_ms_avg": round(self.queue_total / n * 1000, 2),
+            "queue_ms_max": round(self.queue_max * 1000, 2),
+            "render_ms_avg": round(self.render_total / n * 1000, 2),
+            "render_ms_max": round(self.render_max * 1000, 2),
+        }
+
+
+class PDFRenderer:
+    def __init__(self, workers: int = RENDER_WORKERS):
+        self.lock = threading.Lock()
+        self.workers = workers
+        # Inside a worker process (export job) the pool is None: render inline
+        self.pool = SpawnPool("render", workers)
+        self.metrics: Dict[str, RenderMetrics] = {}
+
+    def render(self, kind: str, fn: Callable, *args):
+        """
+        Runs fn(*args) on the render pool and returns its result (PDF bytes).
+        fn must be module-level and args picklable.
+        """
+        pool = self.pool.get()
+        submitted_at = time.time()
+        try:
+            if pool is None:
+                result, queued, rendered = _timed_render(fn, submitted_at, *args)
+            else:
+                result, queued, rendered = pool.submit(_timed_render, fn, submitted_at, *args).result()
+        except BrokenProcessPool:
+            # A worker died (OOM, segfault): drop the pool so the next render starts a fresh one
+            logger.error(f"Render pool broken while rendering {kind}, restarting")
+            self.pool.reset(pool)
+            self._record(kind, None, None)
+            raise
+        except Exception:
+            self._record(kind, None, None)
+            raise
+        self._record(kind, max(queued, 0.0), rendered)
+        return result
+
+    def _record(self, kind: str, queued: Optional[float], rendered: Optional[float]) -> None:
+        with self.lock:
+            metrics = self.metrics.setdefault(kind, RenderMetrics())
+            if queued is None:
+                metrics.errors += 1
+                return
+            metrics.count += 1
+            metrics.queue_total += queued
+            metrics.queue_max = max(metrics.queue_max, queued)
+            metrics.render_total += rendered
+            metrics.render_max = max(metrics.render_max, rendered)
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "workers": self.workers,
+                "pool_started": self.pool.started,
+                "kinds": {kind: m.as_dict() for kind, m in self.metrics.items()},
+            }
+
+    def shutdown(self) -> None:
+        self.pool.shutdown()
+
+
+# Global instance
+pdf_renderer = PDFRenderer()
@@ -0,0 +1,134 @@
+"""
+In-process SMTP sink for tests and benchmarks.
+
+A minimal RFC 5321 server (EHLO/HELO, MAIL, RCPT, DATA, RSET, NOOP, QUIT)
+on a background thread. Accepted messages are kept in memory; nothing is
+relayed. handshake_delay simulates the connect/greeting cost of a real
+relay so benchmarks can show what connection reuse saves.
+
+    with SMTPSink() as sink:
+        mailer = Mailer(SMTPSettings(host=sink.host, port=sink.port, starttls=False))
+        ...
+        sink.messages[0].rcpt_to
+"""
+import email
+import socketserver
+import threading
+import time
+from email.message import Message
+from typing import List, NamedTuple, Optional
+
+
+class ReceivedMessage(NamedTuple):
+    mail_from: str
+    rcpt_to: List[str]
+    data: bytes
+
+    @property
+    def message(self) -> Message:
+        return email.message_from_bytes(self.data)
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line: str) -> None:
+        self.wfile.write((line + "\r\n").encode("ascii"))
+        self.wfile.flush()
+
+    def handle(self):
+        sink: "SMTPSink" = self.server.sink
+        sink._connected()
+        if sink.handshake_delay:
+            time.sleep(sink.handshake_delay)
+        self.reply("220 procguard-sink ESMTP")
+
+        mail_from, rcpt_to = None, []
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode("utf-8", "replace").rstrip("\r\n")
+            verb = command[:4].upper()
+
+            if verb == "EHLO":
+                self.wfile.write(b"250-procguard-sink\r\n250-8BITMIME\r\n250 SIZE 52428800\r\n")
+                self.wfile.flush()
+            elif verb == "HELO":
+                self.reply("250 procguard-sink")
+            elif verb == "MAIL":
+                mail_from, rcpt_to = command.split(":", 1)[1].strip().split(" ")[0].strip("<>"), []
+                self.reply("250 OK")
+            elif verb == "RCPT":
+                address = command.split(":", 1)[1].strip().strip("<>")
+                if address in sink.reject:
+                    self.reply("550 Mailbox unavailable")
+                elif address in sink.defer:
+                    self.reply("451 Try again later")
+                else:
+                    rcpt_to.append(address)
+                    self.reply("250 OK")
+            elif verb == "DATA":
+                if mail_from is None or not rcpt_to:
+                    self.reply("503 Bad sequence of commands")
+                    continue
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                chunks = []
+                while True:
+                    data_line = self.rfile.readline()
+                    if not data_line or data_line == b".\r\n":
+                        break
+                    chunks.append(data_line[1:] if data_line.startswith(b"..") else data_line)
+                sink._received(ReceivedMessage(mail_from, rcpt_to, b"".join(chunks)))
+                mail_from, rcpt_to = None, []
+                self.reply("250 OK queued")
+            elif verb == "RSET":
+                mail_from, rcpt_to = None, []
+                self.reply("250 OK")
+            elif verb == "NOOP":
+                self.reply("250 OK")
+            elif verb == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+
+class _ThreadingSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class SMTPSink:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, handshake_delay: float = 0.0):
+        self.lock = threading.Lock()
+        self.handshake_delay = handshake_delay
+        self.reject: set = set() # recipient addresses answered with 550 (permanent)
+        self.defer: set = set() # recipient addresses answered with 451 (transient)
+        self.messages: List[ReceivedMessage] = []
+        self.connections = 0
+        self._server = _ThreadingSMTPServer((host, port), _SMTPHandler)
+        self._server.sink = self
+        self.host, self.port = self._server.server_address[:2]
+        self._thread: Optional[threading.Thread] = None
+
+    def _connected(self) -> None:
+        with self.lock:
+            self.connections += 1
+
+    def _received(self, message: ReceivedMessage) -> None:
+        with self.lock:
+            self.messages.append(message)
+
+    def start(self) -> "SMTPSink":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="smtp-sink", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "SMTPSink":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -0,0 +1,250 @@
+"""
+SOP document ingestion: chunked, concurrent, cached AI parsing.
+
+  1. The document is hashed (SHA-256 of its text, line endings normalized).
+     A document parsed before with the same prompt version and model is
+     served from the in-process LRU or the sop_parse_results table: no
+     model call at all. The model is the backend that answered:
+     StubAIClient parses are keyed under STUB_MODEL, never under
+     AI_SOP_PARSER_MODEL.
+  2. Otherwise it is split on paragraph/line boundaries into chunks of at
+     most SOP_CHUNK_CHARS (a step line is never cut in half) and the chunks
+     are parsed concurrently, at most SOP_PARSE_CONCURRENCY at a time across
+     all imports.
+  3. Chunk results are merged in document order and validated with
+     core.procedure_validation before being cached and returned.
+
+The output is NON-AUTHORITATIVE: it is a suggested step structure that a
+human (and the deterministic validators) still have to accept.
+"""
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, List, NamedTuple, Optional
+
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.ai.client import get_ai_client
+from app.ai.stub_client import STUB_MODEL, StubAIClient
+from app.ai.sop_parser import SOP_PARSER_PROMPT_VERSION, parse_sop_to_steps
+from app.core.cache import LRUCache
+from app.core.config import (
+    AI_SOP_PARSER_MODEL, AI_TIMEOUT_SECONDS,
+    SOP_CHUNK_CHARS, SOP_PARSE_CACHE_SIZE, SOP_PARSE_CONCURRENCY,
+)
+from app.core.procedure_validation import validate_procedure_structure
+from app.models.sop_parse_result import SOPParseResult
+
+logger = logging.getLogger("procguard.sop_ingestion")
+
+
+class ParsedSOPDocument(NamedTuple):
+    sha256: str
+    steps: List[dict]
+    chunks: int
+    cached: bool
+
+
+def normalize_document(text: str) -> str:
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def document_sha256(text: str) -> str:
+    return hashlib.sha256(normalize_document(text).encode("utf-8")).hexdigest()
+
+
+def split_sop_document(text: str, max_chars: int = SOP_CHUNK_CHARS) -> List[str]:
+    """
+    Packs paragraphs (blank-line separated) into chunks of at most max_chars.
+    An oversized paragraph is split between lines; only a single line longer
+    than max_chars is cut mid-line.
+    """
+    units: List[str] = []
+    for paragraph in normalize_document(text).split("\n\n"):
+        if not paragraph.strip():
+            continue
+        if len(paragraph) <= max_chars:
+            units.append(paragraph)
+            continue
+        for line in paragraph.split("\n"):
+            while len(line) > max_chars:
+                units.append(line[:max_chars])
+                line = line[max_chars:]
+            if line.strip():
+                units.append(line)
+
+    chunks: List[str] = []
+    current = ""
+    for unit in units:
+        candidate = f"{current}\n\n{unit}" if current else unit
+        if len(candidate) <= max_chars:
+            current = candidate
+        else:
+            chunks.append(current)
+            current = unit
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def merge_chunk_steps(parsed_chunks: List[dict]) -> List[dict]:
+    """Concatenates chunk results in document order and validates the whole procedure."""
+    steps = []
+    for parsed in parsed_chunks:
+        for step in parsed["steps"]:
+            if not isinstance(step, dict) or step.get("id") in (None, "") or not step.get("description"):
+                raise ValueError("Invalid SOP structure")
+            steps.append({
+                "id": str(step["id"]),
+                "description": str(step["description"]).strip(),
+                "role": step.get("role") or None,
+            })
+    # Duplicate ids across chunks mean the model (or the document) numbered steps twice
+    validate_procedure_structure({"steps": steps})
+    return steps
+
+
+def _default_session_factory() -> Session:
+    from app.core.database import SessionLocal
+    return SessionLocal()
+
+
+class SOPIngestionPipeline:
+    def __init__(
+        self,
+        client=None,
+        model: str = AI_SOP_PARSER_MODEL,
+        chunk_chars: int = SOP_CHUNK_CHARS,
+        concurrency: int = SOP_PARSE_CONCURRENCY,
+        cache_size: int = SOP_PARSE_CACHE_SIZE,
+        session_factory: Optional[Callable[[], Session]] = _default_session_factory,
+        timeout: float = AI_TIMEOUT_SECONDS,
+    ):
+        self.lock = threading.Lock()
+        self.client = client # None = get_ai_client()
+        self.model = model
+        self.chunk_chars = chunk_chars
+        self.concurrency = max(1, concurrency)
+        self.session_factory = session_factory # None = in-memory only
+        self.timeout = timeout
+        self.memory = LRUCache(maxsize=cache_size)
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.parsed_documents = 0
+        self.parsed_chunks = 0
+        self.db_hits = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self.lock:
+            if self.executor is None:
+                # Shared by all imports: bounds concurrent model calls process-wide
+                self.executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="sop-parser")
+            return self.executor
+
+    def key(self, sha256: str, client=None) -> tuple:
+        model = STUB_MODEL if isinstance(client, StubAIClient) else self.model
+        return (sha256, SOP_PARSER_PROMPT_VERSION, model)
+
+    def ingest(self, text: str) -> ParsedSOPDocument:
+        sha256 = document_sha256(text)
+        # No client configured: real-model parses stored earlier can still be served
+        client = self.client or get_ai_client()
+        key = self.key(sha256, client)
+
+        cached = self.memory.get(key)
+        if cached is not None:
+            return ParsedSOPDocument(sha256, cached[0], cached[1], True)
+
+        stored = self._load(key)
+        if stored is not None:
+            with self.lock:
+                self.db_hits += 1
+            self.memory.put(key, stored)
+            return ParsedSOPDocument(sha256, stored[0], stored[1], True)
+
+        if client is None:
+            raise RuntimeError("AI client is not configured")
+
+        chunks = split_sop_document(text, self.chunk_chars)
+        if not chunks:
+            raise ValueError("Procedure must contain steps")
+
+        executor = self._get_executor()
+        futures = [
+            executor.submit(parse_sop_to_steps, chunk, client=client, model=self.model, timeout=self.timeout)
+            for chunk in chunks
+        ]
+        try:
+            parsed_chunks = [future.result() for future in futures]
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+        steps = merge_chunk_steps(parsed_chunks)
+        with self.lock:
+            self.parsed_documents += 1
+            self.parsed_chunks += len(chunks)
+        self.memory.put(key, (steps, len(chunks)))
+        self._store(key, steps, len(chunks))
+        return ParsedSOPDocument(sha256, steps, len(chunks), False)
+
+    def _load(self, key) -> Optional[tuple]:
+        if self.session_factory is None:
+            return None
+        db = self.session_factory()
+        try:
+            row = db.get(SOPParseResult, key)
+            return (row.steps, row.chunks) if row is not None else None
+        except SQLAlchemyError as e:
+            logger.warning(f"SOP parse cache lookup failed: {e}")
+            return None
+        finally:
+            db.close()
+
+    def _store(self, key, steps: List[dict], chunks: int) -> None:
+        if self.session_factory is None:
+            return
+        sha256, prompt_version, model = key
+        db = self.session_factory()
+        try:
+            db.add(SOPParseResult(
+                document_sha256=sha256,
+                prompt_version=prompt_version,
+                model=model,
+                steps=steps,
+                chunks=chunks,
+                created_at=datetime.now(timezone.utc),
+            ))
+            db.commit()
+        except IntegrityError:
+            # Same document imported concurrently
+            db.rollback()
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.warning(f"SOP parse cache store failed: {e}")
+        finally:
+            db.close()
+
+    def stats(self) -> dict:
+        memory = self.memory.stats()
+        with self.lock:
+            return {
+                **memory,
+                "db_hits": self.db_hits,
+                "parsed_documents": self.parsed_documents,
+                "parsed_chunks": self.parsed_chunks,
+                "concurrency": self.concurrency,
+            }
+
+    def shutdown(self) -> None:
+        with self.lock:
+            executor, self.executor = self.executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Global instance
+sop_ingestion = SOPIngestionPipeline()
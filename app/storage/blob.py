@@ -1,36 +1,112 @@
+import hashlib
 import os
-import uuid
-from azure.storage.blob import BlobServiceClient
+import threading
+from typing import BinaryIO, NamedTuple, Optional
+
+from azure.core.exceptions import ResourceExistsError
+from azure.storage.blob import BlobServiceClient, ContentSettings
+
+CONTAINER_NAME = "evidence"
+CHUNK_SIZE = 4 * 1024 * 1024 # 4 MiB: Azure block size and read size for hashing
+
+_client_lock = threading.Lock()
+_clients = {} # connection string -> BlobServiceClient (thread-safe, pooled HTTP session)
+
+
+class StoredEvidence(NamedTuple):
+    url: str
+    sha256: str
+    size: int
+    deduplicated: bool # True if identical content was already stored
+
 
 # 🔹 THIS IS WHERE os.getenv IS USED
 def get_blob_client():
+    """
+    Shared BlobServiceClient per connection string. The SDK client is thread-safe and keeps
+    its HTTP connection pool, so uploads reuse TLS connections instead of reconnecting.
+    """
     conn_str = os.getenv("AZURE_BLOB_CONN") or os.getenv("azure-blob-conn")
     if not conn_str:
         return None
-    return BlobServiceClient.from_connection_string(conn_str)
+    with _client_lock:
+        client = _clients.get(conn_str)
+        if client is None:
+            client = _clients[conn_str] = BlobServiceClient.from_connection_string(conn_str)
+        return client
 
-def upload_evidence(file_bytes: bytes, filename: str, content_type: str) -> str:
-    """
-    Upload evidence to Azure Blob Storage.
-    Returns the blob URL.
-    """
+
+def _container():
     client = get_blob_client()
     if not client:
         # Fail gracefully if called without configuration
         raise RuntimeError("AZURE_BLOB_CONN environment variable is not set")
+    return client.get_container_client(CONTAINER_NAME)
 
-    container_name = "evidence"
-    blob_name = f"{uuid.uuid4()}-{filename}"
 
-    blob_client = client.get_blob_client(
-        container=container_name,
-        blob=blob_name
-    )
+def evidence_blob_name(sha256: str) -> str:
+    # Content-addressed: identical evidence maps to one blob
+    return f"sha256/{sha256[:2]}/{sha256}"
 
-    blob_client.upload_blob(
-        file_bytes,
-        overwrite=False,
-        content_type=content_type
-    )
 
-    return blob_client.url
\ No newline at end of file
+def hash_stream(stream: BinaryIO, chunk_size: int = CHUNK_SIZE) -> tuple[str, int]:
+    """Incremental SHA-256 of a seekable stream; rewinds it afterwards. Returns (hexdigest, size)."""
+    digest = hashlib.sha256()
+    size = 0
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        digest.update(chunk)
+        size += len(chunk)
+    stream.seek(0)
+    return digest.hexdigest(), size
+
+
+def store_evidence_stream(
+    stream: BinaryIO,
+    filename: str,
+    content_type: str,
+    sha256: Optional[str] = None,
+    size: Optional[int] = None,
+    container=None,
+) -> StoredEvidence:
+    """
+    Stores evidence under its SHA-256. The stream must be seekable; it is uploaded in
+    CHUNK_SIZE blocks and never read fully into memory. Pass sha256/size if the caller
+    already hashed the stream while receiving it.
+    """
+    if sha256 is None or size is None:
+        sha256, size = hash_stream(stream)
+
+    container = container or _container()
+    blob_client = container.get_blob_client(evidence_blob_name(sha256))
+    if blob_client.exists():
+        return StoredEvidence(blob_client.url, sha256, size, True)
+
+    try:
+        blob_client.upload_blob(
+            stream,
+            length=size,
+            overwrite=False,
+            content_settings=ContentSettings(content_type=content_type),
+            metadata={"sha256": sha256, "original_filename": filename or ""},
+            max_concurrency=2,
+        )
+    except ResourceExistsError:
+        # Same content uploaded concurrently by another request
+        return StoredEvidence(blob_client.url, sha256, size, True)
+    return StoredEvidence(blob_client.url, sha256, size, False)
+
+
+def upload_evidence(file_bytes: bytes, filename: str, content_type: str) -> str:
+    """
+    Upload evidence to Azure Blob Storage (content-addressed).
+    Returns the blob URL.
+    """
+    import io
+    stored = store_evidence_stream(
+        io.BytesIO(file_bytes), filename, content_type,
+        sha256=hashlib.sha256(file_bytes).hexdigest(), size=len(file_bytes)
+    )
+    return stored.url
@@ -0,0 +1,225 @@
+"""
+Pluggable, content-addressed evidence storage.
+
+Every artifact is addressed by its SHA-256. Two backends:
+
+  * LocalEvidenceStore: sharded directories (<root>/ab/cd/<digest>), writes
+    go to a temp file on the same filesystem and are published with an
+    atomic os.replace, so readers never see a partial file. Objects are
+    plain files: downloads go out as FileResponse (sendfile/pathsend
+    capable servers serve them zero-copy) and verification hashes them
+    through mmap.
+  * AzureEvidenceStore: the content-addressed blob container (app.storage.blob).
+
+EVIDENCE_STORE selects the backend ("local" / "azure"); by default Azure is
+used when AZURE_BLOB_CONN is set, the local store otherwise (offline runs).
+"""
+import hashlib
+import io
+import json
+import mmap
+import os
+import re
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from typing import BinaryIO, Iterator, NamedTuple, Optional
+
+from azure.core.exceptions import ResourceNotFoundError
+
+from app.core.config import EVIDENCE_LOCAL_DIR, EVIDENCE_STORE
+from app.storage import blob
+from app.storage.blob import CHUNK_SIZE, StoredEvidence, hash_stream
+
+DIGEST_RE = re.compile(r"\b([0-9a-f]{64})\b")
+
+
+def digest_from_ref(ref: str) -> Optional[str]:
+    """Extracts the SHA-256 from an evidence reference (digest, local path or blob URL)."""
+    match = DIGEST_RE.search(ref or "")
+    return match.group(1) if match else None
+
+
+class EvidenceObject(NamedTuple):
+    sha256: str
+    size: int
+    content_type: str
+    original_filename: str
+
+
+class EvidenceStore(ABC):
+    name: str
+
+    @abstractmethod
+    def put_stream(self, stream: BinaryIO, filename: str, content_type: str,
+                   sha256: Optional[str] = None, size: Optional[int] = None) -> StoredEvidence:
+        """Stores a readable stream under its SHA-256 (deduplicated)."""
+
+    def put_bytes(self, data: bytes, filename: str, content_type: str) -> StoredEvidence:
+        return self.put_stream(io.BytesIO(data), filename, content_type,
+                               sha256=hashlib.sha256(data).hexdigest(), size=len(data))
+
+    @abstractmethod
+    def exists(self, sha256: str) -> bool:
+        ...
+
+    @abstractmethod
+    def stat(self, sha256: str) -> Optional[EvidenceObject]:
+        ...
+
+    @abstractmethod
+    def iter_chunks(self, sha256: str) -> Iterator[bytes]:
+        ...
+
+    def local_path(self, sha256: str) -> Optional[str]:
+        """Filesystem path for zero-copy serving, if the backend has one."""
+        return None
+
+    def exists_ref(self, ref: str) -> bool:
+        digest = digest_from_ref(ref)
+        if digest:
+            return self.exists(digest)
+        # Legacy flat local paths (evidence/filters/...)
+        return os.path.exists(ref)
+
+
+class LocalEvidenceStore(EvidenceStore):
+    name = "local"
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+        self.tmp_dir = os.path.join(self.root, ".tmp")
+
+    def path(self, sha256: str) -> str:
+        return os.path.join(self.root, sha256[:2], sha256[2:4], sha256)
+
+    def _meta_path(self, sha256: str) -> str:
+        return self.path(sha256) + ".json"
+
+    def _atomic_write(self, target: str, write) -> None:
+        os.makedirs(self.tmp_dir, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.tmp_dir)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write(f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.replace(tmp, target)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    def put_stream(self, stream: BinaryIO, filename: str, content_type: str,
+                   sha256: Optional[str] = None, size: Optional[int] = None) -> StoredEvidence:
+        if sha256 is not None and self.exists(sha256):
+            return StoredEvidence(self.path(sha256), sha256, size or self.stat(sha256).size, True)
+
+        # Single pass: copy to a temp file while hashing, then publish under the digest
+        os.makedirs(self.tmp_dir, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.tmp_dir)
+        digest = hashlib.sha256()
+        written = 0
+        try:
+            with os.fdopen(fd, "wb") as f:
+                while chunk := stream.read(CHUNK_SIZE):
+                    digest.update(chunk)
+                    f.write(chunk)
+                    written += len(chunk)
+                f.flush()
+                os.fsync(f.fileno())
+            sha256 = digest.hexdigest()
+            target = self.path(sha256)
+            if os.path.exists(target):
+                os.remove(tmp)
+                return StoredEvidence(target, sha256, written, True)
+
+            # Metadata first: a visible object always has its metadata
+            meta = {"sha256": sha256, "size": written, "content_type": content_type,
+                    "original_filename": filename or ""}
+            self._atomic_write(self._meta_path(sha256), lambda m: m.write(json.dumps(meta).encode("utf-8")))
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.replace(tmp, target)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        return StoredEvidence(target, sha256, written, False)
+
+    def exists(self, sha256: str) -> bool:
+        return os.path.exists(self.path(sha256))
+
+    def stat(self, sha256: str) -> Optional[EvidenceObject]:
+        if not self.exists(sha256):
+            return None
+        try:
+            with open(self._meta_path(sha256), "rb") as f:
+                return EvidenceObject(**json.loads(f.read()))
+        except FileNotFoundError:
+            return EvidenceObject(sha256, os.path.getsize(self.path(sha256)), "application/octet-stream", "")
+
+    def iter_chunks(self, sha256: str) -> Iterator[bytes]:
+        with open(self.path(sha256), "rb") as f:
+            while chunk := f.read(CHUNK_SIZE):
+                yield chunk
+
+    def local_path(self, sha256: str) -> Optional[str]:
+        path = self.path(sha256)
+        return path if os.path.exists(path) else None
+
+    def verify(self, sha256: str) -> bool:
+        """Re-hashes the stored object through mmap (no userspace copy of the file)."""
+        path = self.path(sha256)
+        if os.path.getsize(path) == 0:
+            return hashlib.sha256(b"").hexdigest() == sha256
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return hashlib.sha256(mapped).hexdigest() == sha256
+
+
+class AzureEvidenceStore(EvidenceStore):
+    name = "azure"
+
+    def _blob(self, sha256: str):
+        return blob._container().get_blob_client(blob.evidence_blob_name(sha256))
+
+    def put_stream(self, stream: BinaryIO, filename: str, content_type: str,
+                   sha256: Optional[str] = None, size: Optional[int] = None) -> StoredEvidence:
+        if sha256 is None or size is None:
+            sha256, size = hash_stream(stream)
+        return blob.store_evidence_stream(stream, filename, content_type, sha256=sha256, size=size)
+
+    def exists(self, sha256: str) -> bool:
+        return self._blob(sha256).exists()
+
+    def stat(self, sha256: str) -> Optional[EvidenceObject]:
+        try:
+            props = self._blob(sha256).get_blob_properties()
+        except ResourceNotFoundError:
+            return None
+        return EvidenceObject(
+            sha256=sha256, size=props.size,
+            content_type=props.content_settings.content_type or "application/octet-stream",
+            original_filename=(props.metadata or {}).get("original_filename", ""),
+        )
+
+    def iter_chunks(self, sha256: str) -> Iterator[bytes]:
+        yield from self._blob(sha256).download_blob().chunks()
+
+
+_store_lock = threading.Lock()
+_store: Optional[EvidenceStore] = None
+
+
+def get_evidence_store() -> EvidenceStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            backend = EVIDENCE_STORE or ("azure" if (os.getenv("AZURE_BLOB_CONN") or os.getenv("azure-blob-conn")) else "local")
+            if backend == "azure":
+                _store = AzureEvidenceStore()
+            elif backend == "local":
+                _store = LocalEvidenceStore(EVIDENCE_LOCAL_DIR)
+            else:
+                raise RuntimeError(f"Unknown EVIDENCE_STORE backend: {backend}")
+        return _store
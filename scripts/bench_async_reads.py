@@ -0,0 +1,134 @@
+"""
+Benchmark: sync (threadpool + SessionLocal) vs async (psycopg 3 async engine)
+read path under many concurrent clients.
+
+Both routes run the same /audit-logs query; only the execution model
+differs. A real uvicorn server is started in-process and hammered by N
+concurrent keep-alive clients, each issuing requests back to back.
+
+Usage:
+    DATABASE_URL=postgresql://... python scripts/bench_async_reads.py [clients] [requests_per_client] [rows]
+
+Without DATABASE_URL a temporary SQLite file is used (aiosqlite); that only
+exercises the plumbing, the interesting numbers need a networked Postgres.
+"""
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+sys.path.append(os.getcwd())
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.gettempdir()}/procguard_bench_reads.db")
+
+import httpx
+import uvicorn
+from fastapi import Depends, FastAPI
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+import app.models  # noqa: F401  (registers models)
+from app.api.deps import get_db, get_read_db
+from app.core.database import SessionLocal, async_engine, engine
+from app.models.audit import AuditLog
+from app.models.base import Base
+
+SOURCE = "BENCH"
+PORT = 8765
+
+bench = FastAPI()
+
+
+def _query():
+    since = datetime.now(timezone.utc) - timedelta(days=1)
+    return (select(AuditLog)
+            .where(AuditLog.source == SOURCE, AuditLog.created_at >= since)
+            .order_by(AuditLog.created_at.desc())
+            .limit(50))
+
+
+@bench.get("/sync")
+def sync_read(db: Session = Depends(get_db)):
+    return {"total": len(db.scalars(_query()).all())}
+
+
+@bench.get("/async")
+async def async_read(db: AsyncSession = Depends(get_read_db)):
+    return {"total": len((await db.scalars(_query())).all())}
+
+
+def seed(rows: int):
+    if engine.dialect.name == "sqlite":
+        Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        existing = db.scalar(select(func.count()).select_from(AuditLog).where(AuditLog.source == SOURCE))
+        now = datetime.now(timezone.utc)
+        project_id = uuid.uuid4()
+        db.add_all([
+            AuditLog(id=uuid.uuid4(), created_at=now, source=SOURCE, project_id=project_id,
+                     client_id="bench", payload={"i": i})
+            for i in range(existing, rows)
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+
+async def load(path: str, clients: int, per_client: int):
+    latencies = []
+    errors = 0
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{PORT}", limits=limits, timeout=120) as http:
+        async def worker():
+            nonlocal errors
+            for _ in range(per_client):
+                t0 = time.perf_counter()
+                try:
+                    response = await http.get(path)
+                    response.raise_for_status()
+                except httpx.HTTPError:
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - t0)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(clients)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    p = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000 if latencies else float("nan")
+    print(f"  {path:<7} {len(latencies) / elapsed:8.1f} req/s   p50 {p(0.5):7.1f} ms   "
+          f"p99 {p(0.99):7.1f} ms   max {p(1.0):7.1f} ms   errors {errors}")
+    return statistics.mean(latencies) if latencies else None
+
+
+def main(clients: int, per_client: int, rows: int):
+    seed(rows)
+    server = uvicorn.Server(uvicorn.Config(bench, port=PORT, log_level="warning", backlog=clients * 2))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+
+    print(f"{clients} concurrent clients x {per_client} requests ({engine.dialect.name}, {rows} rows)")
+    try:
+        for path in ("/sync", "/async"):
+            asyncio.run(load(path, clients, per_client))
+    finally:
+        server.should_exit = True
+        thread.join()
+        engine.dispose()
+        asyncio.run(async_engine.dispose())
+
+
+if __name__ == "__main__":
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    per_client = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    rows = int(sys.argv[3]) if len(sys.argv) > 3 else 200
+    main(clients, per_client, rows)
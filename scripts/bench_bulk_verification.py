@@ -0,0 +1,70 @@
+"""
+Benchmark: bulk /execute verification, inline vs process pool.
+
+Streams n NDJSON payloads (one historical batch each) through BulkVerifier
+and prints the summary line of each run.
+
+Usage:
+    python scripts/bench_bulk_verification.py [n] [steps] [workers]
+"""
+import asyncio
+import json
+import os
+import random
+import sys
+
+sys.path.append(os.getcwd())
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from app.services.bulk_verification import BulkVerifier
+
+
+def make_body(n: int, steps: int) -> list:
+    rng = random.Random(42)
+    sop = {"steps": [{"id": f"step_{i}"} for i in range(steps)]}
+    roles = {s["id"]: rng.choice(["OPERATOR", "SUPERVISOR"]) for s in sop["steps"]}
+    lines = []
+    for b in range(n):
+        execution = [{"step_id": s["id"], "actor": roles[s["id"]]} for s in sop["steps"]]
+        if rng.random() < 0.1:
+            execution.pop(rng.randrange(steps))
+        lines.append(json.dumps({"batch_id": f"batch-{b}", "procedure": sop, "execution": execution, "roles": roles}).encode() + b"\n")
+    return lines
+
+
+async def run(verifier: BulkVerifier, lines: list) -> dict:
+    async def body():
+        # Request body arrives in ~64 KiB network reads
+        buffer = b""
+        for line in lines:
+            buffer += line
+            if len(buffer) >= 65536:
+                yield buffer
+                buffer = b""
+        if buffer:
+            yield buffer
+
+    last = None
+    async for chunk in verifier.stream(body()):
+        last = chunk
+    return json.loads(last.splitlines()[-1])["summary"]
+
+
+def main(n: int, steps: int, workers: int):
+    lines = make_body(n, steps)
+    print(f"{n} payloads x {steps} steps ({sum(map(len, lines)) / 2**20:.1f} MiB NDJSON)")
+    for w in (0, workers):
+        verifier = BulkVerifier(workers=w, chunk_size=256)
+        if w:
+            asyncio.run(run(verifier, lines[:w * 256])) # warm up the pool
+        summary = asyncio.run(run(verifier, lines))
+        verifier.shutdown()
+        print(f"  workers={w}: {summary['elapsed_s']:.2f}s  {summary['payloads_per_s']:.0f} payloads/s  "
+              f"{summary['events_per_s']:.0f} events/s  (violated {summary['violated']})")
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    steps = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else (os.cpu_count() or 2)
+    main(n, steps, workers)
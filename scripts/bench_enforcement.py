@@ -0,0 +1,90 @@
+"""
+Benchmark: legacy five-validator enforcement vs the compiled single-pass engine.
+
+Runs a 1k-step SOP against 100k execution events, split into executions of
+one SOP run each (mostly clean, some out of order / wrong actor), and as a
+single 100k-event stream. Legacy timings run every validator so both sides
+do the work needed to report all violations.
+
+Usage:
+    python scripts/bench_enforcement.py [steps] [events]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.getcwd())
+
+from app.enforcement.engine import find_violations
+from app.enforcement.validators import (
+    validate_actor_roles,
+    validate_duplicates,
+    validate_missing_steps,
+    validate_step_order,
+    validate_unexpected_steps,
+)
+
+
+def legacy_all(sop_steps, execution, role_map):
+    results = (
+        validate_unexpected_steps(sop_steps, execution),
+        validate_duplicates(execution),
+        validate_missing_steps(sop_steps, execution),
+        validate_step_order(sop_steps, execution),
+        validate_actor_roles(sop_steps, execution, role_map),
+    )
+    return [v for v in results if v]
+
+
+def make_execution(rng, step_ids, role_map):
+    execution = [{"step_id": s, "actor": role_map[s]} for s in step_ids]
+    roll = rng.random()
+    if roll < 0.1:
+        i = rng.randrange(len(execution) - 1)
+        execution[i], execution[i + 1] = execution[i + 1], execution[i]
+    elif roll < 0.2:
+        execution[rng.randrange(len(execution))]["actor"] = "intruder"
+    return execution
+
+
+def main(steps: int, events: int):
+    rng = random.Random(42)
+    sop_steps = [{"id": f"step_{i}"} for i in range(steps)]
+    role_map = {s["id"]: rng.choice(["OPERATOR", "SUPERVISOR", "QA"]) for s in sop_steps}
+    step_ids = [s["id"] for s in sop_steps]
+
+    executions = [make_execution(rng, step_ids, role_map) for _ in range(max(1, events // steps))]
+    stream = [{"step_id": rng.choice(step_ids), "actor": rng.choice(["OPERATOR", "QA"])} for _ in range(events)]
+
+    t0 = time.perf_counter()
+    legacy_runs = [legacy_all(sop_steps, e, role_map) for e in executions]
+    legacy = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    compiled_runs = [find_violations(sop_steps, e, role_map) for e in executions]
+    compiled = time.perf_counter() - t0
+
+    # Legacy reports one violation per rule; compiled may report several per rule
+    assert [[v["code"] for v in r] for r in legacy_runs] == [
+        list(dict.fromkeys(v["code"] for v in r)) for r in compiled_runs
+    ]
+
+    t0 = time.perf_counter()
+    legacy_all(sop_steps, stream, role_map)
+    legacy_stream = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    stream_violations = find_violations(sop_steps, stream, role_map)
+    compiled_stream = time.perf_counter() - t0
+
+    print(f"SOP with {steps} steps, {events} events")
+    print(f"  {len(executions)} executions  legacy: {legacy:.3f}s  compiled: {compiled:.3f}s  ({legacy / compiled:.1f}x)")
+    print(f"  single stream   legacy: {legacy_stream:.3f}s  compiled: {compiled_stream:.3f}s  "
+          f"({legacy_stream / compiled_stream:.1f}x, {len(stream_violations)} violations collected)")
+
+
+if __name__ == "__main__":
+    steps = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    events = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+    main(steps, events)
@@ -0,0 +1,62 @@
+"""
+Benchmark: legacy FSM checks vs the precompiled dense transition table.
+
+Usage:
+    python scripts/bench_fsm_table.py [n]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.getcwd())
+
+from app.core.fsm import State, Event, ALLOWED_TRANSITIONS
+from app.core.fsm_table import lookup_transition, validate_sequence
+from app.core.violations import terminal_state_mutation
+from app.security.rbac import authorize_event
+from app.security.roles import Role
+
+
+def legacy_check(role: str, state: str, event: str):
+    current_state = State(state)
+    event_enum = Event(event)
+    try:
+        authorize_event(role=Role(role), event=event_enum)
+    except PermissionError:
+        return None
+    if terminal_state_mutation(current_state):
+        return "TERMINAL_STATE_MUTATION"
+    if (current_state, event_enum) not in ALLOWED_TRANSITIONS:
+        return "INVALID_FSM_TRANSITION"
+    return ALLOWED_TRANSITIONS[(current_state, event_enum)]
+
+
+def main(n: int):
+    rng = random.Random(42)
+    roles = [rng.choice(list(Role)).value for _ in range(n)]
+    states = [rng.choice(list(State)).value for _ in range(n)]
+    events = [rng.choice(list(Event)).value for _ in range(n)]
+
+    t0 = time.perf_counter()
+    for r, s, e in zip(roles, states, events):
+        legacy_check(r, s, e)
+    legacy = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for r, s, e in zip(roles, states, events):
+        lookup_transition(r, s, e)
+    table = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    validate_sequence(states, events, roles)
+    vectorized = time.perf_counter() - t0
+
+    print(f"{n} transitions")
+    print(f"  legacy checks       : {legacy * 1e9 / n:8.1f} ns/op")
+    print(f"  table lookup        : {table * 1e9 / n:8.1f} ns/op  ({legacy / table:.1f}x)")
+    print(f"  validate_sequence   : {vectorized * 1e9 / n:8.1f} ns/op  ({legacy / vectorized:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,61 @@
+"""
+Benchmark: per-email SMTP connections (legacy send_email) vs the pooled, queued mailer.
+
+Runs against the in-process SMTP sink with a simulated handshake cost.
+
+Usage:
+    python scripts/bench_mailer.py [n] [handshake_ms]
+"""
+import os
+import smtplib
+import sys
+import time
+
+sys.path.append(os.getcwd())
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from app.services.mailer import Mailer, OutboundEmail, SMTPSettings, build_message
+from app.services.smtp_sink import SMTPSink
+
+ATTACHMENT = [("batch_timeline.pdf", b"%PDF-1.4 " + b"x" * 20_000)]
+
+
+def legacy_send(settings: SMTPSettings, to, subject, body):
+    # Previous behaviour: connect + handshake + send + quit for every email
+    email = OutboundEmail("legacy", tuple(to), subject, body, tuple(ATTACHMENT))
+    server = smtplib.SMTP(settings.host, settings.port)
+    server.send_message(build_message(email, settings.sender))
+    server.quit()
+
+
+def main(n: int, handshake_ms: float):
+    with SMTPSink(handshake_delay=handshake_ms / 1000) as sink:
+        settings = SMTPSettings(host=sink.host, port=sink.port, starttls=False, user=None, password=None)
+
+        t0 = time.perf_counter()
+        for i in range(n):
+            legacy_send(settings, [f"qa{i}@example.com"], "Batch report", "body")
+        legacy = time.perf_counter() - t0
+
+        mailer = Mailer(settings, workers=4, pool_size=4)
+        t0 = time.perf_counter()
+        for i in range(n):
+            mailer.enqueue([f"qa{i}@example.com"], "Batch report", "body", ATTACHMENT)
+        enqueue = time.perf_counter() - t0
+        mailer.flush()
+        pooled = time.perf_counter() - t0
+        stats = mailer.stats()
+        mailer.shutdown()
+
+    print(f"{n} emails, {handshake_ms:.0f} ms simulated handshake")
+    print(f"  legacy (connection per email) : {legacy * 1000 / n:8.2f} ms/email in request")
+    print(f"  mailer enqueue                : {enqueue * 1000 / n:8.3f} ms/email in request")
+    print(f"  mailer drained                : {pooled * 1000 / n:8.2f} ms/email  ({legacy / pooled:.1f}x)")
+    print(f"  connections opened            : {stats['connections_opened']} (legacy: {n})")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 200,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 50.0,
+    )
@@ -0,0 +1,27 @@
+"""
+Recompute the batch summary projection (batch_summaries) from scratch.
+
+Usage:
+    python scripts/rebuild_batch_summaries.py
+"""
+import os
+import sys
+
+sys.path.append(os.getcwd())
+
+from app.core.database import SessionLocal
+from app.core.projections import rebuild_batch_summaries, read_batch_summary
+
+
+def main():
+    db = SessionLocal()
+    try:
+        projects = rebuild_batch_summaries(db)
+        print(f"Batch summary projection rebuilt for {projects} project(s).")
+        print(read_batch_summary(db))
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -8,13 +8,14 @@ project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 sys.path.insert(0, project_root)
 
 from app.core.database import SessionLocal
+from app.core.projections import record_procedures_added
 from app.models.procedure import Procedure, ProcedureStep
 
 def clear_data():
     db = SessionLocal()
     try:
         db.query(ProcedureStep).delete()
-        db.query(Procedure).delete()
+        record_procedures_added(db, -db.query(Procedure).delete())
         db.commit()
         print("Successfully cleared procedure data.")
     except Exception as e:
@@ -90,6 +91,7 @@ def seed_procedures():
             
             print(f"Seeded procedure: {procedure.name}")
 
+        record_procedures_added(db, len(procedures_data))
         db.commit()
     except Exception as e:
         print(f"Error seeding data: {e}")
@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 from app.core.database import SessionLocal
 from app.models.sop import SOP, SOPRule, EnforcementAction
+import app.core.sop_cache  # noqa: F401 - registers SOP change notifications
 import uuid
 from datetime import datetime, timezone
 import hashlib
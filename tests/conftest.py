@@ -1,6 +1,8 @@
 import pytest
 from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from app.models.base import Base
 from app.models.batch import Batch
 from app.models.procedure import Procedure, ProcedureStep
@@ -9,6 +11,10 @@ from datetime import datetime, timezone
 
 # Use the test database
 DATABASE_URL = "postgresql+pg8000://djtaylor@localhost/procguard_test"
+ASYNC_DATABASE_URL = "postgresql+psycopg://djtaylor@localhost/procguard_test"
+
+# TestClient runs every request on a fresh event loop: never reuse async connections across them
+async_engine = create_async_engine(ASYNC_DATABASE_URL, poolclass=NullPool)
 
 @pytest.fixture(scope="session", autouse=True)
 def setup_test_db():
@@ -51,7 +57,7 @@ def setup_test_db():
 
     # Apply global dependency override for FastAPI tests
     from app.main import app
-    from app.api.deps import get_db
+    from app.api.deps import get_db, get_read_db
     
     def override_get_db():
         SessionLocal = sessionmaker(bind=engine)
@@ -62,11 +68,23 @@ def setup_test_db():
             db.close()
             
     app.dependency_overrides[get_db] = override_get_db
+
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
+    async def override_get_read_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    app.dependency_overrides[get_read_db] = override_get_read_db
     
     yield engine
     app.dependency_overrides.clear()
     engine.dispose()
 
+@pytest.fixture(scope="session")
+def async_test_engine(setup_test_db):
+    return async_engine
+
 @pytest.fixture(scope="function")
 def db_session(setup_test_db):
     engine = setup_test_db
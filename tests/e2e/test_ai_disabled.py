@@ -18,3 +18,4 @@ def test_ai_disabled_still_blocks(client, sop, role_map, monkeypatch):
     assert response.status_code == 403
     assert body["violation"]["code"] == "MISSING_REQUIRED_STEP"
     assert body.get("explanation") is None
+    assert body["explanation_status"] == "DISABLED"
@@ -0,0 +1,48 @@
+import time
+
+from app.ai.stub_client import StubAIClient
+from app.api import execution_routes
+from app.services.explanation_cache import ExplanationCache
+
+
+def _poll(client, url, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        body = client.get(url).json()
+        if body["status"] != "PENDING":
+            return body
+        time.sleep(0.02)
+    raise AssertionError(f"{url} still PENDING")
+
+
+def test_verdict_does_not_wait_for_the_model(client, sop, role_map, monkeypatch):
+    monkeypatch.setenv("AI_ENABLED", "true")
+    stub = StubAIClient(latency=0.3)
+    cache = ExplanationCache(session_factory=None, client=stub)
+    monkeypatch.setattr(execution_routes, "get_ai_client", lambda: stub)
+    monkeypatch.setattr(execution_routes, "explanation_cache", cache)
+
+    payload = {
+        "procedure": sop,
+        "execution": [{"step_id": "1", "actor": "operator"}],
+        "roles": role_map
+    }
+    t0 = time.perf_counter()
+    first = client.post("/execute", json=payload)
+    assert time.perf_counter() - t0 < 0.3
+
+    body = first.json()
+    assert first.status_code == 403
+    assert body["violation"]["code"] == "MISSING_REQUIRED_STEP"
+    assert body["explanation"] is None
+    assert body["explanation_status"] == "PENDING"
+
+    ready = _poll(client, body["explanation_url"])
+    assert ready["status"] == "READY"
+    assert "MISSING_REQUIRED_STEP" in ready["explanation"]
+
+    second = client.post("/execute", json=payload).json()
+    assert second["explanation_status"] == "READY"
+    assert second["explanation"] == ready["explanation"]
+    assert stub.calls == 1
+    cache.shutdown()
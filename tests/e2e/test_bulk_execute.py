@@ -0,0 +1,41 @@
+import json
+
+import pytest
+
+from app.api import execution_routes
+from app.services.bulk_verification import BulkVerifier
+
+
+@pytest.fixture(params=[0, 2], ids=["inline", "pool"])
+def verifier(request, monkeypatch):
+    verifier = BulkVerifier(workers=request.param, chunk_size=2)
+    monkeypatch.setattr(execution_routes, "bulk_verifier", verifier)
+    yield verifier
+    verifier.shutdown()
+
+
+def test_bulk_execute_streams_results_in_order(client, sop, role_map, verifier):
+    ok = [{"step_id": s, "actor": role_map[s]} for s in ("1", "2", "3")]
+    out_of_order = [ok[0], ok[2], ok[1]]
+    lines = [
+        {"batch_id": "b-0", "procedure": sop, "execution": ok, "roles": role_map},
+        {"batch_id": "b-1", "procedure": sop, "execution": out_of_order, "roles": role_map},
+        {"batch_id": "b-2", "procedure": sop, "execution": ok[:2], "roles": role_map, "collect_all": True},
+        {"batch_id": "b-3", "procedure": sop, "roles": role_map},
+    ]
+    body = "\n".join(json.dumps(line) for line in lines) + "\n\n{not json\n"
+
+    response = client.post("/execute/bulk", content=body, headers={"Content-Type": "application/x-ndjson"})
+
+    assert response.status_code == 200
+    results = [json.loads(line) for line in response.text.splitlines()]
+    summary = results.pop()["summary"]
+
+    assert [r["index"] for r in results] == [0, 1, 2, 3, 4]
+    assert [r["status"] for r in results] == ["SUCCESS", "VIOLATED", "VIOLATED", "INVALID", "INVALID"]
+    assert results[1]["batch_id"] == "b-1"
+    assert results[1]["violation"]["code"] == "STEP_ORDER_MISMATCH"
+    assert [v["code"] for v in results[2]["violations"]] == ["MISSING_REQUIRED_STEP"]
+    assert (summary["payloads"], summary["success"], summary["violated"], summary["invalid"]) == (5, 1, 2, 2)
+    assert summary["events"] == 8
+    assert summary["payloads_per_s"] > 0
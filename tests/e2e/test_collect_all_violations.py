@@ -0,0 +1,21 @@
+def test_collect_all_violations(client, sop, role_map):
+    execution = [
+        {"step_id": "2", "actor": "operator"},
+        {"step_id": "1", "actor": "supervisor"},
+    ]
+
+    response = client.post("/execute", json={
+        "procedure": sop,
+        "execution": execution,
+        "roles": role_map,
+        "collect_all": True
+    })
+
+    body = response.json()
+    assert response.status_code == 403
+    assert body["violation"]["code"] == "MISSING_REQUIRED_STEP"
+    assert [v["code"] for v in body["violations"]] == [
+        "MISSING_REQUIRED_STEP",
+        "STEP_ORDER_MISMATCH",
+        "UNAUTHORIZED_ACTOR",
+    ]
@@ -0,0 +1,73 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+from app.main import app
+from app.models.approval import Approval
+from app.models.batch import Batch
+from app.core.fsm import State
+from app.enforcement.approval_gate import can_batch_progress, can_batch_progress_many
+
+client = TestClient(app)
+SUPERVISOR = {"X-Actor-ID": "supervisor_1", "X-Actor-Role": "SUPERVISOR"}
+
+
+def _awaiting(db_session, batch, count):
+    batch.current_state = State.AWAITING_APPROVAL.value
+    batches = [batch]
+    for i in range(1, count):
+        b = Batch(
+            batch_id=uuid.uuid4(),
+            procedure_id=batch.procedure_id,
+            procedure_version=1,
+            current_state=State.AWAITING_APPROVAL.value,
+            created_at=batch.created_at + timedelta(seconds=i),
+        )
+        db_session.add(b)
+        batches.append(b)
+    db_session.commit()
+    return batches
+
+
+def test_worklist_pages_through_awaiting_batches(db_session, batch):
+    batches = _awaiting(db_session, batch, 5)
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/approvals/worklist", params=params, headers=SUPERVISOR)
+        assert response.status_code == 200
+        page = response.json()
+        seen.extend(item["batch_id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+
+    assert seen == [str(b.batch_id) for b in batches]
+
+
+def test_worklist_filters_by_approver_role(db_session, batch):
+    _awaiting(db_session, batch, 1)
+    response = client.get(
+        "/approvals/worklist",
+        headers={"X-Actor-ID": "operator_1", "X-Actor-Role": "OPERATOR"},
+    )
+    assert response.json()["items"] == []
+
+
+def test_can_batch_progress_many_matches_single(db_session, batch):
+    batches = _awaiting(db_session, batch, 3)
+    now = datetime.now(timezone.utc)
+    db_session.add(Approval(batch_id=batches[0].batch_id, approver_id="s", approver_role="SUPERVISOR",
+                            decision="REJECTED", created_at=now))
+    db_session.add(Approval(batch_id=batches[0].batch_id, approver_id="s", approver_role="SUPERVISOR",
+                            decision="APPROVED", created_at=now + timedelta(seconds=1)))
+    db_session.add(Approval(batch_id=batches[1].batch_id, approver_id="s", approver_role="SUPERVISOR",
+                            decision="REJECTED", created_at=now))
+    db_session.commit()
+
+    ids = [b.batch_id for b in batches]
+    assert can_batch_progress_many(db_session, ids) == {i: can_batch_progress(db_session, i) for i in ids}
+    assert can_batch_progress_many(db_session, ids)[ids[0]] is True
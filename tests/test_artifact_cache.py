@@ -0,0 +1,51 @@
+import pytest
+from datetime import datetime, timezone
+
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core.fsm import Event
+from app.core.transitions import execute_transition
+from app.models.violation import Violation
+from app.services import artifact_cache
+from app.services.artifact_cache import FilesystemArtifactCache
+
+client = TestClient(app)
+
+
+def test_lru_eviction_bounded_by_total_bytes(tmp_path):
+    cache = FilesystemArtifactCache(str(tmp_path), max_bytes=25)
+    cache.put("a", b"x" * 10)
+    cache.put("b", b"x" * 10)
+    assert cache.get("a") is not None  # "b" becomes least recently used
+    cache.put("c", b"x" * 10)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["bytes"] == 20
+
+    # LRU order is rebuilt from disk on restart
+    assert FilesystemArtifactCache(str(tmp_path), max_bytes=25).stats()["entries"] == 2
+
+
+def test_violation_export_is_served_from_cache(db_session, completed_batch, tmp_path, monkeypatch):
+    monkeypatch.setattr(artifact_cache, "pdf_artifact_cache", FilesystemArtifactCache(str(tmp_path), 10**6))
+    with pytest.raises(RuntimeError):
+        execute_transition(
+            db=db_session,
+            batch=completed_batch,
+            event=Event.PROGRESS_STEP,
+            actor="operator_1",
+            actor_role="OPERATOR",
+            occurred_at=datetime.now(timezone.utc),
+        )
+    violation = db_session.query(Violation).one()
+    headers = {"X-Actor-ID": "auditor_1", "X-Actor-Role": "AUDITOR"}
+
+    first = client.get(f"/violations/{violation.id}/export", headers=headers)
+    second = client.get(f"/violations/{violation.id}/export", headers=headers)
+
+    assert first.headers["X-Cache"] == "MISS"
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.content == first.content
+    assert first.content.startswith(b"%PDF")
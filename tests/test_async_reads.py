@@ -0,0 +1,65 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+
+from app.core.database import async_database_url
+from app.main import app
+from app.models.audit import AuditLog
+from app.models.opa_audit import OPAAuditLog
+
+client = TestClient(app)
+
+
+def test_async_url_uses_psycopg3_for_every_postgres_driver():
+    for url in ("postgresql://u:p@db/procguard", "postgresql+psycopg2://u:p@db/procguard",
+                "postgresql+pg8000://u:p@db/procguard"):
+        async_url = async_database_url(url)
+        assert async_url.drivername == "postgresql+psycopg"
+        assert async_url.password == "p" and async_url.database == "procguard"
+    assert async_database_url("sqlite:///dev.db").drivername == "sqlite+aiosqlite"
+
+
+def _window():
+    now = datetime.now(timezone.utc)
+    return {"from_ts": (now - timedelta(hours=1)).isoformat(), "to_ts": (now + timedelta(hours=1)).isoformat()}
+
+
+def test_audit_logs_served_on_async_path(db_session):
+    now = datetime.now(timezone.utc)
+    project_id = uuid.uuid4()
+    db_session.add_all([
+        AuditLog(id=uuid.uuid4(), created_at=now - timedelta(minutes=i), source="SYSTEM",
+                 project_id=project_id, client_id="test", payload={"i": i})
+        for i in range(3)
+    ])
+    db_session.commit()
+
+    body = client.get("/audit-logs", params={**_window(), "project_id": str(project_id)}).json()
+
+    assert body["total"] == 3
+    assert [item["payload"]["i"] for item in body["items"]] == [0, 1, 2]
+
+
+def test_opa_logs_and_export_served_on_async_path(db_session):
+    now = datetime.now(timezone.utc)
+    for decision in ("allow", "deny"):
+        db_session.add(OPAAuditLog(
+            timestamp=now, project_id=uuid.uuid4(), policy_package="procguard.fsm", rule="transition",
+            decision=decision, resource_type="batch", input_hash="i", result_hash="r", decision_hash=f"h-{decision}",
+        ))
+    db_session.commit()
+
+    assert client.get("/opa/audit-logs", params={**_window(), "decision": "deny"}).json()["total"] == 1
+    export = client.get("/opa/audit-logs/export", params=_window())
+    assert export.status_code == 200
+    assert export.json()["total"] == 2
+
+
+def test_dashboard_and_boards_served_on_async_path(db_session, batch):
+    summary = client.get("/dashboard/summary").json()
+    assert summary["mode"] == "live"
+    assert summary["total_procedures"] == 1
+
+    boards = {b["id"]: b for b in client.get("/boards/").json()}
+    assert boards["sys-procedures"]["primary_count"] == 1
@@ -0,0 +1,55 @@
+import uuid
+from datetime import timedelta
+
+from fastapi.testclient import TestClient
+from app.main import app
+from app.models.batch import Batch
+from app.core.fsm import State
+
+client = TestClient(app)
+
+
+def _seed(db_session, batch, count):
+    for i in range(1, count):
+        db_session.add(Batch(
+            batch_id=uuid.uuid4(),
+            procedure_id=batch.procedure_id,
+            procedure_version=1,
+            current_state=State.IN_PROGRESS.value if i % 2 else State.CREATED.value,
+            # Duplicate timestamps exercise the batch_id tie-breaker
+            created_at=batch.created_at + timedelta(seconds=i // 2),
+        ))
+    db_session.commit()
+
+
+def _walk(**params):
+    seen, cursor = [], None
+    while True:
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/batches/", params=params)
+        assert response.status_code == 200
+        seen.extend(b["batch_id"] for b in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return seen
+
+
+def test_keyset_pages_are_complete_and_stable(db_session, batch):
+    _seed(db_session, batch, 7)
+
+    ascending = _walk(limit=2)
+    assert len(ascending) == len(set(ascending)) == 7
+    assert _walk(limit=3, recent=True) == ascending[::-1]
+
+
+def test_listing_filters(db_session, batch):
+    _seed(db_session, batch, 7)
+
+    assert len(_walk(state="IN_PROGRESS", limit=2)) == 3
+    assert len(_walk(procedure_id=str(batch.procedure_id), procedure_version=1)) == 7
+    assert len(_walk(created_from=(batch.created_at + timedelta(seconds=1)).isoformat())) == 5
+
+
+def test_invalid_cursor_is_rejected(db_session):
+    assert client.get("/batches/", params={"cursor": "not-a-cursor"}).status_code == 400
@@ -0,0 +1,93 @@
+import uuid
+import pytest
+from datetime import datetime, timezone
+
+from app.core.fsm import Event
+from app.core.projections import (
+    compute_batch_summaries,
+    read_batch_summary,
+    rebuild_batch_summaries,
+    record_procedures_added,
+    summarize,
+)
+from app.core.transitions import execute_transition
+from app.core.violations_handler import resolve_violation
+from app.models.procedure import Procedure
+from app.models.violation import Violation
+
+
+def _live(db_session):
+    return summarize(compute_batch_summaries(db_session).values())
+
+
+def test_projection_tracks_transitions(db_session, batch):
+    rebuild_batch_summaries(db_session)
+    assert read_batch_summary(db_session) == _live(db_session)
+
+    execute_transition(
+        db=db_session,
+        batch=batch,
+        event=Event.START_BATCH,
+        actor="operator_1",
+        actor_role="OPERATOR",
+        occurred_at=datetime.now(timezone.utc),
+    )
+    db_session.expire_all()
+
+    summary = read_batch_summary(db_session)
+    assert summary == _live(db_session)
+    assert summary["batches_in_progress"] == 1
+    assert summary["batches_created"] == 0
+
+
+def test_projection_tracks_violations(db_session, completed_batch):
+    rebuild_batch_summaries(db_session)
+
+    with pytest.raises(RuntimeError):
+        execute_transition(
+            db=db_session,
+            batch=completed_batch,
+            event=Event.PROGRESS_STEP,
+            actor="operator_1",
+            actor_role="OPERATOR",
+            occurred_at=datetime.now(timezone.utc),
+        )
+    db_session.expire_all()
+
+    summary = read_batch_summary(db_session)
+    assert summary == _live(db_session)
+    assert summary["violations_open"] == 1
+
+
+def test_read_falls_back_to_live_count_before_rebuild(db_session, batch):
+    assert read_batch_summary(db_session) == _live(db_session)
+    assert read_batch_summary(db_session)["total_batches"] == 1
+
+
+def test_resolutions_and_seeded_procedures_update_the_projection(db_session, completed_batch):
+    rebuild_batch_summaries(db_session)
+    with pytest.raises(RuntimeError):
+        execute_transition(
+            db=db_session,
+            batch=completed_batch,
+            event=Event.PROGRESS_STEP,
+            actor="operator_1",
+            actor_role="OPERATOR",
+            occurred_at=datetime.now(timezone.utc),
+        )
+
+    db_session.add(Procedure(
+        procedure_id=uuid.uuid4(), name="Seeded", description="", version=1,
+        created_at=datetime.now(timezone.utc),
+    ))
+    record_procedures_added(db_session)
+    violation = db_session.query(Violation).one()
+    assert resolve_violation(db_session, violation)
+    assert not resolve_violation(db_session, violation)  # already resolved: counted once
+    db_session.commit()
+
+    summary = read_batch_summary(db_session)
+    assert summary == _live(db_session)
+    assert summary["procedures"] == 2
+    assert summary["violations_open"] == 0
+    assert summary["violations_resolved"] == 1
@@ -0,0 +1,102 @@
+import csv
+import os
+import uuid
+import pytest
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from app.main import app
+from app.core.fsm import Event
+from app.core.transitions import execute_transition
+from app.models.export_job import ExportJob
+from app.models.violation import Violation
+from app.services import export_jobs as export_jobs_module
+from app.services.export_jobs import ExportJobRunner, ExportQueueFull, purge_expired_export_jobs
+
+client = TestClient(app)
+AUDITOR = {"X-Actor-ID": "auditor_1", "X-Actor-Role": "AUDITOR"}
+
+
+def _violate(db_session, batch, times):
+    for _ in range(times):
+        with pytest.raises(RuntimeError):
+            execute_transition(
+                db=db_session,
+                batch=batch,
+                event=Event.PROGRESS_STEP,
+                actor="operator_1",
+                actor_role="OPERATOR",
+                occurred_at=datetime.now(timezone.utc),
+            )
+
+
+def _verify(db_session, tmp_path, filters=None):
+    return ExportJobRunner(workers=0, result_dir=str(tmp_path)).submit(
+        db_session, "chain_verification", {"filters": filters or {}}, requested_by="auditor_1",
+        session_factory=sessionmaker(bind=db_session.get_bind()), background=False
+    )
+
+
+def test_bulk_job_matches_single_violation_verification(db_session, completed_batch, tmp_path):
+    _violate(db_session, completed_batch, 5)
+    violations = db_session.query(Violation).all()
+    single = {
+        str(v.id): client.get(f"/violations/{v.id}/chain", headers=AUDITOR).json()
+        for v in violations
+    }
+
+    job = _verify(db_session, tmp_path)
+
+    assert job.status == "COMPLETED"
+    assert job.result["total"] == job.result["processed"] == 5
+    assert job.result["intact"] + job.result["broken"] == 5
+
+    with open(job.result_path) as report:
+        rows = {row.pop("violation_id"): row for row in csv.DictReader(report)}
+    assert rows == single
+
+
+def test_job_state_and_report_are_served_from_the_persisted_row(db_session, completed_batch, tmp_path):
+    _violate(db_session, completed_batch, 2)
+    job = _verify(db_session, tmp_path)
+
+    status = client.get(f"/violations/verification-jobs/{job.id}", headers=AUDITOR).json()
+    assert status["status"] == "COMPLETED"
+    assert status["result"]["processed"] == 2
+    assert status["downloadable"] is True
+
+    report = client.get(f"/violations/verification-jobs/{job.id}/report", headers=AUDITOR)
+    assert report.status_code == 200
+    assert report.text.startswith("violation_id,")
+
+
+def test_unknown_job_is_404_not_a_violation_lookup(db_session):
+    response = client.get(f"/violations/verification-jobs/{uuid.uuid4()}", headers=AUDITOR)
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Verification job not found"
+
+
+def test_jobs_share_the_export_queue_bound(db_session, tmp_path, monkeypatch):
+    with pytest.raises(ExportQueueFull):
+        ExportJobRunner(workers=0, result_dir=str(tmp_path), max_queued=0).submit(
+            db_session, "chain_verification", {}, requested_by="auditor_1"
+        )
+
+    monkeypatch.setattr(export_jobs_module.export_jobs, "max_queued", 0)
+    assert client.post("/violations/verification-jobs", headers=AUDITOR).status_code == 429
+    assert db_session.query(ExportJob).count() == 0
+
+
+def test_finished_jobs_and_reports_are_purged(db_session, tmp_path):
+    job = _verify(db_session, tmp_path)
+    assert job.status == "COMPLETED"
+    report_path = job.result_path
+
+    job.expires_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+    db_session.commit()
+
+    assert purge_expired_export_jobs(db_session, result_dir=str(tmp_path)) == 1
+    assert client.get(f"/violations/verification-jobs/{job.id}", headers=AUDITOR).status_code == 404
+    assert not os.path.exists(report_path)
@@ -0,0 +1,72 @@
+import random
+
+from app.enforcement.compiled import compile_sop
+from app.enforcement.engine import find_violations, run_enforcement
+from app.enforcement.validators import (
+    validate_actor_roles,
+    validate_duplicates,
+    validate_missing_steps,
+    validate_step_order,
+    validate_unexpected_steps,
+)
+
+SOP = [{"id": "1"}, {"id": "2"}, {"id": "3"}]
+ROLES = {"1": "operator", "2": "operator", "3": "supervisor"}
+
+
+def _reference(sop_steps, execution, role_map):
+    """Legacy fail-fast engine: five validators, each rescanning the execution."""
+    for violation in (
+        validate_unexpected_steps(sop_steps, execution),
+        validate_duplicates(execution),
+        validate_missing_steps(sop_steps, execution),
+        validate_step_order(sop_steps, execution),
+        validate_actor_roles(sop_steps, execution, role_map),
+    ):
+        if violation:
+            return violation
+    return None
+
+
+def test_matches_legacy_validators_on_random_executions():
+    rng = random.Random(7)
+    for _ in range(2000):
+        n_steps = rng.randint(1, 6)
+        sop_steps = [{"id": f"s{i}"} for i in range(n_steps)]
+        roles = {f"s{i}": rng.choice(["operator", "supervisor", ""]) for i in range(n_steps)}
+        pool = [s["id"] for s in sop_steps] + ["x"]
+        execution = [
+            {"step_id": rng.choice(pool), "actor": rng.choice(["operator", "supervisor"])}
+            for _ in range(rng.randint(0, 8))
+        ]
+
+        assert run_enforcement(sop_steps, execution, roles) == _reference(sop_steps, execution, roles)
+
+
+def test_collect_all_reports_every_violation_in_priority_order():
+    execution = [
+        {"step_id": "3", "actor": "operator"},
+        {"step_id": "9", "actor": "operator"},
+        {"step_id": "1", "actor": "operator"},
+        {"step_id": "1", "actor": "operator"},
+    ]
+
+    codes = [v["code"] for v in find_violations(SOP, execution, ROLES)]
+
+    assert codes == [
+        "UNEXPECTED_STEP",
+        "DUPLICATE_STEP_EXECUTION",
+        "MISSING_REQUIRED_STEP",
+        "STEP_ORDER_MISMATCH",
+        "UNAUTHORIZED_ACTOR",
+    ]
+
+
+def test_compiled_sop_is_cached_and_indexed():
+    compiled = compile_sop(SOP, ROLES)
+
+    assert compile_sop([dict(s) for s in SOP], dict(ROLES)) is compiled
+    assert compiled.position == {"1": 0, "2": 1, "3": 2}
+    assert compiled.required_role["3"] == "supervisor"
+    assert compiled.enforce([{"step_id": s, "actor": ROLES[s]} for s in ("1", "2", "3")]) == []
+
@@ -0,0 +1,61 @@
+import hashlib
+import io
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.storage import evidence_store
+from app.storage.evidence_store import LocalEvidenceStore, digest_from_ref
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = LocalEvidenceStore(str(tmp_path / "evidence"))
+    monkeypatch.setattr(evidence_store, "_store", store)
+    return store
+
+
+def test_local_store_is_sharded_atomic_and_deduplicated(store):
+    data = b"%PDF-1.4 filter trail" * 1000
+    sha256 = hashlib.sha256(data).hexdigest()
+
+    first = store.put_stream(io.BytesIO(data), "trail.pdf", "application/pdf")
+    second = store.put_bytes(data, "trail-copy.pdf", "application/pdf")
+
+    assert first.sha256 == second.sha256 == sha256
+    assert (first.deduplicated, second.deduplicated) == (False, True)
+    assert first.url == os.path.join(store.root, sha256[:2], sha256[2:4], sha256)
+    assert os.listdir(store.tmp_dir) == []
+    assert store.stat(sha256).original_filename == "trail.pdf"
+    assert store.verify(sha256)
+    assert b"".join(store.iter_chunks(sha256)) == data
+
+
+def test_refs_resolve_by_digest_and_legacy_paths(store, tmp_path):
+    stored = store.put_bytes(b"evidence", "e.txt", "text/plain")
+    legacy = tmp_path / "legacy.pdf"
+    legacy.write_bytes(b"old")
+
+    assert digest_from_ref(f"https://account.blob.core.windows.net/evidence/sha256/ab/{stored.sha256}") == stored.sha256
+    assert store.exists_ref(stored.url)
+    assert store.exists_ref(stored.sha256)
+    assert store.exists_ref(str(legacy))
+    assert not store.exists_ref("0" * 64)
+
+
+def test_upload_then_download_round_trip(store):
+    data = b"%PDF-1.4 batch evidence"
+    uploaded = client.post("/evidence/upload", files={"file": ("proof.pdf", data, "application/pdf")}).json()
+
+    response = client.get(uploaded["download_url"])
+    assert response.status_code == 200
+    assert response.content == data
+    assert response.headers["content-type"] == "application/pdf"
+    assert response.headers["etag"] == f'"{uploaded["sha256"]}"'
+
+    assert client.get(f"/evidence/{'0' * 64}").status_code == 404
+    assert client.get("/evidence/not-a-digest").status_code == 400
@@ -0,0 +1,66 @@
+import hashlib
+import io
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.storage import blob, evidence_store
+
+client = TestClient(app)
+
+
+class InMemoryContainer:
+    """Stands in for an Azure ContainerClient: records uploads by blob name."""
+
+    def __init__(self):
+        self.blobs = {}
+        self.uploads = 0
+
+    def get_blob_client(self, name):
+        container = self
+
+        class Blob:
+            url = f"https://evidence.example/{name}"
+
+            def exists(self):
+                return name in container.blobs
+
+            def upload_blob(self, stream, length=None, **kwargs):
+                container.uploads += 1
+                container.blobs[name] = stream.read()
+
+        return Blob()
+
+
+def test_store_is_content_addressed_and_deduplicated():
+    container = InMemoryContainer()
+    data = b"batch evidence" * 100_000
+    sha256 = hashlib.sha256(data).hexdigest()
+
+    first = blob.store_evidence_stream(io.BytesIO(data), "a.pdf", "application/pdf", container=container)
+    second = blob.store_evidence_stream(io.BytesIO(data), "copy.pdf", "application/pdf", container=container)
+
+    assert first.sha256 == second.sha256 == sha256
+    assert first.size == len(data)
+    assert (first.deduplicated, second.deduplicated) == (False, True)
+    assert first.url == second.url and sha256 in first.url
+    assert container.uploads == 1
+    assert container.blobs[blob.evidence_blob_name(sha256)] == data
+
+
+def test_upload_endpoint_returns_digest(monkeypatch):
+    container = InMemoryContainer()
+    monkeypatch.setattr(blob, "_container", lambda: container)
+    monkeypatch.setattr(evidence_store, "_store", evidence_store.AzureEvidenceStore())
+    data = b"%PDF-1.4 evidence"
+
+    response = client.post("/evidence/upload", files={"file": ("proof.pdf", data, "application/pdf")})
+    again = client.post("/evidence/upload", files={"file": ("proof-2.pdf", data, "application/pdf")})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["sha256"] == hashlib.sha256(data).hexdigest()
+    assert body["size"] == len(data)
+    assert body["deduplicated"] is False
+    assert again.json()["deduplicated"] is True
+    assert container.uploads == 1
@@ -0,0 +1,120 @@
+import threading
+import time
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.ai.stub_client import STUB_MODEL, StubAIClient
+from app.ai.violation_explainer import EXPLAINER_PROMPT_VERSION
+from app.models.ai_explanation import AIExplanation
+from app.services.explanation_cache import ExplanationCache
+
+
+def test_memory_hit_after_first_call():
+    client = StubAIClient()
+    cache = ExplanationCache(session_factory=None, client=client, model="stub-model")
+
+    first = cache.explain("MISSING_REQUIRED_STEP")
+    second = cache.explain("MISSING_REQUIRED_STEP")
+
+    assert first == second == "[stub:stub-model] Explanation of MISSING_REQUIRED_STEP"
+    assert client.calls == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_stub_output_is_not_keyed_under_the_real_model():
+    cache = ExplanationCache(session_factory=None, model="gpt-4o")
+
+    assert cache.key("MISSING_REQUIRED_STEP", StubAIClient()).model == STUB_MODEL
+    assert cache.key("MISSING_REQUIRED_STEP", object()).model == "gpt-4o"
+
+
+def test_concurrent_misses_are_coalesced():
+    client = StubAIClient(latency=0.2)
+    cache = ExplanationCache(session_factory=None, client=client)
+    results = []
+
+    threads = [threading.Thread(target=lambda: results.append(cache.explain("UNAUTHORIZED_ACTOR"))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert client.calls == 1
+    assert len(set(results)) == 1 and len(results) == 8
+    assert cache.stats()["coalesced"] == 7
+
+
+def test_failures_are_not_cached():
+    client = StubAIClient()
+    cache = ExplanationCache(session_factory=None, client=client)
+    client.chat.completions.create = lambda **kwargs: (_ for _ in ()).throw(TimeoutError("upstream"))
+
+    with pytest.raises(TimeoutError):
+        cache.explain("STEP_ORDER_MISMATCH")
+    assert cache.stats()["in_flight"] == 0
+    assert len(cache.memory) == 0
+
+
+def _wait(cache, code, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status, detail = cache.status(code)
+        if status != "PENDING":
+            return status, detail
+        time.sleep(0.01)
+    raise AssertionError(f"{code} still PENDING")
+
+
+def test_request_schedules_generation_in_the_background():
+    client = StubAIClient(latency=0.1)
+    cache = ExplanationCache(session_factory=None, client=client)
+
+    assert cache.request("UNEXPECTED_STEP") == ("PENDING", None)
+    assert cache.request("UNEXPECTED_STEP") == ("PENDING", None)
+    status, explanation = _wait(cache, "UNEXPECTED_STEP")
+
+    assert status == "READY"
+    assert cache.request("UNEXPECTED_STEP") == ("READY", explanation)
+    assert client.calls == 1
+    cache.shutdown()
+
+
+def test_model_calls_time_out_and_are_retried_on_the_next_request():
+    client = StubAIClient(latency=5.0)
+    cache = ExplanationCache(session_factory=None, client=client, timeout=0.05)
+
+    cache.request("STEP_ORDER_MISMATCH")
+    status, error = _wait(cache, "STEP_ORDER_MISMATCH")
+    assert status == "FAILED"
+    assert "TimeoutError" in error
+
+    assert cache.request("STEP_ORDER_MISMATCH") == ("PENDING", None)
+    cache.shutdown()
+
+
+def test_queue_is_bounded():
+    client = StubAIClient(latency=0.2)
+    cache = ExplanationCache(session_factory=None, client=client, workers=1, max_pending=2)
+
+    statuses = [cache.request(f"CODE_{i}")[0] for i in range(4)]
+
+    assert statuses == ["PENDING", "PENDING", "UNAVAILABLE", "UNAVAILABLE"]
+    assert cache.stats()["shed"] == 2
+    cache.shutdown()
+
+
+def test_explanations_persist_across_workers(setup_test_db, db_session):
+    session_factory = sessionmaker(bind=setup_test_db)
+    client = StubAIClient()
+
+    ExplanationCache(session_factory=session_factory, client=client).explain("DUPLICATE_STEP_EXECUTION")
+    # A second worker process starts with an empty LRU
+    other = ExplanationCache(session_factory=session_factory, client=client)
+    other.explain("DUPLICATE_STEP_EXECUTION")
+
+    assert client.calls == 1
+    assert other.stats()["db_hits"] == 1
+    row = db_session.query(AIExplanation).filter_by(code="DUPLICATE_STEP_EXECUTION").one()
+    assert row.prompt_version == EXPLAINER_PROMPT_VERSION
+    assert row.model == STUB_MODEL
@@ -0,0 +1,139 @@
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from app.main import app
+from app.models.export_job import ExportJob
+from app.services import export_jobs
+from app.services.export_jobs import (
+    ExportJobRunner, ExportQueueFull, execute_export_job, fail_stale_export_jobs, purge_expired_export_jobs
+)
+
+client = TestClient(app)
+AUDITOR = {"X-Actor-ID": "auditor_1", "X-Actor-Role": "AUDITOR"}
+
+
+def _runner(tmp_path, **kwargs):
+    return ExportJobRunner(workers=0, result_dir=str(tmp_path), **kwargs)
+
+
+def test_timeline_pdf_job_persists_state_and_serves_download(db_session, batch, tmp_path):
+    runner = _runner(tmp_path)
+    job = runner.submit(
+        db_session, "timeline_pdf", {"batch_id": str(batch.batch_id)}, requested_by="auditor_1",
+        session_factory=sessionmaker(bind=db_session.get_bind()), background=False
+    )
+
+    status = client.get(f"/exports/{job.id}", headers=AUDITOR).json()
+    assert status["status"] == "COMPLETED"
+    assert status["progress"] == 100
+    assert status["downloadable"] is True
+
+    download = client.get(f"/exports/{job.id}/download", headers=AUDITOR)
+    assert download.status_code == 200
+    assert download.content.startswith(b"%PDF")
+
+
+def test_failed_job_records_error_and_has_no_download(db_session, tmp_path):
+    runner = _runner(tmp_path)
+    job = runner.submit(
+        db_session, "timeline_pdf", {"batch_id": str(uuid.uuid4())}, requested_by="auditor_1",
+        session_factory=sessionmaker(bind=db_session.get_bind()), background=False
+    )
+
+    assert job.status == "FAILED"
+    assert job.error == "Batch artifact not found"
+    assert client.get(f"/exports/{job.id}/download", headers=AUDITOR).status_code == 409
+
+
+def test_submit_validates_kind_params_and_queue_bound(db_session, batch, tmp_path):
+    assert client.post("/exports", json={"kind": "unknown", "params": {}}, headers=AUDITOR).status_code == 422
+    assert client.post("/exports", json={"kind": "timeline_pdf", "params": {}}, headers=AUDITOR).status_code == 422
+
+    runner = _runner(tmp_path, max_queued=0)
+    try:
+        runner.submit(db_session, "timeline_pdf", {"batch_id": str(batch.batch_id)}, requested_by="auditor_1")
+        assert False, "expected ExportQueueFull"
+    except ExportQueueFull:
+        pass
+    assert db_session.query(ExportJob).count() == 0
+
+
+def test_retention_purges_expired_results(db_session, batch, tmp_path):
+    runner = _runner(tmp_path)
+    job = runner.submit(
+        db_session, "timeline_pdf", {"batch_id": str(batch.batch_id)}, requested_by="auditor_1",
+        session_factory=sessionmaker(bind=db_session.get_bind()), background=False
+    )
+    result_path = job.result_path
+    job.expires_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+    db_session.commit()
+
+    assert purge_expired_export_jobs(db_session, result_dir=str(tmp_path)) == 1
+    assert db_session.query(ExportJob).count() == 0
+    assert not (tmp_path / result_path.split("/")[-1]).exists()
+
+
+def _orphan(db_session, batch, status, started_ago=None):
+    now = datetime.now(timezone.utc)
+    job = ExportJob(
+        id=uuid.uuid4(), kind="timeline_pdf", status=status, requested_by="auditor_1",
+        params={"batch_id": str(batch.batch_id)}, progress=0, created_at=now,
+        started_at=now - started_ago if started_ago else None, expires_at=now + timedelta(days=1),
+    )
+    db_session.add(job)
+    db_session.commit()
+    return job.id
+
+
+def test_startup_resumes_pending_and_fails_stale_running_jobs(db_session, batch, tmp_path):
+    pending = _orphan(db_session, batch, "PENDING")
+    stale = _orphan(db_session, batch, "RUNNING", started_ago=timedelta(hours=2))
+    running = _orphan(db_session, batch, "RUNNING", started_ago=timedelta(seconds=5))
+    runner = _runner(tmp_path, stale_seconds=3600)
+
+    assert runner.recover(db_session, session_factory=sessionmaker(bind=db_session.get_bind())) == 1
+    deadline = time.monotonic() + 10
+    while runner.in_flight and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    db_session.expire_all()
+    assert db_session.get(ExportJob, pending).status == "COMPLETED"
+    assert db_session.get(ExportJob, stale).status == "FAILED"
+    assert db_session.get(ExportJob, running).status == "RUNNING"
+
+
+def test_worker_does_not_overwrite_a_job_failed_by_the_stale_sweep(db_session, batch, tmp_path, monkeypatch):
+    factory = sessionmaker(bind=db_session.get_bind())
+    job_id = _orphan(db_session, batch, "PENDING")
+    params_model, handler = export_jobs.EXPORT_KINDS["timeline_pdf"]
+
+    def slow_handler(db, job, params, output_path, progress):
+        with factory() as sweeper:  # another API worker decides this job is stale
+            fail_stale_export_jobs(sweeper, stale_seconds=0)
+        return handler(db, job, params, output_path, progress)
+
+    monkeypatch.setitem(export_jobs.EXPORT_KINDS, "timeline_pdf", (params_model, slow_handler))
+
+    assert execute_export_job(job_id, factory, result_dir=str(tmp_path)) == "FAILED"
+    db_session.expire_all()
+    assert db_session.get(ExportJob, job_id).status == "FAILED"
+    assert db_session.get(ExportJob, job_id).result_path is None
+    assert not list(tmp_path.iterdir())
+
+
+def test_submit_sweeps_expired_results(db_session, batch, tmp_path):
+    runner = _runner(tmp_path, sweep_interval=0)
+    factory = sessionmaker(bind=db_session.get_bind())
+    old = runner.submit(db_session, "timeline_pdf", {"batch_id": str(batch.batch_id)}, requested_by="auditor_1",
+                        session_factory=factory, background=False)
+    old.expires_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+    db_session.commit()
+    old_id = old.id
+
+    runner.submit(db_session, "timeline_pdf", {"batch_id": str(batch.batch_id)}, requested_by="auditor_1",
+                  session_factory=factory, background=False)
+    assert db_session.get(ExportJob, old_id) is None
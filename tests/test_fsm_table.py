@@ -0,0 +1,74 @@
+import pytest
+
+from app.core.fsm import State, Event, ALLOWED_TRANSITIONS
+from app.core.fsm_table import (
+    ROLES, STATES, EVENTS, lookup_transition, validate_sequence,
+)
+from app.core.violations import terminal_state_mutation
+from app.security.rbac import authorize_event
+
+
+def _reference_outcome(role, state, event):
+    """Legacy evaluation order of execute_transition."""
+    try:
+        authorize_event(role=role, event=event)
+    except PermissionError as e:
+        return ("DENIED", str(e))
+    if terminal_state_mutation(state):
+        return ("VIOLATION", "TERMINAL_STATE_MUTATION")
+    if (state, event) not in ALLOWED_TRANSITIONS:
+        return ("VIOLATION", "INVALID_FSM_TRANSITION")
+    return ("ALLOWED", ALLOWED_TRANSITIONS[(state, event)])
+
+
+def test_table_matches_reference_for_every_combination():
+    for role in ROLES:
+        for state in STATES:
+            for event in EVENTS:
+                outcome = lookup_transition(role, state, event)
+                kind, value = _reference_outcome(role, state, event)
+
+                if kind == "DENIED":
+                    assert outcome.denial == value
+                    assert not outcome.allowed
+                elif kind == "VIOLATION":
+                    assert outcome.denial is None
+                    assert outcome.rule == value
+                    assert not outcome.allowed
+                else:
+                    assert outcome.allowed
+                    assert outcome.next_state == value
+                    assert outcome.rule is None
+
+
+def test_lookup_accepts_raw_values():
+    outcome = lookup_transition("OPERATOR", "CREATED", "start_batch")
+    assert outcome.allowed
+    assert outcome.next_state is State.IN_PROGRESS
+    assert outcome.state is State.CREATED
+    assert outcome.event is Event.START_BATCH
+
+
+def test_lookup_rejects_unknown_values():
+    with pytest.raises(ValueError):
+        lookup_transition("JANITOR", "CREATED", "start_batch")
+    with pytest.raises(ValueError):
+        lookup_transition("OPERATOR", "LOST", "start_batch")
+
+
+def test_validate_sequence_replays_in_order():
+    outcomes = validate_sequence(
+        ["CREATED", "IN_PROGRESS", "COMPLETED", "CREATED"],
+        ["start_batch", "request_approval", "progress_step", "approve_step"],
+        ["OPERATOR", "OPERATOR", "OPERATOR", "AUDITOR"],
+    )
+
+    assert [o.allowed for o in outcomes] == [True, True, False, False]
+    assert outcomes[1].next_state is State.AWAITING_APPROVAL
+    assert outcomes[2].rule == "TERMINAL_STATE_MUTATION"
+    assert outcomes[3].denial == "Auditor is read-only"
+
+
+def test_validate_sequence_requires_equal_lengths():
+    with pytest.raises(ValueError):
+        validate_sequence(["CREATED"], [], ["OPERATOR"])
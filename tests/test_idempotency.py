@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core.idempotency import claim_key, request_fingerprint
+from app.models.idempotency import IdempotencyKey
+from app.models.violation import Violation
+from app.models.audit import AuditLog
+
+client = TestClient(app)
+
+
+def test_event_retry_on_terminal_batch_replays_without_new_violation(db_session, completed_batch):
+    headers = {
+        "X-Actor-ID": "mes_gateway",
+        "X-Actor-Role": "OPERATOR",
+        "Idempotency-Key": "mes-retry-0001",
+    }
+    url = f"/batches/{completed_batch.batch_id}/event"
+
+    first = client.post(url, json={"event": "progress_step"}, headers=headers)
+    assert first.status_code == 409
+    assert first.json()["detail"] == "TERMINAL_STATE_MUTATION"
+
+    # MES timeout -> retry with the same key
+    retry = client.post(url, json={"event": "progress_step"}, headers=headers)
+    assert retry.status_code == 409
+    assert retry.json() == first.json()
+    assert retry.headers["Idempotent-Replayed"] == "true"
+
+    assert db_session.query(Violation).count() == 1
+    assert db_session.query(AuditLog).count() == 1
+
+
+def test_reused_key_with_different_body_is_rejected(db_session, completed_batch):
+    headers = {
+        "X-Actor-ID": "mes_gateway",
+        "X-Actor-Role": "OPERATOR",
+        "Idempotency-Key": "mes-retry-0002",
+    }
+    url = f"/batches/{completed_batch.batch_id}/event"
+
+    client.post(url, json={"event": "progress_step"}, headers=headers)
+    response = client.post(url, json={"event": "request_approval"}, headers=headers)
+
+    assert response.status_code == 422
+
+
+def test_retry_while_original_is_in_flight_does_not_execute(db_session, completed_batch):
+    headers = {
+        "X-Actor-ID": "mes_gateway",
+        "X-Actor-Role": "OPERATOR",
+        "Idempotency-Key": "mes-retry-0003",
+    }
+    url = f"/batches/{completed_batch.batch_id}/event"
+    scope = f"POST /batches/{completed_batch.batch_id}/event:mes_gateway"
+    request_hash = request_fingerprint({"event": "progress_step", "step_id": None})
+
+    # The original request has claimed the key and is still running
+    assert claim_key(db_session, "mes-retry-0003", scope, request_hash) is None
+
+    retry = client.post(url, json={"event": "progress_step"}, headers=headers)
+    assert retry.status_code == 409
+    assert retry.headers["Retry-After"] == "1"
+    assert db_session.query(Violation).count() == 0
+    assert db_session.query(AuditLog).count() == 0
+
+
+def test_expired_key_is_reclaimed(db_session, completed_batch):
+    headers = {
+        "X-Actor-ID": "mes_gateway",
+        "X-Actor-Role": "OPERATOR",
+        "Idempotency-Key": "mes-retry-0004",
+    }
+    url = f"/batches/{completed_batch.batch_id}/event"
+    client.post(url, json={"event": "progress_step"}, headers=headers)
+
+    db_session.query(IdempotencyKey).update({"expires_at": datetime.now(timezone.utc) - timedelta(seconds=1)})
+    db_session.commit()
+
+    response = client.post(url, json={"event": "progress_step"}, headers=headers)
+    assert "Idempotent-Replayed" not in response.headers
+    assert db_session.query(IdempotencyKey).count() == 1
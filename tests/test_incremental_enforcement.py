@@ -0,0 +1,107 @@
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.enforcement.compiled import compile_sop
+from app.enforcement.engine import find_violations
+from app.enforcement.incremental import EnforcementAutomaton, EnforcementStateConflict, enforce_events
+from app.main import app
+from app.models.batch_enforcement_state import BatchEnforcementState
+
+SOP = [{"id": "1"}, {"id": "2"}, {"id": "3"}]
+ROLES = {"1": "operator", "2": "operator", "3": "supervisor"}
+
+
+def _codes(violations):
+    return {v["code"] for v in violations}
+
+
+def test_automaton_detects_the_same_rules_as_the_full_pass():
+    rng = random.Random(11)
+    for _ in range(2000):
+        n_steps = rng.randint(1, 12)
+        sop_steps = [{"id": f"s{i}"} for i in range(n_steps)]
+        roles = {f"s{i}": rng.choice(["operator", "supervisor", ""]) for i in range(n_steps)}
+        pool = [s["id"] for s in sop_steps] + [None]
+        execution = [
+            # Unknown steps get unique ids: the automaton keeps no state for them
+            {"step_id": rng.choice(pool) or f"x{i}", "actor": rng.choice(["operator", "supervisor"])}
+            for i in range(rng.randint(0, 16))
+        ]
+
+        automaton = EnforcementAutomaton(compile_sop(sop_steps, roles))
+        found = []
+        for event in execution:
+            found.extend(automaton.feed(event))
+        found.extend(automaton.finish())
+
+        assert _codes(found) == _codes(find_violations(sop_steps, execution, roles))
+
+
+def test_automaton_tracks_next_expected_step():
+    automaton = EnforcementAutomaton(compile_sop(SOP, ROLES))
+
+    automaton.feed({"step_id": "1", "actor": "operator"})
+    automaton.feed({"step_id": "3", "actor": "supervisor"})
+    assert automaton.snapshot()["next_expected_step"] == "2"
+    assert automaton.missing_steps() == ["2"]
+
+    automaton.feed({"step_id": "2", "actor": "operator"})
+    assert automaton.snapshot()["next_expected_step"] is None
+    assert automaton.finish() == []
+
+
+def test_duplicates_report_the_execution_count():
+    automaton = EnforcementAutomaton(compile_sop(SOP, ROLES))
+    events = [{"step_id": "1", "actor": "operator"}] * 3
+
+    found = [v for event in events for v in automaton.feed(event)]
+    assert [v["details"] for v in found] == ["Step 1 executed 2 times", "Step 1 executed 3 times"]
+
+    full = [v for v in find_violations(SOP, events, ROLES) if v["code"] == "DUPLICATE_STEP_EXECUTION"]
+    assert full[0]["details"] == found[-1]["details"]
+
+
+def test_state_persists_between_calls(db_session, batch):
+    first = enforce_events(db_session, batch.batch_id, SOP, ROLES, [{"step_id": "1", "actor": "operator"}])
+    db_session.commit()
+    assert first.violations == []
+
+    second = enforce_events(
+        db_session, batch.batch_id, SOP, ROLES,
+        [{"step_id": "1", "actor": "operator"}, {"step_id": "3", "actor": "supervisor"}],
+        complete=True,
+    )
+    db_session.commit()
+
+    assert [v["code"] for v in second.violations] == ["DUPLICATE_STEP_EXECUTION", "MISSING_REQUIRED_STEP"]
+    state = db_session.query(BatchEnforcementState).filter_by(batch_id=batch.batch_id).one()
+    assert (state.events_seen, state.violations, state.last_step) == (3, 2, "3")
+    assert state.repeated_steps == {"1": 2}
+    assert state.completed_at is not None
+
+    with pytest.raises(EnforcementStateConflict):
+        enforce_events(db_session, batch.batch_id, SOP, ROLES, [{"step_id": "2", "actor": "operator"}])
+
+
+def test_state_is_bound_to_its_sop(db_session, batch):
+    enforce_events(db_session, batch.batch_id, SOP, ROLES, [{"step_id": "1", "actor": "operator"}])
+    db_session.commit()
+
+    with pytest.raises(EnforcementStateConflict):
+        enforce_events(db_session, batch.batch_id, SOP + [{"id": "4"}], ROLES, [{"step_id": "2", "actor": "operator"}])
+
+
+def test_incremental_endpoint(batch):
+    client = TestClient(app)
+    url = f"/batches/{batch.batch_id}/execute/events"
+    payload = {"procedure": {"steps": SOP}, "roles": ROLES}
+
+    ok = client.post(url, json={**payload, "events": [{"step_id": "1", "actor": "operator"}]})
+    assert ok.status_code == 200
+    assert ok.json()["state"]["next_expected_step"] == "2"
+
+    violated = client.post(url, json={**payload, "events": [{"step_id": "3", "actor": "operator"}]})
+    assert violated.status_code == 403
+    assert violated.json()["violation"]["code"] == "UNAUTHORIZED_ACTOR"
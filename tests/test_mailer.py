@@ -0,0 +1,84 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models.audit import AuditLog
+from app.services import mailer as mailer_module
+from app.services.mailer import Mailer, SMTPSettings
+from app.services.smtp_sink import SMTPSink
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def sink():
+    with SMTPSink() as sink:
+        yield sink
+
+
+def _mailer(sink, **kwargs):
+    settings = SMTPSettings(host=sink.host, port=sink.port, starttls=False, user=None, password=None, sender="procguard@test")
+    return Mailer(settings, retry_base_seconds=0.01, **kwargs)
+
+
+def test_queued_emails_reuse_pooled_connections(sink):
+    mailer = _mailer(sink, workers=2, pool_size=2)
+    delivered = []
+    for i in range(10):
+        mailer.enqueue([f"qa{i}@example.com"], "Report", "body", on_delivered=lambda email, refused: delivered.append(email.id))
+    assert mailer.flush(timeout=5)
+    mailer.shutdown()
+
+    assert len(delivered) == len(sink.messages) == 10
+    assert sink.connections <= 2
+
+
+def test_multi_recipient_artifact_is_sent_in_recipient_batches(sink):
+    mailer = _mailer(sink, batch_recipients=2)
+    mailer.deliver(["a@example.com", "b@example.com", "c@example.com"], "Report", "body", [("t.pdf", b"%PDF-1.4")])
+    mailer.shutdown()
+
+    assert [m.rcpt_to for m in sink.messages] == [["a@example.com", "b@example.com"], ["c@example.com"]]
+    assert sink.messages[0].data == sink.messages[1].data
+    assert sink.messages[0].message.get_payload()[1].get_filename() == "t.pdf"
+
+
+def test_transient_failures_are_retried_and_permanent_ones_are_not(sink):
+    mailer = _mailer(sink, max_attempts=5)
+    failures = []
+
+    sink.defer.add("later@example.com")
+    mailer.enqueue(["later@example.com"], "Report", "body")
+    time.sleep(0.05)
+    sink.defer.clear()
+
+    sink.reject.add("gone@example.com")
+    mailer.enqueue(["gone@example.com"], "Report", "body", on_failed=lambda email, error: failures.append(error))
+    assert mailer.flush(timeout=5)
+    mailer.shutdown()
+
+    stats = mailer.stats()
+    assert stats["retried"] >= 1
+    assert stats["failed"] == 1 and len(failures) == 1
+    assert [m.rcpt_to for m in sink.messages] == [["later@example.com"]]
+
+
+def test_batch_email_endpoint_queues_and_audits_delivery(db_session, batch, sink, monkeypatch):
+    mailer = _mailer(sink)
+    monkeypatch.setattr(mailer_module, "mailer", mailer)
+
+    response = client.post(
+        f"/batches/{batch.batch_id}/email",
+        json={"to": ["qa@example.com"], "subject": "Batch report", "attachments": {"timeline_pdf": False}},
+        headers={"X-Actor-ID": "operator_1", "X-Actor-Role": "OPERATOR"},
+    )
+    assert response.status_code == 200
+    assert response.json()["status"] == "queued"
+
+    assert mailer.flush(timeout=5)
+    mailer.shutdown()
+    assert sink.messages[0].rcpt_to == ["qa@example.com"]
+    sent = db_session.query(AuditLog).filter(AuditLog.action == "EMAIL_SENT").one()
+    assert sent.payload["message_id"] == response.json()["message_id"]
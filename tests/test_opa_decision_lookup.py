@@ -0,0 +1,62 @@
+import uuid
+
+import pytest
+from datetime import datetime, timedelta, timezone
+
+from app.core.cache import LRUCache
+from app.core.fsm import Event
+from app.core.opa import decision_cache, get_opa_decision
+from app.core.transitions import execute_transition
+from app.models.opa_audit import OPAAuditLog
+from app.models.violation import Violation
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["size"] == 2
+
+
+def test_violation_links_decision_and_lookup_is_cached(db_session, completed_batch):
+    decision_cache.clear()
+    with pytest.raises(RuntimeError):
+        execute_transition(
+            db=db_session,
+            batch=completed_batch,
+            event=Event.PROGRESS_STEP,
+            actor="operator_1",
+            actor_role="OPERATOR",
+            occurred_at=datetime.now(timezone.utc),
+        )
+    violation = db_session.query(Violation).one()
+    opa_log = db_session.query(OPAAuditLog).one()
+    assert opa_log.linked_violation_id == violation.id
+
+    first = get_opa_decision(db_session, violation.opa_decision_hash)
+    second = get_opa_decision(db_session, violation.opa_decision_hash)
+    assert first.id == opa_log.id
+    assert second is first
+    assert decision_cache.stats()["hits"] == 1
+
+
+def test_shared_decision_hash_resolves_to_the_earliest_record(db_session):
+    decision_cache.clear()
+    earlier = datetime(2025, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+    rows = [
+        OPAAuditLog(
+            id=uuid.UUID(int=n), timestamp=timestamp, project_id=uuid.UUID(int=0), policy_package="procguard.fsm",
+            rule="deny", decision="DENY", resource_type="batch", resource_id=f"batch-{n}",
+            input_hash="i", result_hash="r", decision_hash="shared", payload={"n": n}, immutable=True,
+        )
+        for n, timestamp in ((3, earlier), (2, earlier + timedelta(seconds=1)), (1, earlier))
+    ]
+    db_session.add_all(rows)
+    db_session.commit()
+
+    assert get_opa_decision(db_session, "shared").id == uuid.UUID(int=1)
@@ -0,0 +1,44 @@
+import pickle
+from datetime import datetime, timezone
+
+import pytest
+
+from app.services.audit_service import render_filter_audit_pdf
+from app.services.pdf import TimelineHeader, TimelineRow, render_timeline_pdf
+from app.services.renderer import PDFRenderer
+
+HEADER = TimelineHeader("batch-1", "procedure-1", 1)
+ROWS = [
+    TimelineRow(datetime.now(timezone.utc), "operator_1", f"STEP_{i}", "SUCCESS", "CREATED", "IN_PROGRESS")
+    for i in range(200)
+]
+
+
+def test_render_inputs_are_plain_picklable_tuples():
+    assert pickle.loads(pickle.dumps((HEADER, ROWS))) == (HEADER, ROWS)
+
+
+@pytest.mark.parametrize("workers", [0, 1])
+def test_renderer_returns_pdf_and_records_latency(workers):
+    renderer = PDFRenderer(workers=workers)
+    try:
+        pdf = renderer.render("timeline", render_timeline_pdf, HEADER, ROWS)
+        filter_pdf = renderer.render(
+            "filter_audit", render_filter_audit_pdf, "batches", datetime.utcnow(), 1,
+            [(datetime.now(timezone.utc), "auditor_1", "batches", {"state": "OPEN"}, "a" * 64)]
+        )
+    finally:
+        renderer.shutdown()
+
+    assert pdf.startswith(b"%PDF") and filter_pdf.startswith(b"%PDF")
+    stats = renderer.stats()["kinds"]
+    assert stats["timeline"]["count"] == 1
+    assert stats["filter_audit"]["count"] == 1
+    assert stats["timeline"]["render_ms_avg"] > 0
+
+
+def test_render_errors_are_counted_and_raised():
+    renderer = PDFRenderer(workers=0)
+    with pytest.raises(AttributeError):
+        renderer.render("timeline", render_timeline_pdf, HEADER, [object()])
+    assert renderer.stats()["kinds"]["timeline"]["errors"] == 1
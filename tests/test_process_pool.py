@@ -0,0 +1,27 @@
+
+from app.services.process_pool import SpawnPool
+
+
+def test_no_workers_means_inline():
+    pool = SpawnPool("inline", workers=0)
+    assert pool.get() is None
+    assert pool.started is False
+
+
+def test_pool_is_reused_until_reset():
+    pool = SpawnPool("test", workers=1)
+    try:
+        first = pool.get()
+        assert pool.get() is first
+        assert first.submit(pow, 2, 10).result() == 1024
+
+        pool.reset(object()) # stale handle: ignored
+        assert pool.get() is first
+
+        pool.reset(first)
+        assert pool.started is False
+        assert pool.get() is not first
+    finally:
+        first.shutdown(wait=False)
+        pool.shutdown()
+    assert pool.started is False
@@ -0,0 +1,115 @@
+import asyncio
+import time
+
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from starlette.requests import Request
+
+from app.core.read_routing import (
+    PRIMARY, READ_YOUR_WRITES_COOKIE, READ_YOUR_WRITES_HEADER, REPLICA, ReplicaRouter, replica_router
+)
+from app.main import app
+
+
+class ScriptedLagRouter(ReplicaRouter):
+    """Replica lag as reported by pg_last_xact_replay_timestamp(), scripted."""
+
+    def __init__(self, lags, **kwargs):
+        super().__init__(**kwargs)
+        self.lags = list(lags)
+
+    async def _measure_lag(self):
+        return self.lags.pop(0)
+
+
+def _factory(path):
+    return async_sessionmaker(create_async_engine(f"sqlite+aiosqlite:///{path}"))
+
+
+def _request(method="GET", wrote_at=None, echoed=None, actor=None):
+    headers = []
+    if wrote_at is not None:
+        headers.append((b"cookie", f"{READ_YOUR_WRITES_COOKIE}={wrote_at}".encode()))
+    if echoed is not None:
+        headers.append((READ_YOUR_WRITES_HEADER.lower().encode(), str(echoed).encode()))
+    if actor is not None:
+        headers.append((b"x-actor-id", actor.encode()))
+    return Request({"type": "http", "method": method, "headers": headers})
+
+
+def _route(router, request):
+    return asyncio.run(router.route(request))[1]
+
+
+def test_without_replica_everything_goes_to_primary(tmp_path):
+    router = ReplicaRouter(primary=_factory(tmp_path / "primary.db"), replica=None)
+
+    assert _route(router, _request()) == PRIMARY
+
+
+def test_reads_go_to_caught_up_replica_and_fall_back_when_it_lags(tmp_path):
+    router = ScriptedLagRouter(
+        [0.0, 30.0], primary=_factory(tmp_path / "primary.db"), replica=_factory(tmp_path / "replica.db"),
+        max_lag=5, check_interval=0,
+    )
+
+    assert _route(router, _request()) == REPLICA
+    assert _route(router, _request()) == PRIMARY
+    assert router.stats()["lag_seconds"] == 30
+    assert router.stats()["fallbacks"]["lag"] == 1
+
+
+def test_non_postgres_replica_is_probed_for_reachability_only(tmp_path):
+    router = ReplicaRouter(primary=_factory(tmp_path / "primary.db"), replica=_factory(tmp_path / "replica.db"))
+
+    assert _route(router, _request()) == REPLICA
+    assert router.stats()["lag_seconds"] == 0
+
+
+def test_writes_and_recent_writers_stay_on_primary(tmp_path):
+    router = ScriptedLagRouter(
+        [0.0], primary=_factory(tmp_path / "primary.db"), replica=_factory(tmp_path / "replica.db"),
+    )
+
+    assert _route(router, _request("POST")) == PRIMARY
+    assert _route(router, _request(wrote_at=time.time())) == PRIMARY
+    assert _route(router, _request(wrote_at=time.time() - 3600)) == REPLICA
+    assert router.stats()["fallbacks"] == {"write": 1, "read_your_writes": 1, "lag": 0}
+
+
+def test_clients_without_cookies_are_pinned_by_echoed_header_or_actor(tmp_path):
+    router = ScriptedLagRouter(
+        [0.0], primary=_factory(tmp_path / "primary.db"), replica=_factory(tmp_path / "replica.db"),
+    )
+
+    assert _route(router, _request(echoed=time.time())) == PRIMARY
+
+    router.record_write("mes_line_4")
+    assert _route(router, _request(actor="mes_line_4")) == PRIMARY
+    assert _route(router, _request(actor="operator_1")) == REPLICA
+    router.record_write("mes_line_4", at=time.time() - 3600)
+    assert _route(router, _request(actor="mes_line_4")) == REPLICA
+
+
+def test_unreachable_replica_counts_as_lagging(tmp_path):
+    # Nothing listens on port 1: connection refused
+    replica = async_sessionmaker(create_async_engine("postgresql+psycopg://procguard@127.0.0.1:1/replica"))
+    router = ReplicaRouter(primary=_factory(tmp_path / "primary.db"), replica=replica)
+
+    assert _route(router, _request()) == PRIMARY
+    assert router.stats()["lag_seconds"] is None
+
+
+def test_unsafe_requests_mark_the_client_as_a_recent_writer():
+    client = TestClient(app)
+
+    assert READ_YOUR_WRITES_COOKIE not in client.get("/health").cookies
+    response = client.post("/execute", headers={"X-Actor-Id": "mes_line_7"}, json={
+        "procedure": {"steps": [{"id": "1", "description": "Weigh"}]},
+        "execution": [{"step_id": "1", "actor": "operator"}],
+        "roles": {"1": "operator"},
+    })
+    assert response.status_code == 200
+    assert READ_YOUR_WRITES_COOKIE in response.cookies
+    assert float(response.headers[READ_YOUR_WRITES_HEADER]) <= time.time()
+    assert replica_router.actor_wrote_recently(_request(actor="mes_line_7"))
@@ -0,0 +1,49 @@
+import time
+
+from sqlalchemy import text
+
+from app.core.sop_cache import SOP_CACHE_CHANNEL, sop_resolution_cache, start_invalidation_listener
+from app.models.sop import SOP, SOPRule, EnforcementAction
+
+
+def _seed_sop(db_session):
+    sop = SOP(name="Critical Reaction Protocol", version=1, immutable_hash="CRP_V1", is_active=True)
+    db_session.add(sop)
+    db_session.flush()
+    db_session.add(SOPRule(sop_id=sop.id, rule_code="INVALID_FSM_TRANSITION"))
+    db_session.add(EnforcementAction(sop_id=sop.id, action_type="LOCK_PROCEDURE", parameters={"scope": "BATCH"}))
+    db_session.commit()
+    return sop
+
+
+def test_resolution_is_cached_and_invalidated_by_deactivation(db_session):
+    sop = _seed_sop(db_session)
+
+    resolved = sop_resolution_cache.resolve(db_session, "INVALID_FSM_TRANSITION")
+    assert resolved.sop.id == sop.id
+    assert [a.action_type for a in resolved.actions] == ["LOCK_PROCEDURE"]
+    assert sop_resolution_cache.resolve(db_session, "INVALID_FSM_TRANSITION") is resolved
+
+    db_session.query(SOP).filter(SOP.id == sop.id).update({"is_active": False})
+    db_session.commit()
+
+    assert sop_resolution_cache.resolve(db_session, "INVALID_FSM_TRANSITION") is None
+
+
+def test_notify_from_another_worker_bumps_generation(db_session):
+    engine = db_session.get_bind()
+    stop = start_invalidation_listener(engine, poll_interval=0.1)
+    try:
+        time.sleep(0.5)  # listener connected and LISTENing
+        generation = sop_resolution_cache.generation
+
+        with engine.connect() as conn:
+            conn.execute(text(f"NOTIFY {SOP_CACHE_CHANNEL}"))
+            conn.commit()
+
+        deadline = time.time() + 5
+        while sop_resolution_cache.generation == generation and time.time() < deadline:
+            time.sleep(0.1)
+        assert sop_resolution_cache.generation > generation
+    finally:
+        stop()
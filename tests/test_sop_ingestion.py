@@ -0,0 +1,132 @@
+from types import SimpleNamespace
+
+import httpx
+import openai
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from app.ai.stub_client import StubAIClient
+from app.api import procedures
+from app.main import app
+from app.models.sop_parse_result import SOPParseResult
+from app.services.sop_ingestion import SOPIngestionPipeline, document_sha256, split_sop_document
+
+
+def _document(n_steps: int) -> str:
+    sections = []
+    for start in range(1, n_steps + 1, 10):
+        lines = [f"Section {start // 10 + 1}: granulation"]
+        lines += [f"{i}. Perform operation {i} on the batch [{'SUPERVISOR' if i % 5 == 0 else 'OPERATOR'}]"
+                  for i in range(start, min(start + 10, n_steps + 1))]
+        sections.append("\n".join(lines))
+    return "\n\n".join(sections)
+
+
+def test_chunks_respect_size_and_line_boundaries():
+    text = _document(200)
+    chunks = split_sop_document(text, max_chars=1000)
+
+    assert len(chunks) > 1
+    assert all(len(c) <= 1000 for c in chunks)
+    lines = [line for c in chunks for line in c.split("\n") if line]
+    assert lines == [line for line in text.split("\n") if line]
+
+
+def test_large_document_is_parsed_in_parallel_chunks_and_merged_in_order():
+    client = StubAIClient(latency=0.05)
+    pipeline = SOPIngestionPipeline(client=client, chunk_chars=1000, concurrency=3, session_factory=None)
+
+    parsed = pipeline.ingest(_document(200))
+
+    assert not parsed.cached
+    assert parsed.chunks == client.calls > 1
+    assert [s["id"] for s in parsed.steps] == [str(i) for i in range(1, 201)]
+    assert parsed.steps[4]["role"] == "SUPERVISOR"
+    assert 1 < client.max_active <= 3
+    pipeline.shutdown()
+
+
+def test_unchanged_document_is_served_from_cache():
+    client = StubAIClient()
+    pipeline = SOPIngestionPipeline(client=client, chunk_chars=1000, session_factory=None)
+    text = _document(30)
+
+    first = pipeline.ingest(text)
+    calls = client.calls
+    second = pipeline.ingest(text.replace("\n", "\r\n"))
+
+    assert second.cached and second.sha256 == first.sha256 == document_sha256(text)
+    assert second.steps == first.steps
+    assert client.calls == calls
+    pipeline.shutdown()
+
+
+def test_stub_parses_are_not_served_to_a_real_client():
+    stub = StubAIClient()
+    pipeline = SOPIngestionPipeline(client=stub, chunk_chars=1000, session_factory=None)
+    text = _document(10)
+    pipeline.ingest(text)
+
+    backend = StubAIClient()
+    pipeline.client = SimpleNamespace(chat=backend.chat)  # not a StubAIClient: keyed under the real model
+    reparsed = pipeline.ingest(text)
+
+    assert not reparsed.cached
+    assert backend.calls == reparsed.chunks
+    assert pipeline.ingest(text).cached
+    pipeline.shutdown()
+
+
+def test_duplicate_step_ids_across_chunks_are_rejected():
+    pipeline = SOPIngestionPipeline(client=StubAIClient(), chunk_chars=60, session_factory=None)
+
+    with pytest.raises(ValueError, match="Duplicate step IDs"):
+        pipeline.ingest("1. Weigh API\n\n2. Blend\n\n1. Weigh API again")
+    pipeline.shutdown()
+
+
+def test_parse_results_persist_across_workers(setup_test_db, db_session):
+    session_factory = sessionmaker(bind=setup_test_db)
+    client = StubAIClient()
+    text = _document(20)
+
+    SOPIngestionPipeline(client=client, session_factory=session_factory).ingest(text)
+    calls = client.calls
+    reparsed = SOPIngestionPipeline(client=client, session_factory=session_factory).ingest(text)
+
+    assert reparsed.cached
+    assert client.calls == calls
+    assert db_session.query(SOPParseResult).filter_by(document_sha256=document_sha256(text)).count() == 1
+
+
+def test_parse_endpoint(monkeypatch):
+    pipeline = SOPIngestionPipeline(client=StubAIClient(), session_factory=None)
+    monkeypatch.setattr(procedures, "sop_ingestion", pipeline)
+    client = TestClient(app)
+
+    response = client.post("/procedures/parse", json={"text": _document(3)})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [s["id"] for s in body["steps"]] == ["1", "2", "3"]
+    assert client.post("/procedures/parse", json={"text": "no numbered steps"}).status_code == 422
+    pipeline.shutdown()
+
+
+def test_parse_endpoint_maps_model_errors(monkeypatch):
+    pipeline = SOPIngestionPipeline(client=StubAIClient(latency=5.0), session_factory=None, timeout=0.05)
+    monkeypatch.setattr(procedures, "sop_ingestion", pipeline)
+    client = TestClient(app)
+
+    assert client.post("/procedures/parse", json={"text": _document(3)}).status_code == 504
+
+    request = httpx.Request("POST", "https://example.invalid/chat/completions")
+    throttled = openai.RateLimitError("slow down", response=httpx.Response(429, request=request), body=None)
+    pipeline.client.chat.completions.create = lambda **kwargs: (_ for _ in ()).throw(throttled)
+    assert client.post("/procedures/parse", json={"text": _document(4)}).status_code == 503
+
+    rejected = openai.BadRequestError("bad prompt", response=httpx.Response(400, request=request), body=None)
+    pipeline.client.chat.completions.create = lambda **kwargs: (_ for _ in ()).throw(rejected)
+    assert client.post("/procedures/parse", json={"text": _document(5)}).status_code == 502
+    pipeline.shutdown()
@@ -0,0 +1,68 @@
+import os
+import uuid
+from datetime import datetime, timezone
+
+from fastapi.testclient import TestClient
+from app.main import app
+from app.models.audit import AuditLog
+from app.services.pdf import (
+    TIMELINE_PDF_PAGE_ROWS, generate_authoritative_timeline_pdf, write_authoritative_timeline_pdf,
+    write_batch_timeline_pdf_file
+)
+from app.services.renderer import pdf_renderer
+
+client = TestClient(app)
+
+
+def _audit_trail(db_session, batch, rows):
+    now = datetime.now(timezone.utc)
+    db_session.add_all([
+        AuditLog(batch_id=batch.batch_id, action=f"STEP_{i}", result="SUCCESS", actor="operator_1", timestamp=now)
+        for i in range(rows)
+    ])
+    db_session.commit()
+
+
+def test_streamed_pdf_is_written_to_file(db_session, batch, tmp_path):
+    _audit_trail(db_session, batch, TIMELINE_PDF_PAGE_ROWS * 5)
+    path = tmp_path / "timeline.pdf"
+
+    assert write_authoritative_timeline_pdf(db_session, batch.batch_id, str(path)) is True
+    content = path.read_bytes()
+    assert content.startswith(b"%PDF")
+    assert content.count(b"/Type /Page\n") + content.count(b"/Type /Page ") >= 5
+
+
+def test_full_audit_trail_endpoint(db_session, batch):
+    _audit_trail(db_session, batch, 200)
+    headers = {"X-Actor-ID": "auditor_1", "X-Actor-Role": "AUDITOR"}
+    rendered = pdf_renderer.stats()["kinds"].get("timeline_full", {}).get("count", 0)
+
+    response = client.get(f"/batches/{batch.batch_id}/timeline/pdf/full", headers=headers)
+    assert response.status_code == 200
+    assert pdf_renderer.stats()["kinds"]["timeline_full"]["count"] == rendered + 1
+    assert response.headers["content-type"] == "application/pdf"
+    assert response.content.startswith(b"%PDF")
+
+    missing = client.get(f"/batches/{uuid.uuid4()}/timeline/pdf/full", headers=headers)
+    assert missing.status_code == 404
+
+
+def test_timeline_attachment_is_rendered_through_a_temp_file(db_session, batch):
+    _audit_trail(db_session, batch, TIMELINE_PDF_PAGE_ROWS * 2)
+
+    pdf = generate_authoritative_timeline_pdf(db_session, batch.batch_id)
+    assert pdf.startswith(b"%PDF")
+    assert generate_authoritative_timeline_pdf(db_session, uuid.uuid4()) is None
+
+
+def test_pool_task_renders_to_a_temp_file_with_its_own_session(db_session, batch):
+    _audit_trail(db_session, batch, TIMELINE_PDF_PAGE_ROWS)
+
+    path = write_batch_timeline_pdf_file(batch.batch_id)
+    try:
+        with open(path, "rb") as f:
+            assert f.read().startswith(b"%PDF")
+    finally:
+        os.remove(path)
+    assert write_batch_timeline_pdf_file(uuid.uuid4()) is None
@@ -0,0 +1,83 @@
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.main import app
+from app.models.filter_audit import FilterAuditLog
+from app.models.sop import SOP
+from app.models.violation import Violation
+
+client = TestClient(app)
+AUDITOR = {"X-Actor-ID": "auditor_1", "X-Actor-Role": "AUDITOR"}
+
+
+def _seed(db_session, batch, count):
+    base = datetime.now(timezone.utc)
+    for i in range(count):
+        sop = SOP(name=f"SOP-{i}", version=1, immutable_hash=f"hash-{i}")
+        filter_log = FilterAuditLog(user_id="auditor_1", screen="VIOLATIONS", filter_payload={}, hash=f"f-{i}")
+        db_session.add_all([sop, filter_log])
+        db_session.flush()
+        db_session.add(Violation(
+            batch_id=batch.batch_id,
+            rule="INVALID_FSM_TRANSITION" if i % 2 else "TERMINAL_STATE_MUTATION",
+            sop_id=sop.id,
+            triggering_filter_event_id=filter_log.id,
+            detected_at=base + timedelta(seconds=i // 2),
+            status="OPEN",
+        ))
+    db_session.commit()
+
+
+@contextmanager
+def _count_queries(engine):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def test_listing_query_count_does_not_grow_with_page_size(db_session, batch, async_test_engine):
+    # The listing is served on the async engine
+    engine = async_test_engine.sync_engine
+
+    _seed(db_session, batch, 2)
+    with _count_queries(engine) as small:
+        assert len(client.get("/violations/", headers=AUDITOR).json()) == 2
+
+    _seed(db_session, batch, 20)
+    with _count_queries(engine) as large:
+        body = client.get("/violations/", headers=AUDITOR).json()
+    assert len(body) == 22
+    assert body[0]["sop"] is not None and body[0]["filter_context"] is not None
+
+    # One query for the page + one selectin per relationship, regardless of N
+    assert len(large) == len(small) <= 3
+
+
+def test_listing_filters_and_pages(db_session, batch):
+    _seed(db_session, batch, 9)
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2, "rule": "TERMINAL_STATE_MUTATION"}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/violations/", params=params, headers=AUDITOR)
+        seen.extend(v["id"] for v in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert len(seen) == len(set(seen)) == 5
+    detected = [db_session.get(Violation, uuid.UUID(v)).detected_at for v in seen]
+    assert detected == sorted(detected, reverse=True)